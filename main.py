@@ -2,11 +2,21 @@
 """
 Ponto de entrada principal para a aplicação de análise de sentimento.
 Utiliza Streamlit para criar uma interface web interativa.
+
+Também pode ser usado pela linha de comando, sem carregar o Streamlit:
+    python main.py analyze --input dados.csv --column Message --output resultados.parquet
 """
 
-import streamlit as st
-from src.web.app import main as app_main
+import sys
+
+# Subcomandos atendidos pela interface de linha de comando (src/cli.py)
+COMANDOS_CLI = ("analyze", "topics", "serve")
 
 # Inicializa a aplicação Streamlit
 if __name__ == "__main__":
-    app_main() 
\ No newline at end of file
+    if len(sys.argv) > 1 and sys.argv[1] in COMANDOS_CLI:
+        from src.cli import main as cli_main
+        sys.exit(cli_main(sys.argv[1:]))
+    
+    from src.web.app import main as app_main
+    app_main()
\ No newline at end of file
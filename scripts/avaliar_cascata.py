@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Script para avaliar a pré-classificação por léxico (cascata) contra o modelo.
+
+Pré-processa uma amostra de validação, classifica todos os textos com o
+modelo transformer e informa, para cada limiar de confiança, a fração dos
+textos que o léxico resolveria sozinho e a concordância desses rótulos com
+o modelo.
+
+Uso:
+    python scripts/avaliar_cascata.py
+    python scripts/avaliar_cascata.py --input data/dados_exemplo.csv --column texto --limiares 0.5 0.6 0.7 0.8
+"""
+
+import argparse
+import os
+import sys
+
+# Adiciona o diretório raiz ao path para poder importar os módulos
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.models.lexicon_sentiment import avaliar_cascata, carregar_lexico
+from src.models.sentiment_analysis import load_sentiment_model
+from src.utils.text_processing import load_nlp_resources, preprocessar_textos
+
+from verificar_backends import TEXTOS_PADRAO, carregar_amostra
+
+def main():
+    """Executa a avaliação e imprime o relatório."""
+    parser = argparse.ArgumentParser(description="Avalia a pré-classificação por léxico contra o modelo de sentimento.")
+    parser.add_argument("--input", help="Arquivo CSV/Excel com os textos da amostra")
+    parser.add_argument("--column", default="texto", help="Coluna com os textos (padrão: texto)")
+    parser.add_argument("--amostra", type=int, default=1000, help="Quantidade máxima de textos")
+    parser.add_argument("--limiares", type=float, nargs="+", default=[0.5, 0.6, 0.7, 0.8], help="Limiares de confiança avaliados")
+    parser.add_argument("--lexico", help="Arquivo JSON com um léxico próprio ({\"lema\": peso})")
+    args = parser.parse_args()
+    
+    textos = carregar_amostra(args.input, args.column, args.amostra) if args.input else TEXTOS_PADRAO
+    nlp, stopwords_pt = load_nlp_resources()
+    textos_limpos = [texto for texto in preprocessar_textos(textos, nlp, stopwords_pt) if texto.strip() != ""]
+    lexico = carregar_lexico(args.lexico) if args.lexico else None
+    
+    print(f"🔄 Avaliando {len(textos_limpos)} textos pré-processados...")
+    resultado = avaliar_cascata(textos_limpos, load_sentiment_model(), tuple(args.limiares), lexico)
+    
+    print(f"\n{'Limiar':>8}{'Resolvidos':>14}{'Fração':>10}{'Concordância':>15}")
+    for limiar, dados in resultado.items():
+        concordancia = f"{dados['concordancia']:.1%}" if dados['concordancia'] is not None else "-"
+        print(f"{limiar:>8.2f}{dados['resolvidos']:>14}{dados['fracao_resolvida']:>10.1%}{concordancia:>15}")
+
+if __name__ == "__main__":
+    main()
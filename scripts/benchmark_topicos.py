@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark dos motores de tópicos (NMF em TF-IDF, LDA em amostra e LDA completo).
+
+Gera um corpus sintético com tópicos conhecidos e compara, para cada motor,
+o tempo de ajuste e a qualidade dos tópicos:
+- coerência UMass média (quanto mais próxima de 0, melhor);
+- pureza: fração dos termos de cada tópico que pertencem ao mesmo tema sintético.
+
+Uso:
+    python scripts/benchmark_topicos.py --documentos 20000 --topicos 5
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+
+# Adiciona o diretório raiz ao path para poder importar os módulos
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.models.topic_analysis import ENGINES_TOPICOS, identificar_topicos, limpar_cache_topicos
+
+def gerar_corpus(n_documentos, n_temas, termos_por_tema=40, termos_ruido=200, tamanho_documento=15, semente=0):
+    """
+    Gera documentos sintéticos: cada documento mistura um tema principal,
+    um tema secundário e palavras de ruído comuns a todos os temas.
+    
+    Returns:
+        tuple: Lista de documentos e dicionário termo -> tema
+    """
+    aleatorio = random.Random(semente)
+    temas = [[f"tema{t}termo{i}" for i in range(termos_por_tema)] for t in range(n_temas)]
+    ruido = [f"ruido{i}" for i in range(termos_ruido)]
+    tema_do_termo = {termo: t for t, termos in enumerate(temas) for termo in termos}
+    
+    documentos = []
+    for _ in range(n_documentos):
+        principal, secundario = aleatorio.sample(range(n_temas), 2)
+        palavras = (
+            aleatorio.choices(temas[principal], k=int(tamanho_documento * 0.6))
+            + aleatorio.choices(temas[secundario], k=int(tamanho_documento * 0.2))
+            + aleatorio.choices(ruido, k=int(tamanho_documento * 0.2))
+        )
+        aleatorio.shuffle(palavras)
+        documentos.append(" ".join(palavras))
+    return documentos, tema_do_termo
+
+def coerencia_umass(topicos, documentos):
+    """
+    Calcula a coerência UMass média dos tópicos sobre o corpus.
+    
+    Para cada par de termos (wi, wj) de um tópico, soma log((D(wi, wj) + 1) / D(wj)),
+    onde D conta os documentos que contêm os termos.
+    """
+    termos = {termo for topico in topicos for termo in topico}
+    docs_por_termo = {termo: set() for termo in termos}
+    for i, documento in enumerate(documentos):
+        for palavra in set(documento.split()) & termos:
+            docs_por_termo[palavra].add(i)
+    
+    valores = []
+    for topico in topicos:
+        # Ordena do termo mais importante para o menos importante
+        ordenados = list(reversed(topico))
+        soma = 0.0
+        for i in range(1, len(ordenados)):
+            for j in range(i):
+                d_j = len(docs_por_termo[ordenados[j]])
+                d_ij = len(docs_por_termo[ordenados[i]] & docs_por_termo[ordenados[j]])
+                soma += math.log((d_ij + 1) / d_j) if d_j else 0.0
+        valores.append(soma)
+    return sum(valores) / len(valores) if valores else float("nan")
+
+def pureza(topicos, tema_do_termo):
+    """Fração média dos termos de cada tópico que pertencem ao tema predominante."""
+    valores = []
+    for topico in topicos:
+        temas = [tema_do_termo.get(termo) for termo in topico]
+        contagens = {}
+        for tema in temas:
+            if tema is not None:
+                contagens[tema] = contagens.get(tema, 0) + 1
+        valores.append(max(contagens.values()) / len(topico) if contagens else 0.0)
+    return sum(valores) / len(valores) if valores else 0.0
+
+def main():
+    """Executa o benchmark e imprime a tabela comparativa."""
+    parser = argparse.ArgumentParser(description="Compara os motores de tópicos em um corpus sintético.")
+    parser.add_argument("--documentos", type=int, default=20000, help="Quantidade de documentos sintéticos")
+    parser.add_argument("--topicos", type=int, default=5, help="Número de temas sintéticos e de tópicos")
+    parser.add_argument("--amostra", type=int, default=5000, help="Tamanho da amostra do motor lda_amostra")
+    args = parser.parse_args()
+    
+    print(f"🔄 Gerando corpus sintético com {args.documentos} documentos e {args.topicos} temas...")
+    documentos, tema_do_termo = gerar_corpus(args.documentos, args.topicos)
+    
+    print(f"\n{'Motor':<14}{'Tempo (s)':>12}{'Coerência UMass':>18}{'Pureza':>10}")
+    for engine in ENGINES_TOPICOS:
+        limpar_cache_topicos()
+        topicos, segundos = identificar_topicos(
+            documentos, set(), args.topicos, engine=engine, tamanho_amostra=args.amostra, retornar_tempo=True
+        )
+        print(f"{engine:<14}{segundos:>12.2f}{coerencia_umass(topicos, documentos):>18.2f}{pureza(topicos, tema_do_termo):>10.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark de escalabilidade da inferência de sentimento com processos de trabalho.
+
+Classifica a mesma amostra de textos com 1, 2, 4, 8 e 16 processos (ou os
+valores de --workers) e informa a vazão, o ganho em relação a um processo e
+o tempo para criar os processos. O modelo é carregado uma única vez; com
+fork, os processos herdam os pesos já carregados.
+
+As configurações são medidas da maior para a menor quantidade de processos:
+com fork, o processo principal precisa continuar com uma única thread até a
+criação dos processos, e apenas a medição com 1 processo (a última) usa as
+threads do próprio processo principal.
+
+Uso:
+    python scripts/benchmark_workers.py
+    python scripts/benchmark_workers.py --input data/dados_exemplo.csv --column texto --amostra 5000 --workers 1 2 4 8 16
+"""
+
+import argparse
+import os
+import sys
+import time
+from functools import partial
+
+# Adiciona o diretório raiz ao path para poder importar os módulos
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.config import obter_config_execucao
+from src.models.sentiment_analysis import load_sentiment_model, analisar_sentimentos_em_lote
+from src.utils.execucao import PoolInferencia, configurar_threads, threads_por_worker
+
+from verificar_backends import TEXTOS_PADRAO, carregar_amostra
+
+def _mesmo_classificador(classificador):
+    """Devolve o classificador já carregado (usado com fork, sem serialização)."""
+    return classificador
+
+def medir(textos, classificador, workers, fork, threads, batch_size):
+    """
+    Mede a vazão com uma quantidade de processos.
+    
+    Returns:
+        dict: Tempo de criação dos processos, tempo de inferência e vazão
+    """
+    inicio = time.perf_counter()
+    if workers > 1 and not fork:
+        # Sem fork, cada processo carrega o modelo novamente
+        carregar = partial(load_sentiment_model, getattr(classificador, "backend_sentimento", None))
+    else:
+        carregar = partial(_mesmo_classificador, classificador)
+    
+    with PoolInferencia(carregar, workers=workers, fork_apos_carregar=fork, threads_intra=threads) as pool:
+        # Aquecimento: cria os processos e os motores de inferência antes de medir
+        analisar_sentimentos_em_lote(textos[:batch_size * pool.workers * 4], classificador, batch_size, pool=pool)
+        criacao = time.perf_counter() - inicio
+        
+        inicio = time.perf_counter()
+        analisar_sentimentos_em_lote(textos, classificador, batch_size, pool=pool)
+        duracao = time.perf_counter() - inicio
+        threads_usadas = pool.threads_intra
+    
+    return {
+        'criacao_s': criacao,
+        'inferencia_s': duracao,
+        'textos_por_s': len(textos) / duracao if duracao > 0 else 0,
+        'threads': threads_usadas,
+    }
+
+def main():
+    """Executa o benchmark e imprime o relatório."""
+    config = obter_config_execucao()
+    parser = argparse.ArgumentParser(description="Mede a vazão da inferência de sentimento com 1 a N processos.")
+    parser.add_argument("--input", help="Arquivo CSV/Excel com os textos da amostra")
+    parser.add_argument("--column", default="texto", help="Coluna com os textos (padrão: texto)")
+    parser.add_argument("--amostra", type=int, default=2000, help="Quantidade de textos classificados em cada medição")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16], help="Quantidades de processos medidas")
+    parser.add_argument("--batch-size", type=int, default=config['tamanho_lote'], help="Textos por lote em cada processo")
+    parser.add_argument("--threads", type=int, default=config['threads_intra'],
+                        help="Threads intra-op por processo (padrão: núcleos / processos)")
+    parser.add_argument("--fork", action=argparse.BooleanOptionalAction, default=config['fork_apos_carregar'],
+                        help="Cria os processos por fork depois de carregar o modelo")
+    args = parser.parse_args()
+    
+    textos = carregar_amostra(args.input, args.column, args.amostra) if args.input else TEXTOS_PADRAO
+    textos = (textos * (args.amostra // len(textos) + 1))[:args.amostra]
+    
+    # O modelo é carregado com uma thread para que os processos possam ser criados por fork
+    configurar_threads(1)
+    classificador = load_sentiment_model()
+    
+    print(f"🔄 {len(textos)} textos, lote de {args.batch_size}, {threads_por_worker(1)} núcleos disponíveis")
+    resultados = {}
+    for workers in sorted(set(args.workers), reverse=True):
+        resultados[workers] = medir(textos, classificador, workers, args.fork, args.threads, args.batch_size)
+        print(f"   {workers} processo(s): {resultados[workers]['textos_por_s']:.1f} textos/s")
+    
+    base = resultados.get(1, {}).get('textos_por_s')
+    print(f"\n{'Processos':>10}{'Threads':>9}{'Criação (s)':>13}{'Inferência (s)':>16}{'Textos/s':>11}{'Ganho':>8}")
+    for workers in sorted(resultados):
+        dados = resultados[workers]
+        ganho = f"{dados['textos_por_s'] / base:.2f}x" if base else "-"
+        print(f"{workers:>10}{dados['threads']:>9}{dados['criacao_s']:>13.2f}{dados['inferencia_s']:>16.2f}"
+              f"{dados['textos_por_s']:>11.1f}{ganho:>8}")
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,16 @@
 #!/usr/bin/env python3
 """
 Script para configuração inicial do ambiente.
-Baixa recursos necessários para NLTK e spaCy.
+Baixa recursos necessários para NLTK e spaCy e exporta os modelos para o
+repositório local (data/modelos), usado em máquinas sem acesso à rede.
+
+Uso:
+    python scripts/setup.py
+    python scripts/setup.py --versao 2024-03 --destino /opt/modelos
+    python scripts/setup.py --sem-exportar
 """
 
+import argparse
 import nltk
 import spacy
 import ssl
@@ -13,8 +20,18 @@ import sys
 # Adiciona o diretório raiz ao path para poder importar os módulos
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-def configurar_ambiente():
-    """Configura o ambiente baixando recursos necessários."""
+from src.models.model_store import exportar_modelos
+from src.models.sentiment_analysis import MODELO_SENTIMENTO
+
+def configurar_ambiente(exportar=True, versao=None, destino=None):
+    """
+    Configura o ambiente baixando recursos necessários.
+    
+    Args:
+        exportar (bool): Se True, exporta os modelos para o repositório local
+        versao (str, opcional): Nome da versão exportada (padrão: data e hora atuais)
+        destino (str, opcional): Diretório raiz do repositório (padrão: MODELOS_DIR ou data/modelos)
+    """
     print("🔄 Iniciando configuração do ambiente...")
     
     # Contornar problemas de SSL para downloads
@@ -40,8 +57,20 @@ def configurar_ambiente():
         spacy.cli.download('pt_core_news_sm')
         print("✅ Modelo spaCy instalado com sucesso!")
     
+    if exportar:
+        print("📦 Exportando modelos para o repositório local...")
+        diretorio = exportar_modelos(MODELO_SENTIMENTO, 'pt_core_news_sm', destino, versao)
+        print(f"✅ Modelos exportados para {diretorio}")
+        print("   Copie o diretório (com o arquivo ATUAL) para as máquinas sem acesso à rede")
+        print("   ou aponte a variável MODELOS_DIR para ele.")
+    
     print("\n✅ Setup concluído! Recursos baixados com sucesso.")
     print("\nPara iniciar a aplicação, execute: streamlit run main.py")
 
 if __name__ == "__main__":
-    configurar_ambiente() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Configura o ambiente e exporta os modelos para uso offline.")
+    parser.add_argument("--versao", help="Nome da versão exportada (padrão: data e hora atuais)")
+    parser.add_argument("--destino", help="Diretório raiz do repositório de modelos (padrão: data/modelos)")
+    parser.add_argument("--sem-exportar", action="store_true", help="Apenas baixa os recursos, sem exportar os modelos")
+    args = parser.parse_args()
+    configurar_ambiente(not args.sem_exportar, args.versao, args.destino)
\ No newline at end of file
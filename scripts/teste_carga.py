@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Script de teste de carga para o serviço HTTP de sentimento.
+
+Abre várias conexões simultâneas (keep-alive), envia requisições para
+POST /sentimento e informa a latência (p50/p99) e a vazão obtidas.
+
+Uso:
+    python main.py serve --port 8000            # em outro terminal
+    python scripts/teste_carga.py --requisicoes 2000 --concorrencia 64
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+TEXTOS = [
+    "Estou muito satisfeito com o atendimento, resolveram tudo rápido!",
+    "O produto chegou quebrado e ninguém responde meus emails.",
+    "Achei ok, nada de especial.",
+    "Excelente experiência, recomendo a todos.",
+    "Péssimo serviço, nunca mais compro aqui.",
+    "A entrega atrasou, mas o produto é bom.",
+]
+
+def percentil(valores, p):
+    """Calcula o percentil p (0-100) de uma lista de valores."""
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    indice = min(len(ordenados) - 1, max(0, int(round(p / 100 * len(ordenados))) - 1))
+    return ordenados[indice]
+
+async def cliente(host, porta, quantidade, latencias, status):
+    """Envia `quantidade` requisições em sequência por uma única conexão."""
+    leitor, escritor = await asyncio.open_connection(host, porta)
+    try:
+        for _ in range(quantidade):
+            corpo = json.dumps({'texto': random.choice(TEXTOS)}).encode('utf-8')
+            requisicao = (
+                f"POST /sentimento HTTP/1.1\r\nHost: {host}\r\n"
+                f"Content-Type: application/json\r\nContent-Length: {len(corpo)}\r\n\r\n"
+            ).encode('latin-1') + corpo
+            
+            inicio = time.perf_counter()
+            escritor.write(requisicao)
+            await escritor.drain()
+            
+            linha_status = await leitor.readline()
+            tamanho = 0
+            while True:
+                linha = await leitor.readline()
+                if linha in (b"\r\n", b""):
+                    break
+                nome, _, valor = linha.decode('latin-1').partition(":")
+                if nome.strip().lower() == 'content-length':
+                    tamanho = int(valor)
+            await leitor.readexactly(tamanho)
+            latencias.append(time.perf_counter() - inicio)
+            
+            codigo = int(linha_status.split()[1])
+            status[codigo] = status.get(codigo, 0) + 1
+    finally:
+        escritor.close()
+
+async def executar_carga(host, porta, requisicoes, concorrencia):
+    """Distribui as requisições entre os clientes e mede o resultado."""
+    latencias = []
+    status = {}
+    por_cliente = [requisicoes // concorrencia + (1 if i < requisicoes % concorrencia else 0) for i in range(concorrencia)]
+    
+    inicio = time.perf_counter()
+    await asyncio.gather(*(cliente(host, porta, n, latencias, status) for n in por_cliente if n > 0))
+    duracao = time.perf_counter() - inicio
+    return latencias, status, duracao
+
+def main():
+    """Executa o teste de carga e imprime o relatório."""
+    parser = argparse.ArgumentParser(description="Teste de carga do serviço HTTP de sentimento.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8000)
+    parser.add_argument("--requisicoes", type=int, default=1000, help="Total de requisições")
+    parser.add_argument("--concorrencia", type=int, default=32, help="Conexões simultâneas")
+    args = parser.parse_args()
+    
+    print(f"🔄 Enviando {args.requisicoes} requisições com {args.concorrencia} conexões simultâneas...")
+    latencias, status, duracao = asyncio.run(
+        executar_carga(args.host, args.porta, args.requisicoes, args.concorrencia)
+    )
+    
+    sucesso = status.get(200, 0)
+    print(f"\n📊 Resultado ({duracao:.2f} s)")
+    print(f"Vazão: {len(latencias)/duracao:.1f} req/s ({sucesso/duracao:.1f} req/s com sucesso)")
+    print(f"Latência p50: {percentil(latencias, 50)*1000:.1f} ms")
+    print(f"Latência p99: {percentil(latencias, 99)*1000:.1f} ms")
+    print(f"Códigos de status: {dict(sorted(status.items()))}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Script para treinar o modelo de sentimento rápido a partir dos rótulos do BERT.
+
+Os rótulos podem vir de duas fontes:
+- um arquivo de resultados já analisado (ex.: saída de `python main.py analyze`),
+  com as colunas 'texto_limpo' e 'sentimento';
+- um arquivo com textos brutos: os textos são pré-processados e rotulados
+  pelo modelo BERT (com --cache, os rótulos já calculados são reaproveitados).
+
+O modelo é salvo em data/modelos_rapidos/<versão> e marcado como atual.
+
+Uso:
+    python scripts/treinar_modelo_rapido.py --input resultados.parquet
+    python scripts/treinar_modelo_rapido.py --input dados.csv --column Message --amostra 50000 --cache
+"""
+
+import argparse
+import os
+import sys
+
+# Adiciona o diretório raiz ao path para poder importar os módulos
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pandas as pd
+
+from src.data.data_handler import carregar_arquivo
+from src.models.fast_sentiment import treinar_modelo_rapido, salvar_modelo_rapido
+from src.models.sentiment_analysis import MODELO_SENTIMENTO
+
+def rotular_com_bert(textos, usar_cache):
+    """Pré-processa os textos e os rotula com o modelo BERT."""
+    from src.models.sentiment_analysis import load_sentiment_model, analisar_sentimentos_em_lote
+    from src.models.sentiment_cache import CacheSentimento
+    from src.utils.text_processing import load_nlp_resources, preprocessar_textos
+    
+    nlp, stopwords_pt = load_nlp_resources()
+    textos_limpos = [texto for texto in preprocessar_textos(textos, nlp, stopwords_pt) if texto.strip() != ""]
+    print(f"🔄 Rotulando {len(textos_limpos)} textos com o modelo BERT...")
+    cache = CacheSentimento() if usar_cache else None
+    rotulos = analisar_sentimentos_em_lote(textos_limpos, load_sentiment_model("pytorch"), cache=cache)
+    return textos_limpos, rotulos
+
+def main():
+    """Treina, avalia e salva o modelo rápido."""
+    parser = argparse.ArgumentParser(description="Treina o modelo de sentimento rápido (TF-IDF + regressão logística).")
+    parser.add_argument("--input", required=True, help="Arquivo CSV/Excel/Parquet com os textos ou resultados")
+    parser.add_argument("--column", default="Message", help="Coluna com os textos brutos (padrão: Message)")
+    parser.add_argument("--amostra", type=int, help="Quantidade máxima de textos usados no treino")
+    parser.add_argument("--versao", help="Nome da versão (padrão: data e hora atuais)")
+    parser.add_argument("--validacao", type=float, default=0.1, help="Fração reservada para validação (padrão: 0.1)")
+    parser.add_argument("--cache", action="store_true", help="Usa o cache persistente de sentimentos ao rotular")
+    args = parser.parse_args()
+    
+    if args.input.lower().endswith('.parquet'):
+        df = pd.read_parquet(args.input)
+    else:
+        df = carregar_arquivo(args.input)
+    if args.amostra and len(df) > args.amostra:
+        df = df.sample(args.amostra, random_state=0)
+    
+    if {'texto_limpo', 'sentimento'} <= set(df.columns):
+        print(f"📄 Usando os rótulos já calculados em {args.input}")
+        textos, rotulos = df['texto_limpo'].astype(str).tolist(), df['sentimento'].astype(str).tolist()
+        origem = "arquivo de resultados"
+    else:
+        textos, rotulos = rotular_com_bert(df[args.column].dropna().astype(str).tolist(), args.cache)
+        origem = "modelo BERT"
+    
+    pares = [(texto, rotulo) for texto, rotulo in zip(textos, rotulos) if rotulo in ("positivo", "neutro", "negativo")]
+    textos, rotulos = [texto for texto, _ in pares], [rotulo for _, rotulo in pares]
+    
+    print(f"🔄 Treinando com {len(textos)} textos...")
+    modelo, metricas = treinar_modelo_rapido(textos, rotulos, args.validacao)
+    
+    diretorio = salvar_modelo_rapido(modelo, {
+        'modelo_professor': MODELO_SENTIMENTO,
+        'origem_rotulos': origem,
+        'arquivo': args.input,
+        'metricas': metricas,
+    }, versao=args.versao)
+    
+    print(f"\n📊 Concordância com o BERT na validação: {metricas['concordancia_validacao']:.1%}")
+    print(f"F1 macro na validação: {metricas['f1_macro_validacao']:.3f}")
+    if metricas['textos_por_segundo']:
+        print(f"Vazão: {metricas['textos_por_segundo']:.0f} textos/s (um núcleo)")
+    print(f"✅ Modelo salvo em {diretorio}")
+    print("   Use-o com SENTIMENTO_BACKEND=rapido ou escolhendo-o na barra lateral da aplicação.")
+
+if __name__ == "__main__":
+    main()
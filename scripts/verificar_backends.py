@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Script para comparar os backends do modelo de sentimento com o PyTorch fp32.
+
+Informa, para cada backend (int8 quantizado e ONNX), a porcentagem de textos
+de uma amostra em que o rótulo difere do modelo original.
+
+Uso:
+    python scripts/verificar_backends.py
+    python scripts/verificar_backends.py --input data/dados_exemplo.csv --column texto --amostra 500
+"""
+
+import argparse
+import os
+import sys
+
+# Adiciona o diretório raiz ao path para poder importar os módulos
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.config import BACKENDS_SENTIMENTO
+from src.models.sentiment_analysis import comparar_backends
+
+# Corpus usado quando nenhum arquivo é informado
+TEXTOS_PADRAO = [
+    "Estou muito satisfeito com o curso, professores excelentes.",
+    "O atendimento foi ótimo e resolveram meu problema rapidamente.",
+    "A aula foi normal, nada muito especial.",
+    "O conteúdo é adequado, mas poderia ser mais aprofundado.",
+    "O suporte técnico é muito ruim, demoram dias para responder.",
+    "Material didático com muitos erros e mal explicado.",
+    "Produto chegou no prazo, funciona bem.",
+    "Péssima experiência, nunca mais compro aqui.",
+    "Não gostei, mas também não achei horrível.",
+    "Recomendo a todos, superou minhas expectativas!",
+]
+
+def carregar_amostra(caminho, coluna, tamanho):
+    """Carrega uma amostra de textos de um arquivo CSV/Excel."""
+    from src.data.data_handler import carregar_arquivo_em_blocos
+    
+    textos = []
+    for bloco in carregar_arquivo_em_blocos(caminho, coluna):
+        textos.extend(bloco[coluna].dropna().astype(str))
+        if len(textos) >= tamanho:
+            break
+    return textos[:tamanho]
+
+def main():
+    """Executa a comparação e imprime o relatório."""
+    parser = argparse.ArgumentParser(description="Compara backends do modelo de sentimento com o fp32.")
+    parser.add_argument("--input", help="Arquivo CSV/Excel com os textos da amostra")
+    parser.add_argument("--column", default="texto", help="Coluna com os textos (padrão: texto)")
+    parser.add_argument("--amostra", type=int, default=500, help="Quantidade máxima de textos")
+    parser.add_argument(
+        "--backends", nargs="+", default=[b for b in BACKENDS_SENTIMENTO if b != "pytorch"],
+        choices=[b for b in BACKENDS_SENTIMENTO if b != "pytorch"], help="Backends a comparar"
+    )
+    args = parser.parse_args()
+    
+    textos = carregar_amostra(args.input, args.column, args.amostra) if args.input else TEXTOS_PADRAO
+    print(f"🔄 Comparando {len(textos)} textos com o backend 'pytorch' (fp32)...")
+    
+    for backend, resultado in comparar_backends(textos, args.backends).items():
+        if 'erro' in resultado:
+            print(f"⚠️  {backend}: não foi possível carregar ({resultado['erro']})")
+        else:
+            print(
+                f"✅ {backend}: {resultado['divergentes']} de {resultado['total']} rótulos divergentes "
+                f"({resultado['divergentes_pct']:.2f}%)"
+            )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,3 @@
+"""
+Pacote com o serviço HTTP de inferência de sentimento.
+"""
\ No newline at end of file
@@ -0,0 +1,287 @@
+"""
+Serviço HTTP (asyncio) para análise de sentimento de mensagens individuais.
+
+Requisições simultâneas são agrupadas em micro-lotes antes de chamar o
+modelo: um lote é enviado quando atinge o tamanho máximo ou quando o tempo
+máximo de espera expira. A fila de requisições tem tamanho limitado; quando
+está cheia, o serviço responde 503 para que os clientes reduzam o ritmo.
+
+Rotas:
+    POST /sentimento  corpo JSON {"texto": "..."}
+    GET  /saude       estado do serviço e tamanho da fila
+    GET  /metricas    tempo, vazão e pico de memória de cada etapa (JSON)
+    GET  /metrics     as mesmas medições no formato texto do Prometheus
+
+Uso:
+    python main.py serve --port 8000 --max-batch 32 --max-wait-ms 10
+"""
+
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from src.utils.text_processing import preprocessar_textos
+from src.models.sentiment_analysis import analisar_sentimentos_em_lote, MAX_JANELAS_PADRAO
+from src.utils.instrumentacao import REGISTRO
+
+STATUS_HTTP = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+# Tamanho máximo aceito para o corpo de uma requisição (1 MB)
+TAMANHO_MAXIMO_CORPO = 1024 * 1024
+
+class FilaCheia(Exception):
+    """Indica que a fila de requisições atingiu o limite configurado."""
+
+class MicroLote:
+    """
+    Agrupa chamadas concorrentes em lotes para uma função de processamento.
+    
+    A função recebe uma lista de textos e retorna uma lista de resultados de
+    mesmo tamanho. Ela é executada em uma única thread separada, para não
+    bloquear o loop de eventos enquanto o modelo trabalha.
+    """
+    
+    def __init__(self, processar, max_lote=32, espera_max_ms=10, max_fila=1024):
+        """
+        Args:
+            processar (callable): Função que processa uma lista de textos
+            max_lote (int): Quantidade máxima de textos por lote
+            espera_max_ms (float): Tempo máximo de espera para completar um lote
+            max_fila (int): Quantidade máxima de requisições aguardando na fila
+        """
+        self.processar = processar
+        self.max_lote = max_lote
+        self.espera_max = espera_max_ms / 1000
+        self.fila = asyncio.Queue(maxsize=max_fila)
+        self.lotes_processados = 0
+        self.itens_processados = 0
+        self._executor = ThreadPoolExecutor(max_workers=1)
+    
+    async def enviar(self, texto):
+        """
+        Enfileira um texto e aguarda o resultado do lote em que ele for incluído.
+        
+        Raises:
+            FilaCheia: Se a fila estiver no limite
+        """
+        futuro = asyncio.get_running_loop().create_future()
+        try:
+            self.fila.put_nowait((texto, futuro))
+        except asyncio.QueueFull:
+            raise FilaCheia()
+        return await futuro
+    
+    async def _montar_lote(self):
+        """Aguarda o primeiro item e completa o lote até o limite de tamanho ou tempo."""
+        loop = asyncio.get_running_loop()
+        lote = [await self.fila.get()]
+        prazo = loop.time() + self.espera_max
+        while len(lote) < self.max_lote:
+            restante = prazo - loop.time()
+            if restante <= 0:
+                break
+            try:
+                lote.append(await asyncio.wait_for(self.fila.get(), restante))
+            except asyncio.TimeoutError:
+                break
+        return lote
+    
+    async def executar(self):
+        """Laço principal: monta lotes e entrega os resultados às requisições."""
+        loop = asyncio.get_running_loop()
+        while True:
+            lote = await self._montar_lote()
+            textos = [texto for texto, _ in lote]
+            try:
+                resultados = await loop.run_in_executor(self._executor, self.processar, textos)
+            except Exception as e:
+                for _, futuro in lote:
+                    if not futuro.done():
+                        futuro.set_exception(e)
+                continue
+            
+            self.lotes_processados += 1
+            self.itens_processados += len(lote)
+            for (_, futuro), resultado in zip(lote, resultados):
+                if not futuro.done():
+                    futuro.set_result(resultado)
+
+def criar_processador(nlp, stopwords_pt, classificador, cache=None, cascata=None,
+                      textos_longos=None, max_janelas=MAX_JANELAS_PADRAO, tamanho_lote=32):
+    """
+    Cria a função de processamento em lote usada pelo serviço.
+    
+    Args:
+        nlp: Modelo spaCy carregado
+        stopwords_pt: Conjunto de stopwords
+        classificador: Modelo de análise de sentimento
+        cache (CacheSentimento, opcional): Cache de sentimentos
+        cascata (CascataSentimento, opcional): Pré-classificador por léxico
+        textos_longos (str, opcional): Regra de combinação das janelas no modo de textos longos
+        max_janelas (int): Quantidade máxima de janelas por texto no modo de textos longos
+        tamanho_lote (int): Textos por lote enviado ao modelo
+    
+    Returns:
+        callable: Função que recebe uma lista de textos e retorna uma lista de dicionários
+            com 'texto_limpo' e 'sentimento' (None se o texto ficar vazio)
+    """
+    def processar(textos):
+        textos_limpos = list(preprocessar_textos(textos, nlp, stopwords_pt))
+        indices = [i for i, texto in enumerate(textos_limpos) if texto.strip() != ""]
+        sentimentos = analisar_sentimentos_em_lote(
+            [textos_limpos[i] for i in indices], classificador, tamanho_lote, cache=cache, cascata=cascata,
+            textos_longos=textos_longos, max_janelas=max_janelas
+        )
+        
+        resultados = [{'texto_limpo': texto, 'sentimento': None} for texto in textos_limpos]
+        for i, sentimento in zip(indices, sentimentos):
+            resultados[i]['sentimento'] = sentimento
+        return resultados
+    processar.cascata = cascata
+    return processar
+
+async def _ler_requisicao(leitor):
+    """
+    Lê uma requisição HTTP/1.1 simples.
+    
+    Returns:
+        tuple: Método, caminho, cabeçalhos (minúsculos) e corpo, ou None se a conexão fechou
+    """
+    linha = await leitor.readline()
+    if not linha:
+        return None
+    metodo, caminho, _ = linha.decode('latin-1').split(" ", 2)
+    
+    cabecalhos = {}
+    while True:
+        linha = await leitor.readline()
+        if linha in (b"\r\n", b"\n", b""):
+            break
+        nome, _, valor = linha.decode('latin-1').partition(":")
+        cabecalhos[nome.strip().lower()] = valor.strip()
+    
+    tamanho = int(cabecalhos.get('content-length', 0))
+    if tamanho > TAMANHO_MAXIMO_CORPO:
+        raise ValueError("corpo muito grande")
+    corpo = await leitor.readexactly(tamanho) if tamanho > 0 else b""
+    return metodo, caminho, cabecalhos, corpo
+
+def _resposta(status, dados, manter_conexao=True, extras=None):
+    """Monta uma resposta HTTP com corpo JSON (ou texto do Prometheus, se dados for uma string)."""
+    if isinstance(dados, str):
+        corpo = dados.encode('utf-8')
+        tipo = "text/plain; version=0.0.4; charset=utf-8"
+    else:
+        corpo = json.dumps(dados, ensure_ascii=False).encode('utf-8')
+        tipo = "application/json; charset=utf-8"
+    cabecalhos = [
+        f"HTTP/1.1 {status} {STATUS_HTTP[status]}",
+        f"Content-Type: {tipo}",
+        f"Content-Length: {len(corpo)}",
+        f"Connection: {'keep-alive' if manter_conexao else 'close'}",
+    ] + (extras or [])
+    return ("\r\n".join(cabecalhos) + "\r\n\r\n").encode('latin-1') + corpo
+
+class ServidorSentimento:
+    """Servidor HTTP que encaminha as requisições para um MicroLote."""
+    
+    def __init__(self, micro_lote):
+        self.micro_lote = micro_lote
+    
+    async def _atender(self, metodo, caminho, corpo):
+        """Processa uma requisição e retorna o status e os dados da resposta."""
+        if caminho == "/saude":
+            dados = {
+                'status': 'ok',
+                'fila': self.micro_lote.fila.qsize(),
+                'lotes_processados': self.micro_lote.lotes_processados,
+                'itens_processados': self.micro_lote.itens_processados,
+            }
+            cascata = getattr(self.micro_lote.processar, 'cascata', None)
+            if cascata is not None:
+                dados['cascata'] = cascata.estatisticas()
+            return 200, dados
+        if caminho == "/metricas":
+            return 200, REGISTRO.resumo()
+        if caminho == "/metrics":
+            return 200, REGISTRO.como_prometheus(extras={
+                'servico_fila': ("gauge", "Requisições aguardando na fila", self.micro_lote.fila.qsize()),
+                'servico_lotes_total': ("counter", "Micro-lotes processados", self.micro_lote.lotes_processados),
+                'servico_itens_total': ("counter", "Textos processados", self.micro_lote.itens_processados),
+            })
+        if caminho != "/sentimento":
+            return 404, {'erro': 'rota não encontrada'}
+        if metodo != "POST":
+            return 405, {'erro': 'use POST'}
+        
+        try:
+            texto = json.loads(corpo or b"{}")["texto"]
+        except (ValueError, KeyError, TypeError):
+            return 400, {'erro': 'corpo deve ser um JSON com o campo "texto"'}
+        if not isinstance(texto, str):
+            return 400, {'erro': 'o campo "texto" deve ser uma string'}
+        
+        try:
+            return 200, await self.micro_lote.enviar(texto)
+        except FilaCheia:
+            return 503, {'erro': 'serviço sobrecarregado, tente novamente'}
+        except Exception as e:
+            print(f"Erro ao processar lote no serviço: {e}")
+            return 500, {'erro': 'falha ao analisar o texto'}
+    
+    async def tratar_conexao(self, leitor, escritor):
+        """Atende as requisições de uma conexão (com suporte a keep-alive)."""
+        try:
+            while True:
+                try:
+                    requisicao = await _ler_requisicao(leitor)
+                except ValueError:
+                    escritor.write(_resposta(413, {'erro': 'requisição inválida ou muito grande'}, False))
+                    await escritor.drain()
+                    break
+                if requisicao is None:
+                    break
+                
+                metodo, caminho, cabecalhos, corpo = requisicao
+                manter_conexao = cabecalhos.get('connection', '').lower() != 'close'
+                status, dados = await self._atender(metodo, caminho, corpo)
+                extras = ["Retry-After: 1"] if status == 503 else None
+                escritor.write(_resposta(status, dados, manter_conexao, extras))
+                await escritor.drain()
+                if not manter_conexao:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            escritor.close()
+
+async def iniciar_servidor(processar, host="127.0.0.1", porta=8000, max_lote=32, espera_max_ms=10, max_fila=1024):
+    """
+    Inicia o servidor e o laço de micro-lotes e executa até ser interrompido.
+    
+    Args:
+        processar (callable): Função de processamento em lote (ver criar_processador)
+        host (str): Endereço de escuta
+        porta (int): Porta de escuta
+        max_lote (int): Quantidade máxima de textos por lote
+        espera_max_ms (float): Tempo máximo de espera para completar um lote
+        max_fila (int): Quantidade máxima de requisições aguardando na fila
+    """
+    micro_lote = MicroLote(processar, max_lote, espera_max_ms, max_fila)
+    servidor = ServidorSentimento(micro_lote)
+    tarefa_lotes = asyncio.create_task(micro_lote.executar())
+    
+    async with await asyncio.start_server(servidor.tratar_conexao, host, porta) as srv:
+        print(f"🚀 Serviço de sentimento em http://{host}:{porta} (lote máx. {max_lote}, espera máx. {espera_max_ms} ms)")
+        try:
+            await srv.serve_forever()
+        finally:
+            tarefa_lotes.cancel()
@@ -0,0 +1,399 @@
+"""
+Interface de linha de comando para análise de sentimento em lote.
+
+Permite processar arquivos sem a interface web (ex.: em cron ou Airflow).
+Este módulo não importa o Streamlit.
+
+Uso:
+    python main.py analyze --input dados.csv --column Message --output resultados.parquet --workers 4
+    python main.py topics --input dados.csv --column Message --topics 5
+    python main.py serve --port 8000
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from functools import partial
+
+import pandas as pd
+
+from src.data.data_handler import (
+    carregar_arquivo_em_blocos, aplicar_em_unicos, agregar_sentimentos, combinar_agregados,
+    contar_datas_invalidas, estatisticas_de_agregado, pivotar_agregado, salvar_resultados, PERIODOS_AGREGACAO
+)
+from src.utils.text_processing import load_nlp_resources, preprocessar_textos
+from src.models.sentiment_analysis import load_sentiment_model, analisar_sentimentos_em_lote, MAX_JANELAS_PADRAO
+from src.models.sentiment_cache import CacheSentimento
+from src.models.lexicon_sentiment import CascataSentimento
+from src.config import (
+    obter_limiar_cascata, obter_modo_textos_longos, obter_max_janelas, obter_config_execucao, AGREGACOES_JANELAS
+)
+from src.utils.execucao import criar_pool, configurar_processo_principal
+from src.utils.instrumentacao import REGISTRO
+
+def _carregar_modelos():
+    """Carrega o modelo spaCy, as stopwords e o classificador (compartilhados entre os processos)."""
+    nlp, stopwords_pt = load_nlp_resources()
+    return nlp, stopwords_pt, load_sentiment_model()
+
+def _preparar_worker(modelos, usar_cache=False, limiar_cascata=None, textos_longos=None,
+                     max_janelas=MAX_JANELAS_PADRAO, tamanho_lote=32):
+    """Abre o cache e cria a cascata no processo atual, que não podem ser herdados por fork."""
+    nlp, stopwords_pt, classificador = modelos
+    cache = CacheSentimento() if usar_cache else None
+    cascata = CascataSentimento(limiar_cascata) if limiar_cascata is not None else None
+    return (nlp, stopwords_pt, classificador, cache, cascata, textos_longos, max_janelas, tamanho_lote)
+
+def _processar_bloco(recursos, textos):
+    """
+    Pré-processa e classifica um bloco de textos no processo atual.
+    
+    Args:
+        recursos (tuple): Recursos do processo, criados por _preparar_worker
+        textos (list): Textos originais do bloco
+    
+    Returns:
+        tuple: Listas com os textos pré-processados e os sentimentos
+            ("" para textos vazios após o pré-processamento), a quantidade
+            de textos distintos resolvidos pela cascata e as medições das
+            etapas feitas no processo (somadas no processo principal)
+    """
+    nlp, stopwords_pt, classificador, cache, cascata, textos_longos, max_janelas, tamanho_lote = recursos
+    resolvidos_antes = cascata.textos_resolvidos if cascata is not None else 0
+    textos_limpos, _ = aplicar_em_unicos(
+        pd.Series(textos, dtype=object),
+        lambda unicos: preprocessar_textos(unicos, nlp, stopwords_pt)
+    )
+    
+    nao_vazios = textos_limpos[textos_limpos.str.strip() != ""]
+    sentimentos = pd.Series("", index=textos_limpos.index, dtype=object)
+    if len(nao_vazios) > 0:
+        sentimentos[nao_vazios.index], _ = aplicar_em_unicos(
+            nao_vazios,
+            lambda unicos: analisar_sentimentos_em_lote(
+                unicos, classificador, tamanho_lote, cache=cache, cascata=cascata,
+                textos_longos=textos_longos, max_janelas=max_janelas
+            )
+        )
+    resolvidos = cascata.textos_resolvidos - resolvidos_antes if cascata is not None else 0
+    return textos_limpos.tolist(), sentimentos.tolist(), resolvidos, REGISTRO.coletar()
+
+def _executar_blocos(blocos, pool):
+    """
+    Distribui os blocos entre os processos de trabalho do pool, preservando a ordem.
+    
+    No máximo 2 blocos por processo ficam pendentes ao mesmo tempo, o que
+    mantém o uso de memória limitado mesmo para arquivos grandes. Só os
+    textos são enviados aos processos; os blocos ficam no processo principal.
+    
+    Yields:
+        tuple: Bloco original e o resultado de _processar_bloco
+    """
+    aguardando = deque()
+    
+    def textos_dos_blocos():
+        for bloco, textos in blocos:
+            aguardando.append(bloco)
+            yield textos
+    
+    for resultado in pool.mapear(_processar_bloco, textos_dos_blocos()):
+        yield aguardando.popleft(), resultado
+
+def _base_do_caminho(saida):
+    """Remove a extensão do arquivo de saída (inclusive '.csv.gz')."""
+    if saida.lower().endswith('.csv.gz'):
+        return saida[:-len('.csv.gz')]
+    return os.path.splitext(saida)[0]
+
+def analisar_arquivo(entrada, coluna, saida, workers=None, tamanho_bloco=5000, colunas_extras=None,
+                     caminho_estatisticas=None, usar_cache=False, agrupar_por=None, periodo=None, coluna_data=None,
+                     limiar_cascata=None, textos_longos=None, max_janelas=MAX_JANELAS_PADRAO,
+                     threads=None, threads_interop=None, fork_apos_carregar=None, tamanho_lote=None,
+                     caminho_metricas=None):
+    """
+    Analisa o sentimento de todos os textos de uma coluna de um arquivo.
+    
+    Textos vazios após o pré-processamento e textos com erro na análise são
+    removidos do resultado, como na interface web. Os parâmetros de execução
+    omitidos (workers, threads, fork e tamanho do lote) vêm de obter_config_execucao.
+    
+    Args:
+        entrada (str): Caminho do arquivo CSV/Excel
+        coluna (str): Coluna com os textos
+        saida (str): Caminho do arquivo de resultados (.parquet, .csv ou .csv.gz)
+        workers (int, opcional): Número de processos de trabalho
+        tamanho_bloco (int): Quantidade de linhas enviadas a cada processo por vez
+        colunas_extras (list, opcional): Colunas adicionais copiadas para o resultado
+        caminho_estatisticas (str, opcional): Caminho do JSON de estatísticas.
+            Se None, usa o caminho de saída com extensão '.stats.json'
+        usar_cache (bool): Se True, usa o cache persistente de sentimentos
+        agrupar_por (list, opcional): Colunas usadas para detalhar as contagens (ex.: canal, autor)
+        periodo (str, opcional): Detalha as contagens no tempo: 'hora', 'dia' ou 'semana'
+        coluna_data (str, opcional): Coluna com as datas (obrigatória com `periodo`)
+        limiar_cascata (float, opcional): Se informado, textos que o léxico classifica
+            com confiança igual ou maior que o limiar não passam pelo modelo
+        textos_longos (str, opcional): Classifica textos com mais de 512 tokens por
+            janelas deslizantes, combinadas por 'media', 'ponderada' ou 'pior_caso'
+        max_janelas (int): Quantidade máxima de janelas por texto no modo de textos longos
+        threads (int, opcional): Threads intra-op do PyTorch por processo
+        threads_interop (int, opcional): Threads inter-op do PyTorch por processo
+        fork_apos_carregar (bool, opcional): Cria os processos por fork depois de
+            carregar os modelos, compartilhando os pesos
+        tamanho_lote (int, opcional): Textos por lote enviado ao modelo em cada processo
+        caminho_metricas (str, opcional): Arquivo onde as medições de cada etapa são
+            gravadas, no formato texto do Prometheus (.prom) ou em JSON (demais extensões)
+    
+    Returns:
+        dict: Estatísticas da análise, com as medições de cada etapa em 'desempenho'
+    """
+    inicio = time.perf_counter()
+    REGISTRO.limpar()
+    agrupar_por = list(agrupar_por or [])
+    if periodo is not None and coluna_data is None:
+        raise ValueError("Informe a coluna de datas para agrupar por período")
+    
+    # As colunas de agrupamento também precisam ser lidas do arquivo
+    colunas_lidas = list(colunas_extras or [])
+    for extra in agrupar_por + ([coluna_data] if periodo is not None else []):
+        if extra not in colunas_lidas and extra != coluna:
+            colunas_lidas.append(extra)
+    
+    blocos = (
+        (bloco, bloco[coluna].astype(str).tolist())
+        for bloco in carregar_arquivo_em_blocos(entrada, coluna, colunas_lidas, tamanho_bloco)
+    )
+    
+    config = dict(obter_config_execucao(), **{chave: valor for chave, valor in {
+        'workers': workers,
+        'threads_intra': threads,
+        'threads_inter': threads_interop,
+        'fork_apos_carregar': fork_apos_carregar,
+        'tamanho_lote': tamanho_lote,
+    }.items() if valor is not None})
+    preparar = partial(
+        _preparar_worker,
+        usar_cache=usar_cache,
+        limiar_cascata=limiar_cascata,
+        textos_longos=textos_longos,
+        max_janelas=max_janelas,
+        tamanho_lote=config['tamanho_lote'],
+    )
+    
+    diretorio = os.path.dirname(saida)
+    if diretorio:
+        os.makedirs(diretorio, exist_ok=True)
+    _remover_resultados_anteriores(saida)
+    
+    # Cada bloco é gravado assim que termina; só as contagens ficam em memória
+    agregados = []
+    lidos = vazios = erros = resolvidos_cascata = gravados = 0
+    with criar_pool(_carregar_modelos, preparar, config) as pool:
+        for bloco, (textos_limpos, sentimentos, resolvidos, medicoes) in _executar_blocos(blocos, pool):
+            REGISTRO.combinar(medicoes)
+            resolvidos_cascata += resolvidos
+            lidos += len(bloco)
+            bloco = bloco.assign(texto_limpo=textos_limpos, sentimento=sentimentos)
+            vazios += int((bloco['sentimento'] == "").sum())
+            erros += int((bloco['sentimento'] == "erro").sum())
+            bloco = bloco[~bloco['sentimento'].isin(["", "erro"])]
+            if len(bloco) > 0:
+                salvar_resultados(bloco, saida, anexar=True)
+                gravados += len(bloco)
+            # Contagens parciais de cada bloco, somadas no final
+            agregados.append(agregar_sentimentos(bloco, agrupar_por, periodo, coluna_data))
+            print(f"⏳ {lidos} linhas processadas...", file=sys.stderr)
+        workers, fork, threads = pool.workers, pool.fork, pool.threads_intra
+    
+    if gravados == 0:
+        salvar_resultados(pd.DataFrame(columns=[coluna, 'texto_limpo', 'sentimento']), saida, anexar=True)
+    
+    agregado = combinar_agregados(agregados)
+    stats = estatisticas_de_agregado(agregado)
+    if agrupar_por or periodo is not None:
+        caminho_agregados = _base_do_caminho(saida) + '.agregados.csv'
+        pivotar_agregado(agregado).to_csv(caminho_agregados, index=False)
+        stats['arquivo_agregados'] = caminho_agregados
+    if periodo is not None:
+        # Linhas sem data válida ficam no agregado com período vazio, em vez de sumir
+        stats['datas_invalidas'] = contar_datas_invalidas(agregado)
+        if stats['datas_invalidas'] > 0:
+            print(f"⚠️ {stats['datas_invalidas']} linhas sem data válida na coluna '{coluna_data}'", file=sys.stderr)
+    stats.update({
+        'arquivo': entrada,
+        'coluna': coluna,
+        'linhas_lidas': lidos,
+        'removidos_vazios': vazios,
+        'removidos_erro': erros,
+        'workers': workers,
+        'fork_apos_carregar': fork,
+        'threads': threads,
+        'tamanho_lote': config['tamanho_lote'],
+        'cascata_limiar': limiar_cascata,
+        'cascata_resolvidos': resolvidos_cascata,
+        'textos_longos': textos_longos,
+        'max_janelas': max_janelas if textos_longos is not None else None,
+        'tempo_segundos': round(time.perf_counter() - inicio, 3),
+        'desempenho': REGISTRO.resumo(),
+    })
+    
+    if caminho_metricas is not None:
+        salvar_metricas(caminho_metricas)
+    if caminho_estatisticas is None:
+        caminho_estatisticas = _base_do_caminho(saida) + '.stats.json'
+    with open(caminho_estatisticas, 'w', encoding='utf-8') as arquivo:
+        json.dump(stats, arquivo, ensure_ascii=False, indent=2)
+    
+    return stats
+
+def _remover_resultados_anteriores(saida):
+    """
+    Remove os resultados de uma execução anterior, já que os blocos são acrescentados à saída.
+    
+    Em Parquet a saída é um diretório com arquivos 'parte-NNNNN.parquet' (ver
+    salvar_resultados); só esses arquivos são removidos.
+    
+    Args:
+        saida (str): Caminho dos resultados
+    """
+    if os.path.isdir(saida):
+        for nome in os.listdir(saida):
+            if nome.startswith('parte-') and nome.endswith('.parquet'):
+                os.remove(os.path.join(saida, nome))
+    elif os.path.exists(saida):
+        os.remove(saida)
+
+def salvar_metricas(caminho):
+    """
+    Grava as medições das etapas em texto do Prometheus (.prom) ou em JSON.
+    
+    Args:
+        caminho (str): Arquivo de destino
+    """
+    conteudo = REGISTRO.como_prometheus() if caminho.lower().endswith('.prom') else REGISTRO.como_json()
+    with open(caminho, 'w', encoding='utf-8') as arquivo:
+        arquivo.write(conteudo)
+
+def criar_parser():
+    """Cria o parser de argumentos da linha de comando."""
+    parser = argparse.ArgumentParser(prog="main.py", description="Análise de sentimento em lote (sem interface web).")
+    subcomandos = parser.add_subparsers(dest="comando", required=True)
+    
+    analyze = subcomandos.add_parser("analyze", help="Analisa o sentimento dos textos de um arquivo CSV/Excel")
+    analyze.add_argument("--input", required=True, help="Arquivo CSV/Excel de entrada")
+    analyze.add_argument("--column", default="Message", help="Coluna com os textos (padrão: Message)")
+    analyze.add_argument("--output", required=True, help="Arquivo de resultados (.parquet, .csv ou .csv.gz)")
+    analyze.add_argument("--stats", help="Arquivo JSON de estatísticas (padrão: <output>.stats.json)")
+    analyze.add_argument("--keep", nargs="*", default=[], help="Colunas adicionais a copiar para o resultado")
+    analyze.add_argument("--workers", type=int, help="Número de processos de trabalho (padrão: SENTIMENTO_WORKERS ou 1)")
+    analyze.add_argument("--chunk-size", type=int, default=5000, help="Linhas por bloco enviado aos processos")
+    analyze.add_argument("--batch-size", type=int, help="Textos por lote do modelo em cada processo (padrão: 32)")
+    analyze.add_argument("--threads", type=int, help="Threads intra-op do PyTorch por processo (padrão: núcleos / workers)")
+    analyze.add_argument("--interop-threads", type=int, help="Threads inter-op do PyTorch por processo")
+    analyze.add_argument("--fork", action=argparse.BooleanOptionalAction, default=None,
+                         help="Cria os processos por fork depois de carregar os modelos (padrão: sim, onde houver fork)")
+    analyze.add_argument("--cache", action="store_true", help="Usa o cache persistente de sentimentos")
+    analyze.add_argument("--cascade-threshold", type=float, default=obter_limiar_cascata(),
+                         help="Resolve pelo léxico os textos com confiança >= limiar, sem passar pelo modelo")
+    analyze.add_argument("--long-text", choices=AGREGACOES_JANELAS, default=obter_modo_textos_longos(),
+                         help="Classifica textos com mais de 512 tokens por janelas deslizantes, combinando-as pela regra escolhida")
+    analyze.add_argument("--max-windows", type=int, default=obter_max_janelas(),
+                         help="Janelas por texto no modo de textos longos (padrão: 8)")
+    analyze.add_argument("--group-by", nargs="*", default=[], help="Colunas para detalhar as contagens (ex.: canal autor)")
+    analyze.add_argument("--period", choices=PERIODOS_AGREGACAO, help="Detalha as contagens por hora, dia ou semana")
+    analyze.add_argument("--date-column", help="Coluna com as datas, usada com --period")
+    analyze.add_argument("--metrics", help="Grava o tempo e a vazão de cada etapa (.prom: formato do Prometheus; demais: JSON)")
+    
+    topics = subcomandos.add_parser("topics", help="Treina tópicos LDA de forma incremental (online) sobre um arquivo")
+    topics.add_argument("--input", required=True, help="Arquivo CSV/Excel de entrada")
+    topics.add_argument("--column", default="Message", help="Coluna com os textos (padrão: Message)")
+    topics.add_argument("--topics", type=int, default=3, help="Número de tópicos (padrão: 3)")
+    topics.add_argument("--state", default="data/lda_online.joblib", help="Arquivo de estado do modelo (continua o treino se existir)")
+    topics.add_argument("--chunk-size", type=int, default=10000, help="Linhas por bloco de treinamento")
+    topics.add_argument("--metrics", help="Grava o tempo e a vazão de cada etapa (.prom: formato do Prometheus; demais: JSON)")
+    
+    serve = subcomandos.add_parser("serve", help="Inicia o serviço HTTP de análise de sentimento")
+    serve.add_argument("--host", default="127.0.0.1", help="Endereço de escuta (padrão: 127.0.0.1)")
+    serve.add_argument("--port", type=int, default=8000, help="Porta de escuta (padrão: 8000)")
+    serve.add_argument("--max-batch", type=int, default=32, help="Textos por micro-lote (padrão: 32)")
+    serve.add_argument("--max-wait-ms", type=float, default=10, help="Espera máxima para completar um lote (padrão: 10)")
+    serve.add_argument("--max-queue", type=int, default=1024, help="Requisições aguardando antes de responder 503")
+    serve.add_argument("--cache", action="store_true", help="Usa o cache persistente de sentimentos")
+    serve.add_argument("--cascade-threshold", type=float, default=obter_limiar_cascata(),
+                       help="Resolve pelo léxico os textos com confiança >= limiar, sem passar pelo modelo")
+    serve.add_argument("--long-text", choices=AGREGACOES_JANELAS, default=obter_modo_textos_longos(),
+                       help="Classifica textos com mais de 512 tokens por janelas deslizantes, combinando-as pela regra escolhida")
+    serve.add_argument("--max-windows", type=int, default=obter_max_janelas(),
+                       help="Janelas por texto no modo de textos longos (padrão: 8)")
+    return parser
+
+def main(argv=None):
+    """
+    Ponto de entrada da linha de comando.
+    
+    Returns:
+        int: Código de saída do processo
+    """
+    args = criar_parser().parse_args(argv)
+    
+    if args.comando == "analyze":
+        stats = analisar_arquivo(
+            args.input,
+            args.column,
+            args.output,
+            workers=args.workers,
+            tamanho_bloco=args.chunk_size,
+            colunas_extras=args.keep,
+            caminho_estatisticas=args.stats,
+            usar_cache=args.cache,
+            agrupar_por=args.group_by,
+            periodo=args.period,
+            coluna_data=args.date_column,
+            limiar_cascata=args.cascade_threshold,
+            textos_longos=args.long_text,
+            max_janelas=args.max_windows,
+            threads=args.threads,
+            threads_interop=args.interop_threads,
+            fork_apos_carregar=args.fork,
+            tamanho_lote=args.batch_size,
+            caminho_metricas=args.metrics,
+        )
+        print(json.dumps(stats, ensure_ascii=False, indent=2))
+    elif args.comando == "topics":
+        from src.models.topic_analysis import identificar_topicos_online
+        
+        nlp, stopwords_pt = load_nlp_resources()
+        blocos = (
+            preprocessar_textos(bloco[args.column].astype(str), nlp, stopwords_pt)
+            for bloco in carregar_arquivo_em_blocos(args.input, args.column, tamanho_bloco=args.chunk_size)
+        )
+        topicos = identificar_topicos_online(blocos, stopwords_pt, args.topics, args.state)
+        if args.metrics:
+            salvar_metricas(args.metrics)
+        for i, termos in enumerate(topicos):
+            print(f"Tópico {i+1}: {' | '.join(termos)}")
+    elif args.comando == "serve":
+        import asyncio
+        from src.api.server import criar_processador, iniciar_servidor
+        
+        config = obter_config_execucao()
+        configurar_processo_principal(dict(config, workers=1))
+        recursos = _preparar_worker(
+            _carregar_modelos(), args.cache, args.cascade_threshold, args.long_text, args.max_windows,
+            config['tamanho_lote']
+        )
+        processar = criar_processador(*recursos)
+        try:
+            asyncio.run(iniciar_servidor(
+                processar,
+                args.host,
+                args.port,
+                max_lote=args.max_batch,
+                espera_max_ms=args.max_wait_ms,
+                max_fila=args.max_queue,
+            ))
+        except KeyboardInterrupt:
+            print("\n👋 Serviço encerrado.")
+    return 0
@@ -0,0 +1,137 @@
+"""
+Configurações da aplicação definidas por variáveis de ambiente.
+"""
+
+import os
+
+# Backends disponíveis para o modelo de sentimento:
+# - pytorch: modelo original em fp32
+# - pytorch-int8: PyTorch com quantização dinâmica int8 das camadas lineares
+# - onnx: modelo exportado para ONNX e executado com onnxruntime
+# - rapido: modelo TF-IDF + regressão logística destilado do BERT (sem PyTorch)
+BACKENDS_SENTIMENTO = ("pytorch", "pytorch-int8", "onnx", "rapido")
+
+def obter_backend_sentimento():
+    """
+    Lê o backend do modelo de sentimento da variável SENTIMENTO_BACKEND.
+    
+    Returns:
+        str: Nome do backend (padrão: 'pytorch')
+    """
+    backend = os.environ.get("SENTIMENTO_BACKEND", "pytorch").strip().lower()
+    if backend not in BACKENDS_SENTIMENTO:
+        raise ValueError(
+            f"Backend de sentimento inválido: {backend}. Opções: {', '.join(BACKENDS_SENTIMENTO)}"
+        )
+    return backend
+
+# Regras de combinação das janelas no modo de textos longos:
+# - media: média dos logits das janelas
+# - ponderada: média ponderada pela quantidade de tokens das janelas
+# - pior_caso: janela com maior probabilidade de sentimento negativo
+AGREGACOES_JANELAS = ("media", "ponderada", "pior_caso")
+
+def obter_modo_textos_longos():
+    """
+    Lê a regra de combinação do modo de textos longos da variável SENTIMENTO_TEXTOS_LONGOS.
+    
+    Returns:
+        str: 'media', 'ponderada' ou 'pior_caso', ou None se o modo estiver
+            desativado (padrão: textos truncados em 512 tokens)
+    """
+    agregacao = os.environ.get("SENTIMENTO_TEXTOS_LONGOS", "").strip().lower()
+    if not agregacao:
+        return None
+    if agregacao not in AGREGACOES_JANELAS:
+        raise ValueError(
+            f"Modo de textos longos inválido: {agregacao}. Opções: {', '.join(AGREGACOES_JANELAS)}"
+        )
+    return agregacao
+
+def obter_max_janelas():
+    """
+    Quantidade máxima de janelas por texto no modo de textos longos.
+    
+    Returns:
+        int: Valor definido em SENTIMENTO_MAX_JANELAS (padrão: 8)
+    """
+    return int(os.environ.get("SENTIMENTO_MAX_JANELAS", "8"))
+
+def obter_diretorio_onnx():
+    """
+    Diretório onde o modelo exportado para ONNX é guardado entre execuções.
+    
+    Returns:
+        str: Caminho definido em SENTIMENTO_ONNX_DIR (padrão: 'data/onnx')
+    """
+    return os.environ.get("SENTIMENTO_ONNX_DIR", os.path.join("data", "onnx"))
+
+def obter_diretorio_modelo_rapido():
+    """
+    Diretório raiz dos modelos rápidos treinados (uma subpasta por versão).
+    
+    Returns:
+        str: Caminho definido em MODELO_RAPIDO_DIR (padrão: 'data/modelos_rapidos')
+    """
+    return os.environ.get("MODELO_RAPIDO_DIR", os.path.join("data", "modelos_rapidos"))
+
+def obter_diretorio_modelos():
+    """
+    Diretório raiz do repositório local de modelos (uma subpasta por versão).
+    
+    Returns:
+        str: Caminho definido em MODELOS_DIR (padrão: 'data/modelos')
+    """
+    return os.environ.get("MODELOS_DIR", os.path.join("data", "modelos"))
+
+def obter_versao_modelos():
+    """
+    Versão do repositório local de modelos a ser usada.
+    
+    Returns:
+        str: Versão definida em MODELOS_VERSAO, ou None para usar a versão
+            marcada como atual pelo scripts/setup.py
+    """
+    versao = os.environ.get("MODELOS_VERSAO", "").strip()
+    return versao or None
+
+def obter_limiar_cascata():
+    """
+    Limiar de confiança da pré-classificação por léxico (cascata).
+    
+    Returns:
+        float: Valor definido em SENTIMENTO_CASCATA_LIMIAR, ou None se a
+            cascata estiver desativada (padrão)
+    """
+    limiar = os.environ.get("SENTIMENTO_CASCATA_LIMIAR", "").strip()
+    return float(limiar) if limiar else None
+
+def obter_config_execucao():
+    """
+    Configuração de execução da inferência (threads do PyTorch e processos de trabalho).
+    
+    Variáveis de ambiente:
+    - SENTIMENTO_THREADS: threads intra-op do PyTorch por processo
+      (padrão: núcleos disponíveis divididos pelo número de processos)
+    - SENTIMENTO_THREADS_INTEROP: threads inter-op do PyTorch (padrão: o do PyTorch)
+    - SENTIMENTO_WORKERS: número de processos de trabalho (padrão: 1)
+    - SENTIMENTO_FORK: '1' para criar os processos por fork depois de carregar
+      os modelos, compartilhando os pesos (padrão: '1' onde há fork)
+    - SENTIMENTO_LOTE: textos por lote em cada processo (padrão: 32)
+    
+    Returns:
+        dict: Chaves 'threads_intra', 'threads_inter', 'workers', 'fork_apos_carregar'
+            e 'tamanho_lote' (threads None = padrão)
+    """
+    def inteiro(nome, padrao=None):
+        valor = os.environ.get(nome, "").strip()
+        return int(valor) if valor else padrao
+    
+    fork = os.environ.get("SENTIMENTO_FORK", "").strip().lower()
+    return {
+        'threads_intra': inteiro("SENTIMENTO_THREADS"),
+        'threads_inter': inteiro("SENTIMENTO_THREADS_INTEROP"),
+        'workers': inteiro("SENTIMENTO_WORKERS", 1),
+        'fork_apos_carregar': fork not in ("0", "false", "nao", "não") if fork else hasattr(os, "fork"),
+        'tamanho_lote': inteiro("SENTIMENTO_LOTE", 32),
+    }
@@ -4,40 +4,187 @@ Módulo para manipulação de dados de entrada e saída.
 
 import pandas as pd
 import numpy as np
+import io
 import os
 
-def carregar_arquivo(file):
+from src.utils.instrumentacao import medir_etapa
+
+def _nome_do_arquivo(file):
+    """
+    Obtém o nome de um arquivo a partir de um caminho ou objeto de upload.
+    
+    Args:
+        file: Caminho (str) ou objeto UploadedFile do Streamlit
+    
+    Returns:
+        str: Nome do arquivo em minúsculas, usado para identificar o formato
+    """
+    if isinstance(file, str):
+        return file.lower()
+    return file.name.lower()
+
+def _rebobinar(file):
+    """Volta objetos de arquivo ao início para permitir uma nova leitura."""
+    if hasattr(file, 'seek'):
+        file.seek(0)
+
+@medir_etapa("carregar_arquivo", itens=len)
+def carregar_arquivo(file, nrows=None):
     """
     Carrega um arquivo CSV ou Excel em um DataFrame pandas.
     
     Args:
         file: Objeto de arquivo (pode ser um caminho ou um objeto UploadedFile do Streamlit)
-        
+        nrows (int, opcional): Quantidade máxima de linhas a ler (ex.: para pré-visualização)
+    
     Returns:
         DataFrame: DataFrame pandas com os dados carregados
     """
-    # Verifica se é um caminho ou um objeto de upload
-    if isinstance(file, str):
-        caminho = file
-    else:
-        nome_arquivo = file.name
-        
+    nome_arquivo = _nome_do_arquivo(file)
+    _rebobinar(file)
+    
     # Determina o tipo de arquivo e carrega
     if nome_arquivo.endswith('.csv'):
-        return pd.read_csv(file)
+        return pd.read_csv(file, nrows=nrows)
     elif nome_arquivo.endswith(('.xlsx', '.xls')):
-        return pd.read_excel(file)
+        return pd.read_excel(file, nrows=nrows)
     else:
         raise ValueError(f"Formato de arquivo não suportado: {nome_arquivo}")
 
-def salvar_resultados(df, caminho=None):
+def ler_colunas(file):
     """
-    Salva um DataFrame com resultados em formato CSV.
+    Lê apenas o cabeçalho de um arquivo CSV ou Excel.
+    
+    Permite preencher a seleção de colunas sem carregar o arquivo inteiro.
     
     Args:
-        df (DataFrame): DataFrame a ser salvo
-        caminho (str, opcional): Caminho para salvar o arquivo. Se None, usa 'data/resultados.csv'
+        file: Objeto de arquivo (pode ser um caminho ou um objeto UploadedFile do Streamlit)
+    
+    Returns:
+        list: Nomes das colunas do arquivo
+    """
+    nome_arquivo = _nome_do_arquivo(file)
+    _rebobinar(file)
+    
+    if nome_arquivo.endswith('.xlsx'):
+        from contextlib import closing
+        from openpyxl import load_workbook
+        
+        # No modo somente leitura o arquivo fica aberto até o workbook ser fechado
+        with closing(load_workbook(file, read_only=True)) as workbook:
+            cabecalho = next(workbook.active.iter_rows(max_row=1, values_only=True), ())
+        colunas = [str(coluna) for coluna in cabecalho if coluna is not None]
+    else:
+        # Lido direto pelo pandas: carregar_arquivo registraria uma execução da etapa carregar_arquivo
+        colunas = list(pd.read_csv(file, nrows=0).columns)
+    
+    _rebobinar(file)
+    return colunas
+
+@medir_etapa("carregar_arquivo", itens=len)
+def carregar_arquivo_em_blocos(file, coluna_texto, colunas_extras=None, tamanho_bloco=10000):
+    """
+    Lê um arquivo CSV ou Excel em blocos, carregando apenas as colunas necessárias.
+    
+    O uso de memória fica limitado ao tamanho de um bloco, independentemente
+    do tamanho do arquivo, exceto em arquivos .xls (formato antigo): eles não
+    suportam leitura incremental e a planilha inteira é carregada antes de ser
+    dividida, então o limite de memória não vale para eles (converta-os para
+    .xlsx ou CSV).
+    
+    Args:
+        file: Objeto de arquivo (pode ser um caminho ou um objeto UploadedFile do Streamlit)
+        coluna_texto (str): Coluna com o texto a ser analisado
+        colunas_extras (list, opcional): Colunas adicionais a manter (ex.: id, data)
+        tamanho_bloco (int): Quantidade de linhas por bloco
+    
+    Yields:
+        DataFrame: Blocos com até `tamanho_bloco` linhas e apenas as colunas selecionadas
+    """
+    colunas = [coluna_texto] + [c for c in (colunas_extras or []) if c != coluna_texto]
+    nome_arquivo = _nome_do_arquivo(file)
+    _rebobinar(file)
+    
+    if nome_arquivo.endswith('.csv'):
+        leitor = pd.read_csv(
+            file,
+            usecols=colunas,
+            dtype={coluna_texto: str},
+            chunksize=tamanho_bloco
+        )
+        for bloco in leitor:
+            yield bloco[colunas]
+    elif nome_arquivo.endswith('.xlsx'):
+        from contextlib import closing
+        from openpyxl import load_workbook
         
+        # Fechado também quando a coluna falta ou o consumidor para antes do fim
+        with closing(load_workbook(file, read_only=True)) as livro:
+            linhas = livro.active.iter_rows(values_only=True)
+            cabecalho = [str(coluna) for coluna in next(linhas, ())]
+            faltando = [c for c in colunas if c not in cabecalho]
+            if faltando:
+                raise ValueError(f"Colunas não encontradas no arquivo: {faltando}")
+            posicoes = [cabecalho.index(c) for c in colunas]
+            
+            registros = []
+            inicio = 0
+            for linha in linhas:
+                registros.append([linha[i] if i < len(linha) else None for i in posicoes])
+                if len(registros) == tamanho_bloco:
+                    yield _bloco_excel(registros, colunas, coluna_texto, inicio)
+                    inicio += len(registros)
+                    registros = []
+            if registros:
+                yield _bloco_excel(registros, colunas, coluna_texto, inicio)
+    elif nome_arquivo.endswith('.xls'):
+        # Sem leitura incremental: a planilha inteira fica em memória (ver docstring)
+        df = pd.read_excel(file, usecols=colunas, dtype={coluna_texto: str})[colunas]
+        for inicio in range(0, len(df), tamanho_bloco):
+            yield df.iloc[inicio:inicio + tamanho_bloco]
+    else:
+        raise ValueError(f"Formato de arquivo não suportado: {nome_arquivo}")
+
+def _bloco_excel(registros, colunas, coluna_texto, inicio):
+    """Monta um bloco de DataFrame a partir de linhas lidas com openpyxl."""
+    bloco = pd.DataFrame(registros, columns=colunas, index=pd.RangeIndex(inicio, inicio + len(registros)))
+    texto = bloco[coluna_texto]
+    bloco[coluna_texto] = texto.where(texto.isna(), texto.astype(str))
+    return bloco
+
+# Formatos de exportação: extensão do arquivo e tipo MIME
+FORMATOS_EXPORTACAO = {
+    'parquet': ('.parquet', 'application/octet-stream'),
+    'csv.gz': ('.csv.gz', 'application/gzip'),
+    'csv': ('.csv', 'text/csv'),
+}
+
+def _formato_do_caminho(caminho):
+    """Identifica o formato de exportação pela extensão do caminho (padrão: CSV)."""
+    caminho = caminho.lower().rstrip('/\\')
+    if caminho.endswith('.parquet'):
+        return 'parquet'
+    if caminho.endswith('.csv.gz'):
+        return 'csv.gz'
+    return 'csv'
+
+def salvar_resultados(df, caminho=None, formato=None, anexar=False):
+    """
+    Salva um DataFrame com resultados em CSV, CSV compactado (gzip) ou Parquet.
+    
+    Com `anexar=True`, os dados são acrescentados ao que já foi salvo, o que
+    permite gravar os resultados bloco a bloco sem mantê-los todos em memória:
+    em CSV as linhas são acrescentadas ao arquivo (o cabeçalho só é escrito
+    uma vez); em Parquet o caminho é tratado como um diretório (dataset) e
+    cada chamada grava um novo arquivo 'parte-NNNNN.parquet'.
+    
+    Args:
+        df (DataFrame): DataFrame a ser salvo
+        caminho (str ou arquivo binário, opcional): Caminho para salvar o arquivo (ou buffer,
+            como io.BytesIO, com `formato` informado). Se None, usa 'data/resultados.csv'
+        formato (str, opcional): 'csv', 'csv.gz' ou 'parquet'. Se None, usa a extensão do caminho
+        anexar (bool): Se True, acrescenta os dados aos resultados já salvos
+    
     Returns:
         str: Caminho onde o arquivo foi salvo
     """
@@ -45,33 +192,220 @@ def salvar_resultados(df, caminho=None):
         # Garantir que o diretório exista
         os.makedirs('data', exist_ok=True)
         caminho = 'data/resultados.csv'
-        
-    df.to_csv(caminho, index=False)
+    
+    formato = formato or _formato_do_caminho(caminho)
+    if formato not in FORMATOS_EXPORTACAO:
+        raise ValueError(f"Formato inválido: {formato}. Opções: {', '.join(FORMATOS_EXPORTACAO)}")
+    
+    if formato == 'parquet':
+        if anexar:
+            os.makedirs(caminho, exist_ok=True)
+            partes = [nome for nome in os.listdir(caminho) if nome.endswith('.parquet')]
+            df.to_parquet(os.path.join(caminho, f"parte-{len(partes):05d}.parquet"), index=False)
+        else:
+            df.to_parquet(caminho, index=False)
+        return caminho
+    
+    ja_existe = anexar and os.path.exists(caminho) and os.path.getsize(caminho) > 0
+    df.to_csv(
+        caminho,
+        index=False,
+        mode='a' if anexar else 'w',
+        header=not ja_existe,
+        compression='gzip' if formato == 'csv.gz' else None
+    )
     return caminho
 
+def exportar_resultados(df, formato='parquet'):
+    """
+    Gera o conteúdo do arquivo de resultados para download.
+    
+    O arquivo é montado em memória (e não em um arquivo temporário), para
+    ser entregue ao usuário, por exemplo, com st.download_button, que de todo
+    modo mantém o conteúdo em memória; nada fica em disco ao fim da sessão.
+    
+    Args:
+        df (DataFrame): DataFrame a ser exportado
+        formato (str): 'parquet', 'csv.gz' ou 'csv'
+    
+    Returns:
+        bytes: Conteúdo do arquivo
+    """
+    if formato not in FORMATOS_EXPORTACAO:
+        raise ValueError(f"Formato inválido: {formato}. Opções: {', '.join(FORMATOS_EXPORTACAO)}")
+    
+    buffer = io.BytesIO()
+    salvar_resultados(df, buffer, formato)
+    return buffer.getvalue()
+
+def aplicar_em_unicos(valores, funcao):
+    """
+    Aplica uma função em lote apenas aos valores únicos e replica os resultados.
+    
+    Útil para evitar processar várias vezes textos idênticos (retweets,
+    mensagens copiadas), que são comuns em exportações de redes sociais.
+    
+    Args:
+        valores (Series ou list): Valores de entrada, possivelmente repetidos
+        funcao (callable): Função que recebe a lista de valores únicos e
+            retorna uma lista de resultados de mesmo tamanho
+    
+    Returns:
+        tuple: Series com o resultado de cada linha (mesmo índice da entrada)
+            e a taxa de duplicação (fração de linhas que eram repetidas)
+    """
+    serie = valores if isinstance(valores, pd.Series) else pd.Series(list(valores))
+    codigos, unicos = pd.factorize(serie, use_na_sentinel=False)
+    
+    resultados_unicos = np.empty(len(unicos), dtype=object)
+    resultados_unicos[:] = list(funcao(list(unicos)))
+    
+    total = len(serie)
+    taxa_duplicacao = 1 - len(unicos)/total if total > 0 else 0
+    return pd.Series(resultados_unicos[codigos], index=serie.index), taxa_duplicacao
+
+# Rótulos de sentimento considerados nas estatísticas
+SENTIMENTOS = ("positivo", "neutro", "negativo")
+
+# Períodos aceitos para agrupar os resultados no tempo
+PERIODOS_AGREGACAO = ("hora", "dia", "semana")
+
+def _agrupar_no_periodo(datas, periodo):
+    """
+    Trunca datas para o início do período (hora, dia ou semana).
+    
+    O formato é identificado valor a valor, então uma coluna que mistura
+    "02/01/2024" e "2024-01-02" é lida por inteiro; datas com barras são
+    interpretadas como dia/mês/ano.
+    
+    Args:
+        datas (Series): Datas (ou textos conversíveis em data)
+        periodo (str): 'hora', 'dia' ou 'semana'
+    
+    Returns:
+        Series: Início do período de cada data (NaT para datas ausentes ou inválidas)
+    """
+    datas = pd.to_datetime(datas, errors='coerce', format='mixed', dayfirst=True)
+    if periodo == 'hora':
+        return datas.dt.floor(pd.Timedelta(hours=1))
+    if periodo == 'dia':
+        return datas.dt.floor(pd.Timedelta(days=1))
+    if periodo == 'semana':
+        if datas.dt.tz is not None:
+            datas = datas.dt.tz_localize(None)
+        return datas.dt.to_period('W').dt.start_time
+    raise ValueError(f"Período inválido: {periodo}. Opções: {', '.join(PERIODOS_AGREGACAO)}")
+
+def agregar_sentimentos(df, agrupar_por=None, periodo=None, coluna_data=None):
+    """
+    Conta os sentimentos de um DataFrame em uma única passagem.
+    
+    Args:
+        df (DataFrame): DataFrame com coluna 'sentimento'
+        agrupar_por (list, opcional): Colunas adicionais de agrupamento (ex.: canal, autor)
+        periodo (str, opcional): Agrupa também no tempo: 'hora', 'dia' ou 'semana'
+        coluna_data (str, opcional): Coluna com as datas (obrigatória com `periodo`)
+    
+    Returns:
+        DataFrame: Tabela de contagens com as colunas de agrupamento, 'periodo'
+            (se usado), 'sentimento' e 'contagem'
+    """
+    colunas = {coluna: df[coluna] for coluna in (agrupar_por or [])}
+    if periodo is not None:
+        if coluna_data is None:
+            raise ValueError("Informe a coluna de datas para agrupar por período")
+        colunas['periodo'] = _agrupar_no_periodo(df[coluna_data], periodo)
+    colunas['sentimento'] = df['sentimento']
+    
+    contagens = pd.DataFrame(colunas).value_counts(dropna=False, sort=False)
+    return contagens.rename('contagem').reset_index().sort_values(list(colunas), ignore_index=True)
+
+def contar_datas_invalidas(agregado):
+    """
+    Conta as linhas de uma tabela de contagens sem período (data ausente ou inválida).
+    
+    Args:
+        agregado (DataFrame): Tabela retornada por agregar_sentimentos ou combinar_agregados
+    
+    Returns:
+        int: Quantidade de linhas com período NaT (0 se a tabela não tem período)
+    """
+    if 'periodo' not in agregado.columns:
+        return 0
+    return int(agregado.loc[agregado['periodo'].isna(), 'contagem'].sum())
+
+def combinar_agregados(agregados):
+    """
+    Combina tabelas de contagens parciais (ex.: de blocos ou processos diferentes).
+    
+    Args:
+        agregados (iterável): Tabelas retornadas por agregar_sentimentos, com as mesmas colunas
+    
+    Returns:
+        DataFrame: Tabela de contagens somadas
+    """
+    agregados = [agregado for agregado in agregados if agregado is not None]
+    if not agregados:
+        return pd.DataFrame({'sentimento': pd.Series(dtype=object), 'contagem': pd.Series(dtype='int64')})
+    
+    juntos = pd.concat(agregados, ignore_index=True)
+    chaves = [coluna for coluna in juntos.columns if coluna != 'contagem']
+    return juntos.groupby(chaves, dropna=False, sort=True)['contagem'].sum().reset_index()
+
+def pivotar_agregado(agregado):
+    """
+    Converte uma tabela de contagens para o formato largo (uma coluna por sentimento).
+    
+    Args:
+        agregado (DataFrame): Tabela retornada por agregar_sentimentos ou combinar_agregados
+    
+    Returns:
+        DataFrame: Uma linha por grupo, com as colunas de cada sentimento e 'total'
+    """
+    chaves = [coluna for coluna in agregado.columns if coluna not in ('sentimento', 'contagem')]
+    if not chaves:
+        agregado = agregado.assign(grupo=0)
+    
+    tabela = (
+        agregado.groupby((chaves or ['grupo']) + ['sentimento'], dropna=False)['contagem'].sum()
+        .unstack('sentimento', fill_value=0)
+    )
+    # O total inclui rótulos fora de SENTIMENTOS (ex.: ausentes), como em criar_estatisticas
+    total = tabela.sum(axis=1)
+    tabela = tabela.reindex(columns=list(SENTIMENTOS), fill_value=0)
+    tabela['total'] = total
+    tabela.columns.name = None
+    return tabela.reset_index() if chaves else tabela.reset_index(drop=True)
+
+def estatisticas_de_agregado(agregado):
+    """
+    Calcula as estatísticas gerais de sentimento a partir de uma tabela de contagens.
+    
+    Args:
+        agregado (DataFrame): Tabela retornada por agregar_sentimentos ou combinar_agregados
+    
+    Returns:
+        dict: Dicionário com estatísticas de sentimento (mesmo formato de criar_estatisticas)
+    """
+    por_sentimento = agregado.groupby('sentimento', dropna=False)['contagem'].sum()
+    total = int(por_sentimento.sum())
+    
+    stats = {'total': total}
+    for sentimento, chave in zip(SENTIMENTOS, ('positivos', 'neutros', 'negativos')):
+        contagem = int(por_sentimento.get(sentimento, 0))
+        stats[chave] = contagem
+        stats[f'{chave}_pct'] = (contagem/total)*100 if total > 0 else 0
+    
+    return stats
+
 def criar_estatisticas(df):
     """
     Cria estatísticas básicas a partir de um DataFrame com resultados de sentimento.
     
     Args:
         df (DataFrame): DataFrame com coluna 'sentimento'
-        
+    
     Returns:
         dict: Dicionário com estatísticas de sentimento
     """
-    total = len(df)
-    positivos = len(df[df['sentimento'] == 'positivo'])
-    negativos = len(df[df['sentimento'] == 'negativo'])
-    neutros = len(df[df['sentimento'] == 'neutro'])
-    
-    stats = {
-        'total': total,
-        'positivos': positivos,
-        'positivos_pct': (positivos/total)*100 if total > 0 else 0,
-        'neutros': neutros,
-        'neutros_pct': (neutros/total)*100 if total > 0 else 0,
-        'negativos': negativos,
-        'negativos_pct': (negativos/total)*100 if total > 0 else 0,
-    }
-    
-    return stats 
\ No newline at end of file
+    return estatisticas_de_agregado(agregar_sentimentos(df))
@@ -0,0 +1,207 @@
+"""
+Módulo com o classificador de sentimento rápido (modo rápido).
+
+Um modelo TF-IDF + regressão logística é treinado com os rótulos que o
+modelo BERT (nlptown) produziu para o nosso próprio corpus (destilação) e
+classifica milhares de textos por segundo em um único núcleo, sem PyTorch.
+
+Os modelos treinados ficam em diretórios versionados:
+
+    data/modelos_rapidos/
+    ├── ATUAL                # versão usada por padrão
+    └── 20240301-120000/
+        ├── modelo.joblib    # pipeline scikit-learn
+        └── metadados.json   # origem dos rótulos e métricas de validação
+"""
+
+import json
+import os
+import time
+
+from src.config import obter_diretorio_modelo_rapido
+
+ARQUIVO_VERSAO_ATUAL = "ATUAL"
+ARQUIVO_MODELO = "modelo.joblib"
+ARQUIVO_METADADOS = "metadados.json"
+
+# Prefixo do nome do modelo (usado nas chaves de cache)
+PREFIXO_NOME = "rapido"
+
+class ClassificadorRapido:
+    """
+    Classificador destilado com a mesma interface de chamada do pipeline do transformers.
+    
+    Pode ser passado para analisar_sentimento e analisar_sentimentos_em_lote
+    no lugar do pipeline: recebe um texto ou uma lista de textos e retorna
+    dicionários com 'label' (positivo, neutro ou negativo) e 'score'.
+    """
+    
+    def __init__(self, modelo, versao, metadados=None):
+        """
+        Args:
+            modelo: Pipeline scikit-learn treinado (TF-IDF + classificador linear)
+            versao (str): Versão do modelo
+            metadados (dict, opcional): Informações de treinamento do modelo
+        """
+        self.modelo = modelo
+        self.versao = versao
+        self.metadados = metadados or {}
+        self.nome_modelo_sentimento = f"{PREFIXO_NOME}/{versao}"
+    
+    def __call__(self, textos, **kwargs):
+        """
+        Classifica um texto ou uma lista de textos.
+        
+        Parâmetros extras do pipeline (batch_size, truncation) são aceitos e ignorados.
+        
+        Returns:
+            list: Um dicionário {'label', 'score'} por texto
+        """
+        if isinstance(textos, str):
+            textos = [textos]
+        if len(textos) == 0:
+            return []
+        
+        probabilidades = self.modelo.predict_proba(list(textos))
+        classes = self.modelo.classes_
+        melhores = probabilidades.argmax(axis=1)
+        return [
+            {'label': classes[indice], 'score': float(probabilidades[i, indice])}
+            for i, indice in enumerate(melhores)
+        ]
+
+def treinar_modelo_rapido(textos, rotulos, proporcao_validacao=0.1, semente=0):
+    """
+    Treina o modelo rápido com rótulos produzidos pelo modelo BERT.
+    
+    Args:
+        textos (list): Textos pré-processados (mesmo pré-processamento usado na análise)
+        rotulos (list): Sentimento de cada texto (positivo, neutro ou negativo)
+        proporcao_validacao (float): Fração dos textos reservada para validação
+        semente (int): Semente da divisão treino/validação e do classificador
+    
+    Returns:
+        tuple: Pipeline treinado e dicionário com as métricas de validação
+            (concordância com os rótulos do BERT, F1 macro e textos por segundo)
+    """
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.metrics import accuracy_score, f1_score
+    from sklearn.model_selection import train_test_split
+    from sklearn.pipeline import Pipeline
+    
+    textos = [str(texto) for texto in textos]
+    rotulos = list(rotulos)
+    contagens = {rotulo: rotulos.count(rotulo) for rotulo in set(rotulos)}
+    estratificar = rotulos if min(contagens.values()) >= 2 else None
+    textos_treino, textos_validacao, rotulos_treino, rotulos_validacao = train_test_split(
+        textos, rotulos, test_size=proporcao_validacao, random_state=semente, stratify=estratificar
+    )
+    
+    modelo = Pipeline([
+        ('tfidf', TfidfVectorizer(ngram_range=(1, 2), min_df=2, sublinear_tf=True, max_features=200000)),
+        ('classificador', LogisticRegression(max_iter=1000, random_state=semente)),
+    ])
+    modelo.fit(textos_treino, rotulos_treino)
+    
+    inicio = time.perf_counter()
+    previstos = modelo.predict(textos_validacao)
+    duracao = time.perf_counter() - inicio
+    
+    metricas = {
+        'textos_treino': len(textos_treino),
+        'textos_validacao': len(textos_validacao),
+        'distribuicao_rotulos': contagens,
+        'concordancia_validacao': float(accuracy_score(rotulos_validacao, previstos)),
+        'f1_macro_validacao': float(f1_score(rotulos_validacao, previstos, average='macro')),
+        'textos_por_segundo': len(textos_validacao)/duracao if duracao > 0 else None,
+    }
+    return modelo, metricas
+
+def salvar_modelo_rapido(modelo, metadados, raiz=None, versao=None):
+    """
+    Salva um modelo rápido em uma nova versão e a marca como atual.
+    
+    Args:
+        modelo: Pipeline treinado por treinar_modelo_rapido
+        metadados (dict): Informações de treinamento (origem dos rótulos, métricas)
+        raiz (str, opcional): Diretório raiz dos modelos rápidos (padrão: MODELO_RAPIDO_DIR)
+        versao (str, opcional): Nome da versão (padrão: data e hora atuais)
+    
+    Returns:
+        str: Diretório da versão salva
+    """
+    import joblib
+    
+    raiz = raiz or obter_diretorio_modelo_rapido()
+    versao = versao or time.strftime("%Y%m%d-%H%M%S")
+    diretorio = os.path.join(raiz, versao)
+    if os.path.exists(diretorio):
+        raise FileExistsError(f"A versão '{versao}' já existe em {raiz}")
+    os.makedirs(diretorio)
+    
+    joblib.dump(modelo, os.path.join(diretorio, ARQUIVO_MODELO))
+    metadados = dict(metadados, versao=versao, criado_em=time.strftime("%Y-%m-%dT%H:%M:%S"))
+    with open(os.path.join(diretorio, ARQUIVO_METADADOS), 'w', encoding='utf-8') as arquivo:
+        json.dump(metadados, arquivo, ensure_ascii=False, indent=2)
+    
+    # Marca a nova versão como atual só depois que tudo foi gravado
+    temporario = os.path.join(raiz, ARQUIVO_VERSAO_ATUAL + ".tmp")
+    with open(temporario, 'w', encoding='utf-8') as arquivo:
+        arquivo.write(versao)
+    os.replace(temporario, os.path.join(raiz, ARQUIVO_VERSAO_ATUAL))
+    return diretorio
+
+def listar_modelos_rapidos(raiz=None):
+    """
+    Lista as versões de modelos rápidos disponíveis, da mais recente para a mais antiga.
+    
+    Args:
+        raiz (str, opcional): Diretório raiz dos modelos rápidos (padrão: MODELO_RAPIDO_DIR)
+    
+    Returns:
+        list: Nomes das versões
+    """
+    raiz = raiz or obter_diretorio_modelo_rapido()
+    if not os.path.isdir(raiz):
+        return []
+    versoes = [
+        nome for nome in os.listdir(raiz)
+        if os.path.exists(os.path.join(raiz, nome, ARQUIVO_MODELO))
+    ]
+    return sorted(versoes, reverse=True)
+
+def carregar_modelo_rapido(versao=None, raiz=None):
+    """
+    Carrega uma versão do modelo rápido.
+    
+    Args:
+        versao (str, opcional): Versão a carregar (padrão: a marcada como atual)
+        raiz (str, opcional): Diretório raiz dos modelos rápidos (padrão: MODELO_RAPIDO_DIR)
+    
+    Returns:
+        ClassificadorRapido: Classificador pronto para uso
+    
+    Raises:
+        FileNotFoundError: Se não houver modelo treinado
+    """
+    import joblib
+    
+    raiz = raiz or obter_diretorio_modelo_rapido()
+    if versao is None:
+        caminho_atual = os.path.join(raiz, ARQUIVO_VERSAO_ATUAL)
+        if not os.path.exists(caminho_atual):
+            raise FileNotFoundError(
+                f"Nenhum modelo rápido em {raiz}. Treine um com scripts/treinar_modelo_rapido.py"
+            )
+        with open(caminho_atual, encoding='utf-8') as arquivo:
+            versao = arquivo.read().strip()
+    
+    diretorio = os.path.join(raiz, versao)
+    modelo = joblib.load(os.path.join(diretorio, ARQUIVO_MODELO))
+    metadados = {}
+    caminho_metadados = os.path.join(diretorio, ARQUIVO_METADADOS)
+    if os.path.exists(caminho_metadados):
+        with open(caminho_metadados, encoding='utf-8') as arquivo:
+            metadados = json.load(arquivo)
+    return ClassificadorRapido(modelo, versao, metadados)
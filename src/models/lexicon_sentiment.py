@@ -0,0 +1,203 @@
+"""
+Módulo com a pré-classificação de sentimento por léxico (cascata).
+
+Um léxico de lemas em português com pesos de polaridade classifica, de forma
+quase instantânea, os textos cujo sentimento é evidente ("ótimo", "péssimo");
+apenas os textos incertos seguem para o modelo transformer. O limiar de
+confiança controla o equilíbrio entre velocidade e concordância com o modelo.
+
+O léxico opera sobre a saída de `lematizar` (lemas em minúsculas, sem
+stopwords, mas com as negações). Textos com uma negação próxima de uma
+palavra do léxico ("não gostar") e textos com pouca evidência (menos de
+`min_lemas` palavras do léxico) seguem sempre para o modelo.
+"""
+
+import json
+import threading
+
+from src.utils.text_processing import NEGADORES
+
+# Limiar padrão de confiança para resolver um texto pelo léxico
+LIMIAR_PADRAO = 0.7
+
+# Quantidade mínima de lemas do léxico para resolver um texto sem o modelo
+MIN_LEMAS_PADRAO = 2
+
+# Quantidade de lemas antes de uma palavra do léxico em que uma negação a afeta
+JANELA_NEGACAO = 3
+
+# Lemas com polaridade (positiva > 0, negativa < 0) e intensidade de 1 a 3.
+# Inclui variantes sem acento, comuns em mensagens de redes sociais.
+LEXICO_PADRAO = {
+    # Positivos
+    "adorar": 3, "amar": 3, "excelente": 3, "ótimo": 3, "otimo": 3, "perfeito": 3,
+    "maravilhoso": 3, "incrível": 3, "incrivel": 3, "fantástico": 3, "fantastico": 3,
+    "sensacional": 3, "espetacular": 3, "parabéns": 3, "parabens": 3, "impecável": 3,
+    "bom": 2, "gostar": 2, "recomendar": 2, "satisfeito": 2, "feliz": 2, "eficiente": 2,
+    "agradável": 2, "agradavel": 2, "lindo": 2, "legal": 2, "top": 2, "show": 2,
+    "elogiar": 2, "elogio": 2, "atencioso": 2, "educado": 2, "confiável": 2, "melhor": 2,
+    "sucesso": 2, "alegria": 2, "encantar": 2, "satisfação": 2, "satisfacao": 2,
+    "obrigado": 1, "agradecer": 1, "rápido": 1, "rapido": 1, "prático": 1, "pratico": 1,
+    "resolver": 1, "funcionar": 1, "qualidade": 1, "bem": 1, "facilidade": 1, "ágil": 1,
+    # Negativos
+    "péssimo": -3, "pessimo": -3, "horrível": -3, "horrivel": -3, "terrível": -3,
+    "terrivel": -3, "odiar": -3, "lixo": -3, "fraude": -3, "golpe": -3, "enganar": -3,
+    "descaso": -3, "decepcionante": -3, "vergonhoso": -3, "absurdo": -2, "ruim": -2,
+    "decepcionar": -2, "decepção": -2, "decepcao": -2, "insatisfeito": -2, "defeito": -2,
+    "defeituoso": -2, "quebrar": -2, "quebrado": -2, "pior": -2, "vergonha": -2,
+    "raiva": -2, "triste": -2, "desrespeito": -2, "mentir": -2, "mentira": -2,
+    "roubar": -2, "nojo": -2, "detestar": -2, "problema": -1, "atrasar": -1, "atraso": -1,
+    "demorar": -1, "demora": -1, "lento": -1, "caro": -1, "reclamar": -1,
+    "reclamação": -1, "reclamacao": -1, "cancelar": -1, "falha": -1, "falhar": -1,
+    "erro": -1, "difícil": -1, "dificil": -1, "ninguém": -1,
+}
+
+def carregar_lexico(caminho):
+    """
+    Carrega um léxico de um arquivo JSON no formato {"lema": peso}.
+    
+    Args:
+        caminho (str): Caminho do arquivo JSON
+    
+    Returns:
+        dict: Léxico com os lemas em minúsculas
+    """
+    with open(caminho, encoding='utf-8') as arquivo:
+        return {lema.lower(): float(peso) for lema, peso in json.load(arquivo).items()}
+
+class CascataSentimento:
+    """
+    Pré-classificador por léxico colocado à frente do modelo de sentimento.
+    
+    A confiança de um texto é |positivo - negativo| / (positivo + negativo + alfa),
+    onde positivo e negativo são as somas dos pesos dos lemas encontrados. O
+    termo alfa reduz a confiança de textos com poucas palavras do léxico, e
+    textos com palavras das duas polaridades ficam com confiança baixa. Textos
+    com menos de `min_lemas` palavras do léxico ou com uma palavra do léxico
+    negada ficam com confiança zero e seguem para o modelo.
+    
+    Attributes:
+        textos_avaliados (int): Quantidade de textos avaliados pelo léxico
+        textos_resolvidos (int): Quantidade de textos classificados sem o modelo
+    """
+    
+    def __init__(self, limiar=LIMIAR_PADRAO, lexico=None, alfa=1.0, min_lemas=MIN_LEMAS_PADRAO):
+        """
+        Args:
+            limiar (float): Confiança mínima (0 a 1) para resolver um texto pelo léxico
+            lexico (dict, opcional): Lemas e pesos de polaridade (padrão: LEXICO_PADRAO)
+            alfa (float): Suavização que penaliza textos com poucas palavras do léxico
+            min_lemas (int): Quantidade mínima de lemas do léxico no texto para resolvê-lo
+        """
+        self.limiar = limiar
+        self.lexico = LEXICO_PADRAO if lexico is None else lexico
+        self.alfa = alfa
+        self.min_lemas = min_lemas
+        self.textos_avaliados = 0
+        self.textos_resolvidos = 0
+        self._trava = threading.Lock()
+    
+    def pontuar(self, texto):
+        """
+        Calcula a polaridade e a confiança de um texto lematizado.
+        
+        Args:
+            texto (str): Texto lematizado (lemas separados por espaços)
+        
+        Returns:
+            tuple: Sentimento sugerido ('positivo', 'negativo' ou None) e confiança (0 a 1)
+        """
+        positivo = negativo = 0.0
+        encontrados = 0
+        ultima_negacao = None
+        for posicao, lema in enumerate(str(texto).lower().split()):
+            if lema in NEGADORES:
+                ultima_negacao = posicao
+                continue
+            peso = self.lexico.get(lema)
+            if peso is None:
+                continue
+            if ultima_negacao is not None and posicao - ultima_negacao <= JANELA_NEGACAO:
+                # A negação pode inverter ou atenuar a polaridade: o modelo decide
+                return None, 0.0
+            encontrados += 1
+            if peso > 0:
+                positivo += peso
+            else:
+                negativo -= peso
+        
+        if encontrados < self.min_lemas or positivo == negativo:
+            return None, 0.0
+        confianca = abs(positivo - negativo) / (positivo + negativo + self.alfa)
+        return ("positivo" if positivo > negativo else "negativo"), confianca
+    
+    def classificar(self, textos):
+        """
+        Classifica os textos cuja confiança atinge o limiar.
+        
+        Args:
+            textos (list): Textos lematizados
+        
+        Returns:
+            list: Sentimento de cada texto, ou None para os textos incertos
+                (que devem ser enviados ao modelo)
+        """
+        rotulos = []
+        for texto in textos:
+            sentimento, confianca = self.pontuar(texto)
+            rotulos.append(sentimento if sentimento is not None and confianca >= self.limiar else None)
+        
+        with self._trava:
+            self.textos_avaliados += len(rotulos)
+            self.textos_resolvidos += sum(1 for rotulo in rotulos if rotulo is not None)
+        return rotulos
+    
+    def estatisticas(self):
+        """
+        Retorna quanto do tráfego foi resolvido pelo léxico.
+        
+        Returns:
+            dict: Textos avaliados, resolvidos e fração resolvida sem o modelo
+        """
+        with self._trava:
+            avaliados, resolvidos = self.textos_avaliados, self.textos_resolvidos
+        return {
+            'limiar': self.limiar,
+            'avaliados': avaliados,
+            'resolvidos': resolvidos,
+            'fracao_resolvida': resolvidos/avaliados if avaliados > 0 else 0,
+        }
+
+def avaliar_cascata(textos, classificador, limiares=(LIMIAR_PADRAO,), lexico=None, batch_size=32):
+    """
+    Mede, em uma amostra de validação, a fração resolvida pelo léxico e a
+    concordância desses rótulos com o modelo transformer.
+    
+    Args:
+        textos (list): Textos lematizados da amostra
+        classificador: Modelo de análise de sentimento usado como referência
+        limiares (tuple): Limiares de confiança avaliados
+        lexico (dict, opcional): Léxico avaliado (padrão: LEXICO_PADRAO)
+        batch_size (int): Quantidade de textos por lote no modelo
+    
+    Returns:
+        dict: Para cada limiar, a fração resolvida pelo léxico e a concordância
+            com o modelo nos textos resolvidos
+    """
+    from src.models.sentiment_analysis import analisar_sentimentos_em_lote
+    
+    textos = [str(texto) for texto in textos]
+    referencia = analisar_sentimentos_em_lote(textos, classificador, batch_size)
+    
+    resultado = {}
+    for limiar in limiares:
+        rotulos = CascataSentimento(limiar, lexico).classificar(textos)
+        resolvidos = [(rotulo, ref) for rotulo, ref in zip(rotulos, referencia) if rotulo is not None]
+        concordantes = sum(1 for rotulo, ref in resolvidos if rotulo == ref)
+        resultado[limiar] = {
+            'total': len(textos),
+            'resolvidos': len(resolvidos),
+            'fracao_resolvida': len(resolvidos)/len(textos) if textos else 0,
+            'concordancia': concordantes/len(resolvidos) if resolvidos else None,
+        }
+    return resultado
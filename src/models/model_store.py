@@ -0,0 +1,177 @@
+"""
+Módulo com o repositório local (offline) de modelos.
+
+O scripts/setup.py exporta, uma única vez, os modelos usados pela aplicação
+para um diretório versionado:
+
+    data/modelos/
+    ├── ATUAL                   # nome da versão em uso
+    └── 20240301-120000/
+        ├── manifesto.json      # versões, origem e checksums
+        ├── sentimento/         # pesos safetensors, configuração e tokenizador
+        ├── spacy/              # modelo spaCy salvo com nlp.to_disk
+        └── stopwords_pt.json   # stopwords do NLTK em português
+
+Quando o repositório existe, os carregadores leem os modelos dele, sem acessar
+a rede. Os pesos safetensors são mapeados em memória, de modo que vários
+processos de trabalho compartilham as mesmas páginas do arquivo.
+"""
+
+import hashlib
+import json
+import os
+import time
+
+from src.config import obter_diretorio_modelos, obter_versao_modelos
+
+ARQUIVO_VERSAO_ATUAL = "ATUAL"
+ARQUIVO_MANIFESTO = "manifesto.json"
+ARQUIVO_STOPWORDS = "stopwords_pt.json"
+DIRETORIO_SENTIMENTO = "sentimento"
+DIRETORIO_SPACY = "spacy"
+
+def _sha256_do_arquivo(caminho):
+    """Calcula o SHA-256 de um arquivo, lendo-o em blocos."""
+    h = hashlib.sha256()
+    with open(caminho, 'rb') as arquivo:
+        for bloco in iter(lambda: arquivo.read(1024 * 1024), b""):
+            h.update(bloco)
+    return h.hexdigest()
+
+def localizar_modelos():
+    """
+    Localiza o diretório da versão em uso do repositório local de modelos.
+    
+    A versão vem da variável MODELOS_VERSAO ou, se ela não estiver definida,
+    do arquivo ATUAL gravado pelo scripts/setup.py.
+    
+    Returns:
+        str: Diretório da versão, ou None se o repositório não existir
+    """
+    raiz = obter_diretorio_modelos()
+    versao = obter_versao_modelos()
+    if versao is None:
+        caminho_atual = os.path.join(raiz, ARQUIVO_VERSAO_ATUAL)
+        if not os.path.exists(caminho_atual):
+            return None
+        with open(caminho_atual, encoding='utf-8') as arquivo:
+            versao = arquivo.read().strip()
+    
+    diretorio = os.path.join(raiz, versao)
+    if not os.path.exists(os.path.join(diretorio, ARQUIVO_MANIFESTO)):
+        print(f"Aviso: versão '{versao}' do repositório de modelos não encontrada em {raiz}")
+        return None
+    return diretorio
+
+def ler_manifesto(diretorio):
+    """
+    Lê o manifesto de uma versão do repositório local de modelos.
+    
+    Args:
+        diretorio (str): Diretório da versão
+    
+    Returns:
+        dict: Conteúdo do manifesto
+    """
+    with open(os.path.join(diretorio, ARQUIVO_MANIFESTO), encoding='utf-8') as arquivo:
+        return json.load(arquivo)
+
+def exportar_modelos(modelo_sentimento, modelo_spacy="pt_core_news_sm", raiz=None, versao=None):
+    """
+    Exporta os modelos para uma nova versão do repositório local e a marca como atual.
+    
+    Os modelos são carregados da forma usual (hub do Hugging Face, pacote do
+    spaCy e dados do NLTK), então esta função precisa de acesso à rede ou
+    dos caches já preenchidos.
+    
+    Args:
+        modelo_sentimento (str): Nome (no hub) ou caminho do modelo de sentimento
+        modelo_spacy (str): Nome do pacote do modelo spaCy
+        raiz (str, opcional): Diretório raiz do repositório (padrão: MODELOS_DIR)
+        versao (str, opcional): Nome da versão (padrão: data e hora atuais)
+    
+    Returns:
+        str: Diretório da versão exportada
+    """
+    import spacy
+    from nltk.corpus import stopwords
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+    
+    raiz = raiz or obter_diretorio_modelos()
+    versao = versao or time.strftime("%Y%m%d-%H%M%S")
+    diretorio = os.path.join(raiz, versao)
+    if os.path.exists(diretorio):
+        raise FileExistsError(f"A versão '{versao}' já existe em {raiz}")
+    
+    # Modelo de sentimento: pesos em safetensors, que podem ser mapeados em memória
+    diretorio_sentimento = os.path.join(diretorio, DIRETORIO_SENTIMENTO)
+    modelo = AutoModelForSequenceClassification.from_pretrained(modelo_sentimento)
+    modelo.save_pretrained(diretorio_sentimento, safe_serialization=True)
+    AutoTokenizer.from_pretrained(modelo_sentimento).save_pretrained(diretorio_sentimento)
+    
+    # Modelo spaCy e stopwords
+    nlp = spacy.load(modelo_spacy)
+    nlp.to_disk(os.path.join(diretorio, DIRETORIO_SPACY))
+    stopwords_pt = sorted(set(stopwords.words('portuguese')))
+    with open(os.path.join(diretorio, ARQUIVO_STOPWORDS), 'w', encoding='utf-8') as arquivo:
+        json.dump(stopwords_pt, arquivo, ensure_ascii=False)
+    
+    pesos = os.path.join(diretorio_sentimento, "model.safetensors")
+    manifesto = {
+        'versao': versao,
+        'criado_em': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'sentimento': {
+            'modelo': modelo_sentimento,
+            'revisao': getattr(modelo.config, "_commit_hash", None),
+            'sha256_pesos': _sha256_do_arquivo(pesos) if os.path.exists(pesos) else None,
+        },
+        'spacy': {
+            'modelo': modelo_spacy,
+            'versao': nlp.meta.get('version'),
+            'versao_spacy': spacy.__version__,
+        },
+        'stopwords': {
+            'idioma': 'portuguese',
+            'quantidade': len(stopwords_pt),
+        },
+    }
+    with open(os.path.join(diretorio, ARQUIVO_MANIFESTO), 'w', encoding='utf-8') as arquivo:
+        json.dump(manifesto, arquivo, ensure_ascii=False, indent=2)
+    
+    # Marca a nova versão como atual só depois que tudo foi gravado
+    temporario = os.path.join(raiz, ARQUIVO_VERSAO_ATUAL + ".tmp")
+    with open(temporario, 'w', encoding='utf-8') as arquivo:
+        arquivo.write(versao)
+    os.replace(temporario, os.path.join(raiz, ARQUIVO_VERSAO_ATUAL))
+    return diretorio
+
+def carregar_modelo_mapeado(diretorio):
+    """
+    Carrega um modelo de classificação salvo em safetensors com os pesos mapeados em memória.
+    
+    Os tensores do modelo passam a apontar diretamente para o arquivo mapeado
+    (sem cópia), então processos que carregam o mesmo arquivo compartilham as
+    páginas no cache do sistema operacional. Requer torch>=2.1 (argumento
+    assign de load_state_dict).
+    
+    Args:
+        diretorio (str): Diretório com config.json e model.safetensors
+    
+    Returns:
+        objeto: Modelo transformers em modo de avaliação
+    """
+    from safetensors.torch import load_file
+    from transformers import AutoConfig, AutoModelForSequenceClassification
+    
+    pesos = os.path.join(diretorio, "model.safetensors")
+    if not os.path.exists(pesos):
+        # Ex.: pesos divididos em vários arquivos; usa o carregamento padrão
+        return AutoModelForSequenceClassification.from_pretrained(diretorio)
+    
+    modelo = AutoModelForSequenceClassification.from_config(AutoConfig.from_pretrained(diretorio))
+    faltantes, _ = modelo.load_state_dict(load_file(pesos), strict=False, assign=True)
+    if faltantes:
+        print(f"Aviso: pesos ausentes em {pesos}: {', '.join(faltantes)}")
+    modelo.tie_weights()
+    modelo.name_or_path = diretorio
+    return modelo.eval()
@@ -2,37 +2,700 @@
 Módulo para análise de sentimento em textos.
 """
 
-from transformers import pipeline
+import os
+import threading
+import time
 
-def load_sentiment_model():
+import numpy as np
+
+from src.config import obter_backend_sentimento, obter_diretorio_onnx, AGREGACOES_JANELAS
+from src.models.model_store import DIRETORIO_SENTIMENTO, localizar_modelos, ler_manifesto, carregar_modelo_mapeado
+from src.utils.instrumentacao import medir_etapa
+
+MODELO_SENTIMENTO = "nlptown/bert-base-multilingual-uncased-sentiment"
+
+# Ordem das colunas das probabilidades retornadas pelo MotorInferencia
+SENTIMENTOS = np.array(["positivo", "neutro", "negativo"])
+
+# Limite de tokens do modelo BERT (incluindo [CLS] e [SEP])
+MAX_TOKENS = 512
+
+# Modo de textos longos (janelas deslizantes): limite de janelas por texto e
+# tokens em comum entre janelas consecutivas
+MAX_JANELAS_PADRAO = 8
+SOBREPOSICAO_PADRAO = 64
+
+def load_sentiment_model(backend=None):
     """
     Carrega o modelo de análise de sentimento.
     
+    Se o repositório local de modelos existir (ver scripts/setup.py), o modelo
+    é lido dele, sem acessar a rede; caso contrário, é obtido do hub.
+    
+    Args:
+        backend (str, opcional): 'pytorch', 'pytorch-int8', 'onnx' ou 'rapido'. Se None,
+            usa a variável de ambiente SENTIMENTO_BACKEND (padrão: 'pytorch')
+    
     Returns:
         objeto: Modelo de análise de sentimento (pipeline)
     """
-    return pipeline("sentiment-analysis", model="nlptown/bert-base-multilingual-uncased-sentiment")
+    if backend is None:
+        backend = obter_backend_sentimento()
+    
+    inicio = time.perf_counter()
+    if backend == "rapido":
+        # Modelo destilado (versão atual), treinado com scripts/treinar_modelo_rapido.py
+        from src.models.fast_sentiment import carregar_modelo_rapido
+        classificador = carregar_modelo_rapido()
+        print(f"⏱️ Modelo de sentimento rápido ({classificador.versao}) carregado em {time.perf_counter() - inicio:.2f} s")
+        return classificador
+    
+    diretorio_modelos = localizar_modelos()
+    if diretorio_modelos is not None:
+        origem = os.path.join(diretorio_modelos, DIRETORIO_SENTIMENTO)
+        nome = ler_manifesto(diretorio_modelos)['sentimento']['modelo']
+    else:
+        origem = nome = MODELO_SENTIMENTO
+    
+    if backend == "pytorch":
+        classificador = _carregar_pytorch(origem, diretorio_modelos is not None)
+    elif backend == "pytorch-int8":
+        classificador = _carregar_pytorch_int8(origem, diretorio_modelos is not None)
+    elif backend == "onnx":
+        classificador = _carregar_onnx(origem, nome)
+    else:
+        raise ValueError(f"Backend de sentimento não suportado: {backend}")
+    
+    classificador.backend_sentimento = backend
+    classificador.nome_modelo_sentimento = nome
+    print(f"⏱️ Modelo de sentimento ({backend}) carregado de {origem} em {time.perf_counter() - inicio:.2f} s")
+    return classificador
+
+def carregar_modelo_sentimento(versao_rapida=None):
+    """
+    Carrega o BERT ou uma versão do modelo rápido.
+    
+    Por ser uma função de módulo, pode ser enviada (com functools.partial) a
+    processos de trabalho criados por spawn, que carregam o modelo sozinhos.
+    
+    Args:
+        versao_rapida (str, opcional): Versão do modelo rápido; None carrega o BERT
+        
+    Returns:
+        objeto: Classificador de sentimento
+    """
+    if versao_rapida is None:
+        return load_sentiment_model()
+    from src.models.fast_sentiment import carregar_modelo_rapido
+    return carregar_modelo_rapido(versao_rapida)
+
+def _carregar_modelo(origem, local):
+    """Carrega o modelo PyTorch, mapeando os pesos em memória quando vem do repositório local."""
+    if local:
+        return carregar_modelo_mapeado(origem)
+    from transformers import AutoModelForSequenceClassification
+    return AutoModelForSequenceClassification.from_pretrained(origem)
+
+def _carregar_pytorch(origem, local):
+    """Carrega o modelo original em fp32."""
+    from transformers import AutoTokenizer, pipeline
+    
+    if not local:
+        return pipeline("sentiment-analysis", model=origem)
+    return pipeline("sentiment-analysis", model=_carregar_modelo(origem, local), tokenizer=AutoTokenizer.from_pretrained(origem))
+
+def _carregar_pytorch_int8(origem, local):
+    """Carrega o modelo com quantização dinâmica int8 das camadas lineares (CPU)."""
+    import torch
+    from transformers import AutoTokenizer, pipeline
+    
+    modelo = _carregar_modelo(origem, local)
+    modelo = torch.quantization.quantize_dynamic(modelo, {torch.nn.Linear}, dtype=torch.qint8)
+    tokenizer = AutoTokenizer.from_pretrained(origem)
+    return pipeline("sentiment-analysis", model=modelo, tokenizer=tokenizer)
+
+def _carregar_onnx(origem, nome):
+    """
+    Carrega o modelo exportado para ONNX e executado com onnxruntime.
+    
+    Na primeira execução o modelo é exportado e salvo em disco; as execuções
+    seguintes reutilizam a exportação.
+    """
+    try:
+        from optimum.onnxruntime import ORTModelForSequenceClassification
+    except ImportError as e:
+        raise ImportError(
+            "O backend 'onnx' requer os pacotes optimum e onnxruntime: "
+            "pip install optimum[onnxruntime]"
+        ) from e
+    from transformers import AutoTokenizer, pipeline
+    
+    diretorio = os.path.join(obter_diretorio_onnx(), nome.replace("/", "--"))
+    if os.path.exists(os.path.join(diretorio, "model.onnx")):
+        modelo = ORTModelForSequenceClassification.from_pretrained(diretorio)
+        tokenizer = AutoTokenizer.from_pretrained(diretorio)
+    else:
+        modelo = ORTModelForSequenceClassification.from_pretrained(origem, export=True)
+        tokenizer = AutoTokenizer.from_pretrained(origem)
+        os.makedirs(diretorio, exist_ok=True)
+        modelo.save_pretrained(diretorio)
+        tokenizer.save_pretrained(diretorio)
+    return pipeline("sentiment-analysis", model=modelo, tokenizer=tokenizer)
+
+def nome_do_modelo(classificador):
+    """
+    Identifica o modelo usado por um classificador (usado nas chaves de cache).
+    
+    O backend é incluído no nome quando não é o PyTorch original, pois
+    modelos quantizados ou exportados podem divergir em alguns rótulos.
+    
+    Args:
+        classificador: Modelo de análise de sentimento
+        
+    Returns:
+        str: Nome ou caminho do modelo
+    """
+    modelo = getattr(classificador, "model", None)
+    nome = (
+        getattr(classificador, "nome_modelo_sentimento", None)
+        or getattr(modelo, "name_or_path", None)
+        or type(classificador).__name__
+    )
+    backend = getattr(classificador, "backend_sentimento", "pytorch")
+    if backend != "pytorch":
+        nome = f"{nome}@{backend}"
+    return nome
+
+def _rotulo_para_sentimento(rotulo):
+    """
+    Converte o rótulo de estrelas do modelo (ex.: '4 stars') em sentimento.
+    
+    Rótulos que já são sentimentos (como os do modelo rápido) são mantidos.
+    
+    Args:
+        rotulo (str): Rótulo retornado pelo classificador
+    
+    Returns:
+        str: Sentimento correspondente (positivo, neutro ou negativo)
+    """
+    if rotulo in ("positivo", "neutro", "negativo"):
+        return rotulo
+    estrelas = int(rotulo[0])
+    if estrelas in [4, 5]:
+        return "positivo"
+    elif estrelas == 3:
+        return "neutro"
+    else:
+        return "negativo"
+
+class MotorInferencia:
+    """
+    Executa o modelo de sentimento diretamente, sem o pipeline do transformers.
+    
+    Os textos são tokenizados uma única vez com o tokenizador rápido e
+    truncados no limite real de 512 tokens (e não de caracteres); os lotes são
+    formados por tamanho, preenchidos só até o maior texto do lote e passados
+    ao modelo sob torch.inference_mode. O argmax dos logits é convertido
+    diretamente no sentimento por uma tabela, sem dicionários por linha.
+    """
+    
+    def __init__(self, modelo, tokenizador, max_tokens=MAX_TOKENS):
+        """
+        Args:
+            modelo: Modelo PyTorch de classificação (AutoModelForSequenceClassification)
+            tokenizador: Tokenizador rápido do modelo
+            max_tokens (int): Quantidade máxima de tokens por texto
+        """
+        self.modelo = modelo.eval()
+        self.tokenizador = tokenizador
+        self.max_tokens = min(
+            max_tokens,
+            getattr(tokenizador, "model_max_length", max_tokens),
+            getattr(modelo.config, "max_position_embeddings", max_tokens),
+        )
+        self.id_preenchimento = tokenizador.pad_token_id or 0
+        
+        # Tabela classe do modelo -> índice em SENTIMENTOS (ex.: '4 stars' -> positivo)
+        id2label = modelo.config.id2label
+        indices = {sentimento: i for i, sentimento in enumerate(SENTIMENTOS)}
+        self.sentimento_da_classe = np.array(
+            [indices[_rotulo_para_sentimento(id2label[classe])] for classe in range(len(id2label))]
+        )
+        
+        # O tokenizador rápido não pode ser usado por duas threads ao mesmo tempo
+        self._trava_tokenizador = threading.Lock()
+    
+    def tokenizar(self, textos):
+        """
+        Tokeniza os textos, truncando-os no limite de tokens do modelo.
+        
+        Args:
+            textos (list): Textos a serem tokenizados
+        
+        Returns:
+            dict: Listas de ids por texto (input_ids, attention_mask e, se houver, token_type_ids)
+        """
+        with self._trava_tokenizador:
+            codificados = self.tokenizador(list(textos), truncation=True, max_length=self.max_tokens)
+        return {chave: codificados[chave] for chave in ("input_ids", "attention_mask", "token_type_ids") if chave in codificados}
+    
+    def _executar(self, codificados, indices):
+        """Preenche e executa um lote de textos já tokenizados, retornando os logits."""
+        import torch
+        
+        tamanho = max(len(codificados["input_ids"][i]) for i in indices)
+        entradas = {}
+        for chave, sequencias in codificados.items():
+            matriz = np.full((len(indices), tamanho), self.id_preenchimento if chave == "input_ids" else 0, dtype=np.int64)
+            for linha, i in enumerate(indices):
+                matriz[linha, :len(sequencias[i])] = sequencias[i]
+            entradas[chave] = torch.from_numpy(matriz)
+        
+        with torch.inference_mode():
+            return self.modelo(**entradas).logits.float().numpy()
+    
+    def _logits_em_lotes(self, codificados, batch_size):
+        """
+        Executa o modelo em lotes ordenados por tamanho.
+        
+        Se um lote falhar, suas sequências são executadas individualmente, de
+        modo que apenas as linhas problemáticas ficam com logits NaN.
+        
+        Returns:
+            numpy.ndarray: Logits (sequências x classes do modelo), na ordem de entrada
+        """
+        quantidade = len(codificados["input_ids"])
+        logits = np.full((quantidade, len(self.sentimento_da_classe)), np.nan, dtype=np.float32)
+        ordem = np.argsort([len(ids) for ids in codificados["input_ids"]], kind="stable")
+        
+        for inicio in range(0, quantidade, batch_size):
+            lote = ordem[inicio:inicio + batch_size]
+            try:
+                logits[lote] = self._executar(codificados, lote)
+            except Exception as e:
+                print(f"Erro ao analisar lote de sentimentos, reprocessando individualmente: {e}")
+                for i in lote:
+                    try:
+                        logits[i] = self._executar(codificados, [i])[0]
+                    except Exception as erro:
+                        print(f"Erro ao analisar sentimento: {erro}")
+        return logits
+    
+    def probabilidades_por_sentimento(self, logits):
+        """
+        Converte logits do modelo em probabilidades de positivo, neutro e negativo.
+        
+        Args:
+            logits (numpy.ndarray): Logits (linhas x classes do modelo)
+        
+        Returns:
+            numpy.ndarray: Probabilidades (linhas x 3), na ordem de SENTIMENTOS
+        """
+        exp = np.exp(logits - logits.max(axis=1, keepdims=True))
+        por_classe = exp / exp.sum(axis=1, keepdims=True)
+        agregadas = np.zeros((len(logits), len(SENTIMENTOS)), dtype=np.float32)
+        np.add.at(agregadas.T, self.sentimento_da_classe, por_classe.T)
+        return agregadas
+    
+    def _rotular(self, logits, probabilidades):
+        """Converte os logits de cada texto em sentimentos ("erro" nas linhas sem logits)."""
+        validos = ~np.isnan(logits).any(axis=1)
+        rotulos = np.full(len(logits), "erro", dtype=SENTIMENTOS.dtype)
+        rotulos[validos] = SENTIMENTOS[self.sentimento_da_classe[logits[validos].argmax(axis=1)]]
+        if not probabilidades:
+            return rotulos
+        probs = np.full((len(logits), len(SENTIMENTOS)), np.nan, dtype=np.float32)
+        probs[validos] = self.probabilidades_por_sentimento(logits[validos])
+        return rotulos, probs
+    
+    def classificar(self, textos, batch_size=32, probabilidades=False):
+        """
+        Classifica os textos em lotes ordenados por tamanho.
+        
+        Se um lote falhar, seus textos são executados individualmente, de modo
+        que apenas as linhas problemáticas recebem o rótulo "erro".
+        
+        Args:
+            textos (list): Textos a serem analisados
+            batch_size (int): Quantidade de textos por lote
+            probabilidades (bool): Se True, retorna também as probabilidades
+        
+        Returns:
+            numpy.ndarray: Sentimento de cada texto, na ordem de entrada. Com
+                probabilidades=True, retorna uma tupla com os sentimentos e um
+                array float (textos x 3) com as probabilidades de positivo,
+                neutro e negativo (NaN nas linhas com erro)
+        """
+        textos = [str(texto) for texto in textos]
+        if not textos:
+            return self._rotular(np.empty((0, len(self.sentimento_da_classe)), dtype=np.float32), probabilidades)
+        return self._rotular(self._logits_em_lotes(self.tokenizar(textos), batch_size), probabilidades)
+    
+    def janelas(self, textos, max_janelas=MAX_JANELAS_PADRAO, sobreposicao=SOBREPOSICAO_PADRAO):
+        """
+        Divide os textos em janelas de tokens sobrepostas.
+        
+        Cada janela tem até max_tokens tokens (incluindo [CLS] e [SEP]) e
+        começa sobreposicao tokens antes do fim da anterior. Se um texto
+        precisar de mais de max_janelas janelas, são usadas max_janelas
+        janelas distribuídas uniformemente (a primeira e a última sempre
+        entram), o que limita o custo por texto.
+        
+        Args:
+            textos (list): Textos a serem divididos
+            max_janelas (int): Quantidade máxima de janelas por texto
+            sobreposicao (int): Tokens em comum entre janelas consecutivas
+        
+        Returns:
+            tuple: Janelas tokenizadas (no formato de tokenizar) e um array
+                com o índice do texto de cada janela
+        """
+        with self._trava_tokenizador:
+            sequencias = self.tokenizador(list(textos), add_special_tokens=False, verbose=False)["input_ids"]
+        tamanho = self.max_tokens - self.tokenizador.num_special_tokens_to_add()
+        passo = max(tamanho - sobreposicao, 1)
+        usa_tipos = "token_type_ids" in self.tokenizador.model_input_names
+        
+        janelas = {"input_ids": [], "attention_mask": []}
+        if usa_tipos:
+            janelas["token_type_ids"] = []
+        documentos = []
+        for documento, sequencia in enumerate(sequencias):
+            ultimo_inicio = max(len(sequencia) - tamanho, 0)
+            quantidade = -(-ultimo_inicio // passo) + 1
+            if quantidade > max_janelas:
+                inicios = np.linspace(0, ultimo_inicio, max_janelas).round().astype(int)
+            else:
+                inicios = [min(k * passo, ultimo_inicio) for k in range(quantidade)]
+            
+            for inicio in inicios:
+                trecho = sequencia[inicio:inicio + tamanho]
+                ids = self.tokenizador.build_inputs_with_special_tokens(trecho)
+                janelas["input_ids"].append(ids)
+                janelas["attention_mask"].append([1] * len(ids))
+                if usa_tipos:
+                    janelas["token_type_ids"].append(self.tokenizador.create_token_type_ids_from_sequences(trecho))
+                documentos.append(documento)
+        return janelas, np.array(documentos, dtype=np.int64)
+    
+    def classificar_longos(self, textos, agregacao="media", max_janelas=MAX_JANELAS_PADRAO,
+                           sobreposicao=SOBREPOSICAO_PADRAO, batch_size=32, probabilidades=False):
+        """
+        Classifica textos longos por janelas deslizantes, sem descartar o fim do texto.
+        
+        As janelas de todos os textos são executadas juntas, em lotes ordenados
+        por tamanho, e os logits das janelas de cada texto são combinados:
+        - 'media': média dos logits das janelas;
+        - 'ponderada': média ponderada pela quantidade de tokens de cada janela;
+        - 'pior_caso': logits da janela com maior probabilidade de sentimento negativo.
+        
+        Textos que cabem em uma janela têm o mesmo resultado de classificar.
+        
+        Args:
+            textos (list): Textos a serem analisados
+            agregacao (str): Regra de combinação das janelas ('media', 'ponderada' ou 'pior_caso')
+            max_janelas (int): Quantidade máxima de janelas por texto
+            sobreposicao (int): Tokens em comum entre janelas consecutivas
+            batch_size (int): Quantidade de janelas por lote
+            probabilidades (bool): Se True, retorna também as probabilidades
+        
+        Returns:
+            numpy.ndarray: Sentimento de cada texto (ver classificar)
+        """
+        if agregacao not in AGREGACOES_JANELAS:
+            raise ValueError(f"Agregação de janelas inválida: {agregacao}. Opções: {', '.join(AGREGACOES_JANELAS)}")
+        
+        textos = [str(texto) for texto in textos]
+        logits = np.full((len(textos), len(self.sentimento_da_classe)), np.nan, dtype=np.float32)
+        if not textos:
+            return self._rotular(logits, probabilidades)
+        
+        janelas, documentos = self.janelas(textos, max_janelas, sobreposicao)
+        logits_janelas = self._logits_em_lotes(janelas, batch_size)
+        tamanhos = np.array([len(ids) for ids in janelas["input_ids"]], dtype=np.float32)
+        
+        # As janelas de um mesmo texto são consecutivas
+        limites = np.flatnonzero(np.diff(documentos)) + 1
+        for inicio, fim in zip(np.r_[0, limites], np.r_[limites, len(documentos)]):
+            validas = ~np.isnan(logits_janelas[inicio:fim]).any(axis=1)
+            if not validas.any():
+                continue
+            blocos = logits_janelas[inicio:fim][validas]
+            if agregacao == "media":
+                combinados = blocos.mean(axis=0)
+            elif agregacao == "ponderada":
+                combinados = np.average(blocos, axis=0, weights=tamanhos[inicio:fim][validas])
+            else:
+                negativo = self.probabilidades_por_sentimento(blocos)[:, SENTIMENTOS.tolist().index("negativo")]
+                combinados = blocos[negativo.argmax()]
+            logits[documentos[inicio]] = combinados
+        
+        return self._rotular(logits, probabilidades)
+
+def obter_motor(classificador):
+    """
+    Retorna o MotorInferencia de um classificador, criando-o na primeira chamada.
+    
+    O motor é usado quando o classificador é um pipeline com modelo PyTorch e
+    tokenizador rápido (backends 'pytorch' e 'pytorch-int8'); para os demais
+    (ONNX, modelo rápido) retorna None e o classificador é chamado diretamente.
+    
+    Args:
+        classificador: Modelo de análise de sentimento
+    
+    Returns:
+        MotorInferencia: Motor do classificador, ou None se não for aplicável
+    """
+    motor = getattr(classificador, "motor_inferencia", False)
+    if motor is not False:
+        return motor
+    
+    motor = None
+    modelo = getattr(classificador, "model", None)
+    tokenizador = getattr(classificador, "tokenizer", None)
+    if modelo is not None and getattr(tokenizador, "is_fast", False):
+        import torch
+        if isinstance(modelo, torch.nn.Module):
+            try:
+                motor = MotorInferencia(modelo, tokenizador)
+            except Exception as e:
+                print(f"Aviso: motor de inferência indisponível, usando o pipeline: {e}")
+    try:
+        classificador.motor_inferencia = motor
+    except AttributeError:
+        pass
+    return motor
 
-def analisar_sentimento(texto, classificador):
+def _nome_para_cache(classificador, textos_longos, max_janelas):
+    """Nome do modelo nas chaves de cache, incluindo o modo de textos longos quando ele se aplica."""
+    nome = nome_do_modelo(classificador)
+    if textos_longos is not None and obter_motor(classificador) is not None:
+        nome = f"{nome}#janelas-{textos_longos}-{max_janelas}"
+    return nome
+
+def analisar_sentimento(texto, classificador, cache=None, textos_longos=None, max_janelas=MAX_JANELAS_PADRAO):
     """
     Analisa o sentimento de um texto.
     
     Args:
         texto (str): Texto a ser analisado
         classificador: Modelo de análise de sentimento
+        cache (CacheSentimento, opcional): Cache consultado antes do modelo
+        textos_longos (str, opcional): Regra de combinação das janelas ('media',
+            'ponderada' ou 'pior_caso'); se None, o texto é truncado em 512 tokens
+        max_janelas (int): Quantidade máxima de janelas no modo de textos longos
         
     Returns:
         str: Sentimento identificado (positivo, neutro, negativo ou erro)
     """
+    if cache is not None:
+        chave = cache.gerar_chave(texto, _nome_para_cache(classificador, textos_longos, max_janelas))
+        encontrado = cache.obter([chave])
+        if chave in encontrado:
+            return encontrado[chave]
+
+    motor = obter_motor(classificador)
     try:
-        resultado = classificador(texto[:512])[0]
-        estrelas = int(resultado['label'][0])
-        if estrelas in [4, 5]:
-            return "positivo"
-        elif estrelas == 3:
-            return "neutro"
+        if motor is not None and textos_longos is not None:
+            sentimento = str(motor.classificar_longos([texto], textos_longos, max_janelas)[0])
+        elif motor is not None:
+            sentimento = str(motor.classificar([texto])[0])
+            if sentimento == "erro":
+                return sentimento
         else:
-            return "negativo"
+            resultado = classificador(texto[:512])[0]
+            sentimento = _rotulo_para_sentimento(resultado['label'])
     except Exception as e:
         print(f"Erro ao analisar sentimento: {e}")
-        return "erro" 
\ No newline at end of file
+        return "erro"
+
+    if cache is not None:
+        cache.salvar({chave: sentimento})
+    return sentimento
+
+def _tamanho_em_tokens(textos, classificador):
+    """
+    Estima o tamanho de cada texto em tokens para ordenar os lotes.
+    
+    Usa o tokenizador do pipeline quando disponível; caso contrário,
+    recorre ao número de caracteres.
+    
+    Args:
+        textos (list): Lista de textos
+        classificador: Modelo de análise de sentimento
+    
+    Returns:
+        list: Tamanho aproximado de cada texto
+    """
+    tokenizador = getattr(classificador, "tokenizer", None)
+    if tokenizador is not None:
+        try:
+            codificados = tokenizador(textos, add_special_tokens=False, truncation=True, max_length=512)
+            return [len(ids) for ids in codificados["input_ids"]]
+        except Exception:
+            pass
+    return [len(texto) for texto in textos]
+
+@medir_etapa("analisar_sentimento")
+def analisar_sentimentos_em_lote(textos, classificador, batch_size=32, cache=None, cascata=None,
+                                 textos_longos=None, max_janelas=MAX_JANELAS_PADRAO, pool=None):
+    """
+    Analisa o sentimento de vários textos, agrupando-os em lotes.
+    
+    Os textos são ordenados pelo tamanho em tokens antes de formar os lotes,
+    reduzindo o preenchimento (padding) em cada passagem pelo modelo. Os
+    resultados são devolvidos na ordem original. Se um lote falhar, seus
+    textos são reanalisados individualmente, de modo que apenas as linhas
+    problemáticas recebem o rótulo "erro". Com um cache, apenas os textos
+    ainda não analisados são enviados ao modelo. Com uma cascata, os textos
+    que o léxico classifica com confiança não passam pelo modelo. No modo de
+    textos longos, textos com mais de 512 tokens são classificados por janelas
+    deslizantes (ver MotorInferencia.classificar_longos) em vez de truncados.
+    Com um pool de processos, os textos enviados ao modelo são divididos entre
+    os processos de trabalho; o cache e a cascata continuam no processo atual.
+    
+    Args:
+        textos (list ou Series): Textos a serem analisados
+        classificador: Modelo de análise de sentimento
+        batch_size (int): Quantidade de textos por lote
+        cache (CacheSentimento, opcional): Cache consultado antes do modelo
+        cascata (CascataSentimento, opcional): Pré-classificador por léxico
+        textos_longos (str, opcional): Regra de combinação das janelas ('media',
+            'ponderada' ou 'pior_caso'); se None, os textos são truncados em 512 tokens
+        max_janelas (int): Quantidade máxima de janelas por texto no modo de textos longos
+        pool (PoolInferencia, opcional): Processos de trabalho com o classificador carregado
+        
+    Returns:
+        list: Sentimentos identificados, na mesma ordem dos textos de entrada
+    """
+    textos = [str(texto) for texto in textos]
+    if cascata is not None:
+        # Os rótulos do léxico não vão para o cache, que guarda apenas os do modelo
+        sentimentos = cascata.classificar(textos)
+        incertos = [i for i, sentimento in enumerate(sentimentos) if sentimento is None]
+        if incertos:
+            restantes = analisar_sentimentos_em_lote(
+                [textos[i] for i in incertos], classificador, batch_size, cache,
+                textos_longos=textos_longos, max_janelas=max_janelas, pool=pool
+            )
+            for i, sentimento in zip(incertos, restantes):
+                sentimentos[i] = sentimento
+        return sentimentos
+    
+    if cache is None:
+        return _classificar_em_lotes(textos, classificador, batch_size, textos_longos, max_janelas, pool)
+
+    nome = _nome_para_cache(classificador, textos_longos, max_janelas)
+    chaves = [cache.gerar_chave(texto, nome) for texto in textos]
+    resultados = cache.obter(chaves)
+
+    # Envia ao modelo apenas uma ocorrência de cada texto ausente do cache
+    pendentes = {}
+    for chave, texto in zip(chaves, textos):
+        if chave not in resultados and chave not in pendentes:
+            pendentes[chave] = texto
+
+    if pendentes:
+        novos = dict(zip(pendentes, _classificar_em_lotes(
+            list(pendentes.values()), classificador, batch_size, textos_longos, max_janelas, pool
+        )))
+        cache.salvar(novos)
+        resultados.update(novos)
+
+    return [resultados[chave] for chave in chaves]
+
+def _classificar_fragmento(classificador, argumentos):
+    """Classifica um fragmento dos textos em um processo de trabalho (ver PoolInferencia.mapear)."""
+    textos, batch_size, textos_longos, max_janelas = argumentos
+    return _classificar_em_lotes(textos, classificador, batch_size, textos_longos, max_janelas)
+
+def _classificar_em_lotes(textos, classificador, batch_size, textos_longos=None, max_janelas=MAX_JANELAS_PADRAO,
+                          pool=None):
+    """
+    Executa o classificador em lotes ordenados por tamanho.
+    
+    Usa o MotorInferencia quando o classificador permite; caso contrário,
+    chama o pipeline com os textos limitados a 512 caracteres (e o modo de
+    textos longos não se aplica).
+    
+    Args:
+        textos (list): Textos a serem analisados
+        classificador: Modelo de análise de sentimento
+        batch_size (int): Quantidade de textos por lote
+        textos_longos (str, opcional): Regra de combinação das janelas
+        max_janelas (int): Quantidade máxima de janelas por texto
+        pool (PoolInferencia, opcional): Processos entre os quais os textos são divididos
+        
+    Returns:
+        list: Sentimentos identificados, na mesma ordem dos textos de entrada
+    """
+    if not textos:
+        return []
+    
+    if pool is not None and pool.workers > 1 and len(textos) > batch_size:
+        # Fragmentos menores que len/workers equilibram a carga entre os processos
+        tamanho = max(batch_size, -(-len(textos) // (4 * pool.workers)))
+        fragmentos = (
+            (textos[inicio:inicio + tamanho], batch_size, textos_longos, max_janelas)
+            for inicio in range(0, len(textos), tamanho)
+        )
+        return [sentimento for parte in pool.mapear(_classificar_fragmento, fragmentos) for sentimento in parte]
+    
+    motor = obter_motor(classificador)
+    if motor is not None and textos_longos is not None:
+        return motor.classificar_longos(textos, textos_longos, max_janelas, batch_size=batch_size).tolist()
+    if motor is not None:
+        return motor.classificar(textos, batch_size).tolist()
+    
+    textos = [texto[:512] for texto in textos]
+    
+    tamanhos = _tamanho_em_tokens(textos, classificador)
+    ordem = sorted(range(len(textos)), key=lambda i: tamanhos[i])
+    sentimentos = [None] * len(textos)
+    
+    for inicio in range(0, len(ordem), batch_size):
+        indices = ordem[inicio:inicio + batch_size]
+        lote = [textos[i] for i in indices]
+        try:
+            resultados = classificador(lote, batch_size=len(lote), truncation=True)
+            for i, resultado in zip(indices, resultados):
+                sentimentos[i] = _rotulo_para_sentimento(resultado['label'])
+        except Exception as e:
+            print(f"Erro ao analisar lote de sentimentos, reprocessando individualmente: {e}")
+            for i, texto in zip(indices, lote):
+                sentimentos[i] = analisar_sentimento(texto, classificador)
+    
+    return sentimentos
+
+def comparar_backends(textos, backends=("pytorch-int8", "onnx"), batch_size=32):
+    """
+    Mede a concordância de cada backend com o modelo PyTorch fp32 original.
+    
+    Args:
+        textos (list): Amostra de textos usada na comparação
+        backends (tuple): Backends a comparar com o 'pytorch'
+        batch_size (int): Quantidade de textos por lote
+        
+    Returns:
+        dict: Para cada backend, quantidade e percentual de rótulos divergentes
+            (ou a mensagem de erro, se o backend não pôde ser carregado)
+    """
+    textos = [str(texto) for texto in textos]
+    referencia = analisar_sentimentos_em_lote(textos, load_sentiment_model("pytorch"), batch_size)
+    
+    resultado = {}
+    for backend in backends:
+        try:
+            classificador = load_sentiment_model(backend)
+        except Exception as e:
+            resultado[backend] = {'erro': str(e)}
+            continue
+        
+        rotulos = analisar_sentimentos_em_lote(textos, classificador, batch_size)
+        divergentes = sum(1 for a, b in zip(referencia, rotulos) if a != b)
+        resultado[backend] = {
+            'total': len(textos),
+            'divergentes': divergentes,
+            'divergentes_pct': (divergentes/len(textos))*100 if textos else 0,
+        }
+    return resultado
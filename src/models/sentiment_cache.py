@@ -0,0 +1,151 @@
+"""
+Módulo com cache persistente de resultados de análise de sentimento.
+
+Os resultados são armazenados em SQLite, indexados por um hash do texto
+normalizado e do nome do modelo, com remoção das entradas menos usadas
+recentemente (LRU) quando o limite de tamanho é atingido.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+CAMINHO_PADRAO = 'data/cache_sentimento.sqlite'
+
+class CacheSentimento:
+    """
+    Cache em disco de sentimentos já calculados.
+    
+    Attributes:
+        acertos (int): Quantidade de consultas atendidas pelo cache
+        falhas (int): Quantidade de consultas que precisaram do modelo
+    """
+    
+    def __init__(self, caminho=None, max_entradas=200000):
+        """
+        Abre (ou cria) o banco de dados do cache.
+        
+        Args:
+            caminho (str, opcional): Caminho do arquivo SQLite. Se None, usa 'data/cache_sentimento.sqlite'
+            max_entradas (int): Quantidade máxima de textos mantidos no cache
+        """
+        if caminho is None:
+            # Garantir que o diretório exista
+            os.makedirs('data', exist_ok=True)
+            caminho = CAMINHO_PADRAO
+        
+        self.caminho = caminho
+        self.max_entradas = max_entradas
+        self.acertos = 0
+        self.falhas = 0
+        self._trava = threading.Lock()
+        self._conexao = sqlite3.connect(caminho, check_same_thread=False)
+        with self._conexao:
+            self._conexao.execute("PRAGMA journal_mode=WAL")
+            self._conexao.execute(
+                "CREATE TABLE IF NOT EXISTS sentimentos ("
+                "chave TEXT PRIMARY KEY, sentimento TEXT NOT NULL, ultimo_acesso REAL NOT NULL)"
+            )
+            self._conexao.execute(
+                "CREATE INDEX IF NOT EXISTS idx_sentimentos_acesso ON sentimentos (ultimo_acesso)"
+            )
+    
+    @staticmethod
+    def gerar_chave(texto, nome_modelo):
+        """
+        Gera a chave do cache a partir do texto normalizado e do nome do modelo.
+        
+        Args:
+            texto (str): Texto analisado
+            nome_modelo (str): Identificador do modelo de sentimento
+        
+        Returns:
+            str: Hash SHA-256 em hexadecimal
+        """
+        normalizado = " ".join(str(texto).lower().split())
+        return hashlib.sha256(f"{nome_modelo}\0{normalizado}".encode()).hexdigest()
+    
+    def obter(self, chaves):
+        """
+        Busca os sentimentos armazenados para um conjunto de chaves.
+        
+        Args:
+            chaves (list): Chaves geradas por gerar_chave
+        
+        Returns:
+            dict: Mapeamento chave -> sentimento apenas para as chaves encontradas
+        """
+        chaves = list(dict.fromkeys(chaves))
+        encontrados = {}
+        with self._trava, self._conexao:
+            # Consulta em blocos para respeitar o limite de parâmetros do SQLite
+            for inicio in range(0, len(chaves), 500):
+                bloco = chaves[inicio:inicio + 500]
+                marcadores = ",".join("?" * len(bloco))
+                linhas = self._conexao.execute(
+                    f"SELECT chave, sentimento FROM sentimentos WHERE chave IN ({marcadores})", bloco
+                ).fetchall()
+                encontrados.update(linhas)
+            
+            agora = time.time()
+            self._conexao.executemany(
+                "UPDATE sentimentos SET ultimo_acesso = ? WHERE chave = ?",
+                [(agora, chave) for chave in encontrados]
+            )
+            self.acertos += len(encontrados)
+            self.falhas += len(chaves) - len(encontrados)
+        return encontrados
+    
+    def salvar(self, resultados):
+        """
+        Armazena novos sentimentos e remove as entradas mais antigas se necessário.
+        
+        Resultados "erro" não são armazenados.
+        
+        Args:
+            resultados (dict): Mapeamento chave -> sentimento
+        """
+        agora = time.time()
+        pares = [(chave, sentimento, agora) for chave, sentimento in resultados.items() if sentimento != "erro"]
+        if not pares:
+            return
+        
+        with self._trava, self._conexao:
+            self._conexao.executemany(
+                "INSERT OR REPLACE INTO sentimentos (chave, sentimento, ultimo_acesso) VALUES (?, ?, ?)",
+                pares
+            )
+            total = self._conexao.execute("SELECT COUNT(*) FROM sentimentos").fetchone()[0]
+            excedente = total - self.max_entradas
+            if excedente > 0:
+                self._conexao.execute(
+                    "DELETE FROM sentimentos WHERE chave IN "
+                    "(SELECT chave FROM sentimentos ORDER BY ultimo_acesso ASC LIMIT ?)",
+                    (excedente,)
+                )
+    
+    def estatisticas(self):
+        """
+        Retorna os contadores de uso do cache.
+        
+        Returns:
+            dict: Acertos, falhas, taxa de acerto (%) e quantidade de entradas armazenadas
+        """
+        with self._trava:
+            entradas = self._conexao.execute("SELECT COUNT(*) FROM sentimentos").fetchone()[0]
+            consultas = self.acertos + self.falhas
+            return {
+                'acertos': self.acertos,
+                'falhas': self.falhas,
+                'taxa_acerto': (self.acertos/consultas)*100 if consultas > 0 else 0,
+                'entradas': entradas,
+            }
+    
+    def limpar(self):
+        """Remove todas as entradas do cache e zera os contadores."""
+        with self._trava, self._conexao:
+            self._conexao.execute("DELETE FROM sentimentos")
+            self.acertos = 0
+            self.falhas = 0
@@ -1,41 +1,327 @@
 """
-Módulo para identificação de tópicos em textos usando LDA.
+Módulo para identificação de tópicos em textos usando LDA ou NMF.
 """
 
-from sklearn.feature_extraction.text import CountVectorizer
-from sklearn.decomposition import LatentDirichletAllocation
+import hashlib
+import os
+import random
+import threading
+import time
+from collections import OrderedDict
 
-def identificar_topicos(textos, stopwords_pt, n_topicos=3):
+from src.utils.instrumentacao import medir_etapa
+
+# O scikit-learn e o joblib são importados dentro das funções, apenas quando
+# os tópicos são calculados, para não atrasar a abertura da aplicação
+
+# Motores disponíveis para identificar_topicos:
+# - lda: LDA sobre todo o corpus
+# - lda_amostra: LDA sobre uma amostra aleatória dos documentos
+# - nmf: NMF sobre a matriz TF-IDF (em geral o mais rápido)
+ENGINES_TOPICOS = ("lda", "lda_amostra", "nmf")
+
+# Tamanho padrão da amostra usada pelo motor lda_amostra
+TAMANHO_AMOSTRA_PADRAO = 5000
+
+# Caches em memória: matrizes documento-termo por corpus e modelos por
+# (corpus, motor, número de tópicos). Mudar apenas o número de tópicos
+# reaproveita a matriz, e voltar a um número já usado reaproveita o modelo.
+MAX_MATRIZES_EM_CACHE = 4
+MAX_MODELOS_EM_CACHE = 32
+_matrizes = OrderedDict()
+_modelos = OrderedDict()
+_trava = threading.Lock()
+
+def _obter_do_cache(cache, chave):
+    """Busca um item em um cache LRU, marcando-o como usado recentemente."""
+    with _trava:
+        if chave in cache:
+            cache.move_to_end(chave)
+            return cache[chave]
+    return None
+
+def _guardar_no_cache(cache, chave, valor, limite):
+    """Guarda um item em um cache LRU, removendo os mais antigos acima do limite."""
+    with _trava:
+        cache[chave] = valor
+        cache.move_to_end(chave)
+        while len(cache) > limite:
+            cache.popitem(last=False)
+
+def hash_corpus(textos, stopwords_pt):
     """
-    Identifica tópicos em um conjunto de textos usando LDA.
+    Calcula um identificador para o conjunto de textos e stopwords.
+    
+    Args:
+        textos (list): Lista de textos
+        stopwords_pt (set): Conjunto de stopwords
+    
+    Returns:
+        str: Hash SHA-256 em hexadecimal
+    """
+    h = hashlib.sha256()
+    for palavra in sorted(stopwords_pt):
+        h.update(palavra.encode('utf-8') + b"\0")
+    h.update(b"\1")
+    for texto in textos:
+        h.update(str(texto).encode('utf-8') + b"\0")
+    return h.hexdigest()
+
+def limpar_cache_topicos():
+    """Descarta as matrizes e modelos mantidos em cache."""
+    with _trava:
+        _matrizes.clear()
+        _modelos.clear()
+
+def construir_matriz_termos(textos, stopwords_pt, ponderacao="contagem"):
+    """
+    Constrói (ou reaproveita do cache) a matriz documento-termo de um corpus.
     
     Args:
         textos (list): Lista de textos para análise
         stopwords_pt (set): Conjunto de stopwords em português
+        ponderacao (str): 'contagem' (usada pelo LDA) ou 'tfidf' (usada pelo NMF)
+        
+    Returns:
+        tuple: Chave do corpus, matriz esparsa e array com os termos
+    """
+    textos = list(textos)
+    chave = f"{ponderacao}:{hash_corpus(textos, stopwords_pt)}"
+    em_cache = _obter_do_cache(_matrizes, chave)
+    if em_cache is not None:
+        return (chave,) + em_cache
+    
+    from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+    
+    classe = TfidfVectorizer if ponderacao == "tfidf" else CountVectorizer
+    vetor = classe(max_df=0.9, min_df=2, stop_words=list(stopwords_pt))
+    matriz = vetor.fit_transform(textos)
+    palavras = vetor.get_feature_names_out()
+    _guardar_no_cache(_matrizes, chave, (matriz, palavras), MAX_MATRIZES_EM_CACHE)
+    return chave, matriz, palavras
+
+def ajustar_lda(chave, matriz, n_topicos, n_jobs=-1):
+    """
+    Ajusta (ou reaproveita do cache) um modelo LDA sobre uma matriz documento-termo.
+    
+    Args:
+        chave (str): Chave do corpus, retornada por construir_matriz_termos
+        matriz: Matriz esparsa de contagens
         n_topicos (int): Número de tópicos a identificar
+        n_jobs (int): Número de processos usados no ajuste (-1 = todos os núcleos)
         
     Returns:
-        list: Lista de tópicos, onde cada tópico é uma lista de palavras
+        LatentDirichletAllocation: Modelo ajustado
+    """
+    from sklearn.decomposition import LatentDirichletAllocation
+    
+    chave_modelo = (chave, "lda", n_topicos)
+    lda = _obter_do_cache(_modelos, chave_modelo)
+    if lda is None:
+        lda = LatentDirichletAllocation(n_components=n_topicos, random_state=0, n_jobs=n_jobs)
+        lda.fit(matriz)
+        _guardar_no_cache(_modelos, chave_modelo, lda, MAX_MODELOS_EM_CACHE)
+    return lda
+
+def ajustar_nmf(chave, matriz, n_topicos):
+    """
+    Ajusta (ou reaproveita do cache) um modelo NMF sobre uma matriz TF-IDF.
+    
+    Args:
+        chave (str): Chave do corpus, retornada por construir_matriz_termos
+        matriz: Matriz esparsa TF-IDF
+        n_topicos (int): Número de tópicos a identificar
+        
+    Returns:
+        NMF: Modelo ajustado
+    """
+    from sklearn.decomposition import NMF
+    
+    chave_modelo = (chave, "nmf", n_topicos)
+    nmf = _obter_do_cache(_modelos, chave_modelo)
+    if nmf is None:
+        nmf = NMF(n_components=n_topicos, init="nndsvda", random_state=0, max_iter=300)
+        nmf.fit(matriz)
+        _guardar_no_cache(_modelos, chave_modelo, nmf, MAX_MODELOS_EM_CACHE)
+    return nmf
+
+def amostrar_textos(textos, tamanho_amostra, semente=0):
+    """
+    Seleciona uma amostra aleatória (reprodutível) de documentos.
+    
+    Args:
+        textos (list): Lista de textos
+        tamanho_amostra (int): Quantidade máxima de documentos na amostra
+        semente (int): Semente do gerador aleatório
+        
+    Returns:
+        list: Textos amostrados, na ordem original
+    """
+    textos = list(textos)
+    if len(textos) <= tamanho_amostra:
+        return textos
+    indices = sorted(random.Random(semente).sample(range(len(textos)), tamanho_amostra))
+    return [textos[i] for i in indices]
+
+def _termos_principais(componentes, palavras, n_termos=10):
+    """Extrai os termos mais importantes de cada tópico."""
+    topicos = []
+    for topico in componentes:
+        termos = [palavras[i] for i in topico.argsort()[-n_termos:]]
+        topicos.append(termos)
+    return topicos
+
+@medir_etapa("identificar_topicos")
+def identificar_topicos(textos, stopwords_pt, n_topicos=3, n_jobs=-1, engine="lda",
+                        tamanho_amostra=TAMANHO_AMOSTRA_PADRAO, retornar_tempo=False):
     """
-    vetor = CountVectorizer(max_df=0.9, min_df=2, stop_words=list(stopwords_pt))
+    Identifica tópicos em um conjunto de textos.
     
+    A matriz documento-termo e os modelos ajustados ficam em cache, então
+    chamadas repetidas com o mesmo corpus (ex.: ao mudar apenas o número de
+    tópicos) não refazem a vetorização.
+    
+    Args:
+        textos (list): Lista de textos para análise
+        stopwords_pt (set): Conjunto de stopwords em português
+        n_topicos (int): Número de tópicos a identificar
+        n_jobs (int): Número de processos usados no ajuste do LDA (-1 = todos os núcleos)
+        engine (str): 'lda' (corpus completo), 'lda_amostra' (amostra aleatória) ou 'nmf' (TF-IDF)
+        tamanho_amostra (int): Quantidade de documentos usada pelo motor 'lda_amostra'
+        retornar_tempo (bool): Se True, retorna também o tempo de ajuste em segundos
+        
+    Returns:
+        list: Lista de tópicos, onde cada tópico é uma lista de palavras
+            (ou tupla (tópicos, segundos) se retornar_tempo=True)
+    """
+    inicio = time.perf_counter()
     try:
-        # Transformar os textos em matriz de contagem
-        matriz = vetor.fit_transform(textos)
+        if engine not in ENGINES_TOPICOS:
+            raise ValueError(f"Motor de tópicos inválido: {engine}. Opções: {', '.join(ENGINES_TOPICOS)}")
         
-        # Aplicar LDA
-        lda = LatentDirichletAllocation(n_components=n_topicos, random_state=0)
-        lda.fit(matriz)
+        if engine == "nmf":
+            chave, matriz, palavras = construir_matriz_termos(textos, stopwords_pt, "tfidf")
+            modelo = ajustar_nmf(chave, matriz, n_topicos)
+        else:
+            if engine == "lda_amostra":
+                textos = amostrar_textos(textos, tamanho_amostra)
+            
+            # Transformar os textos em matriz de contagem
+            chave, matriz, palavras = construir_matriz_termos(textos, stopwords_pt)
+            
+            # Aplicar LDA
+            modelo = ajustar_lda(chave, matriz, n_topicos, n_jobs)
         
         # Extrair os termos mais importantes para cada tópico
-        palavras = vetor.get_feature_names_out()
+        topicos = _termos_principais(modelo.components_, palavras)
+    except Exception as e:
+        print(f"Erro ao identificar tópicos: {e}")
         topicos = []
+    
+    if retornar_tempo:
+        return topicos, time.perf_counter() - inicio
+    return topicos
+
+# Tamanho máximo do vocabulário fixo usado no modo online
+MAX_TERMOS_ONLINE = 20000
+
+def carregar_estado_online(caminho):
+    """
+    Carrega o estado salvo do LDA online (vocabulário, modelo e documentos vistos).
+    
+    Args:
+        caminho (str): Caminho do arquivo de estado
         
-        for i, topico in enumerate(lda.components_):
-            termos = [palavras[i] for i in topico.argsort()[-10:]]
-            topicos.append(termos)
+    Returns:
+        dict: Estado salvo, ou None se o arquivo não existir
+    """
+    if caminho is None or not os.path.exists(caminho):
+        return None
+    import joblib
+    return joblib.load(caminho)
+
+def salvar_estado_online(estado, caminho):
+    """
+    Salva o estado do LDA online em disco.
+    
+    Args:
+        estado (dict): Estado retornado pelo treinamento online
+        caminho (str): Caminho do arquivo de estado
+    """
+    import joblib
+    
+    diretorio = os.path.dirname(caminho)
+    if diretorio:
+        os.makedirs(diretorio, exist_ok=True)
+    # Grava em um arquivo temporário para não corromper o estado em caso de falha
+    temporario = caminho + ".tmp"
+    joblib.dump(estado, temporario)
+    os.replace(temporario, caminho)
+
+def identificar_topicos_online(blocos, stopwords_pt, n_topicos=3, caminho_estado=None,
+                               total_documentos=1000000, n_jobs=-1):
+    """
+    Identifica tópicos em um corpus grande, treinando o LDA de forma incremental.
+    
+    O vocabulário é aprendido no primeiro bloco e mantido fixo; cada bloco é
+    então vetorizado e usado em um passo de partial_fit, sem manter a matriz
+    do corpus inteiro em memória. Com `caminho_estado`, o vocabulário e o
+    modelo são salvos em disco e uma nova chamada (ex.: com a exportação do
+    dia seguinte) continua o treinamento de onde parou.
+    
+    Args:
+        blocos (iterável): Blocos de textos (listas ou Series)
+        stopwords_pt (set): Conjunto de stopwords em português
+        n_topicos (int): Número de tópicos a identificar
+        caminho_estado (str, opcional): Arquivo onde o estado do modelo é lido e salvo
+        total_documentos (int): Estimativa do total de documentos, usada no passo de aprendizado
+        n_jobs (int): Número de processos usados no ajuste (-1 = todos os núcleos)
+        
+    Returns:
+        list: Lista de tópicos, onde cada tópico é uma lista de palavras
+    """
+    from sklearn.feature_extraction.text import CountVectorizer
+    from sklearn.decomposition import LatentDirichletAllocation
+    
+    try:
+        estado = carregar_estado_online(caminho_estado)
+        if estado is not None and estado['n_topicos'] != n_topicos:
+            raise ValueError(
+                f"O estado salvo foi treinado com {estado['n_topicos']} tópicos, não {n_topicos}"
+            )
+        
+        for bloco in blocos:
+            textos = [str(texto) for texto in bloco]
+            if not textos:
+                continue
             
-        return topicos
+            # Só o ajuste é medido: a leitura e o pré-processamento do bloco têm etapas próprias
+            with medir_etapa("identificar_topicos", itens=len(textos)):
+                if estado is None:
+                    # Vocabulário fixo aprendido no primeiro bloco
+                    vetor = CountVectorizer(
+                        max_df=0.9, min_df=2, stop_words=list(stopwords_pt), max_features=MAX_TERMOS_ONLINE
+                    )
+                    vetor.fit(textos)
+                    lda = LatentDirichletAllocation(
+                        n_components=n_topicos,
+                        learning_method='online',
+                        total_samples=total_documentos,
+                        random_state=0,
+                        n_jobs=n_jobs
+                    )
+                    estado = {'vetor': vetor, 'lda': lda, 'n_topicos': n_topicos, 'documentos': 0}
+                
+                estado['lda'].partial_fit(estado['vetor'].transform(textos))
+                estado['documentos'] += len(textos)
+        
+        if estado is None:
+            return []
+        if caminho_estado is not None:
+            salvar_estado_online(estado, caminho_estado)
+        
+        palavras = estado['vetor'].get_feature_names_out()
+        return _termos_principais(estado['lda'].components_, palavras)
     except Exception as e:
-        print(f"Erro ao identificar tópicos: {e}")
-        return [] 
\ No newline at end of file
+        print(f"Erro ao identificar tópicos (modo online): {e}")
+        return []
@@ -0,0 +1,234 @@
+"""
+Módulo com a camada de execução da inferência: threads do PyTorch e
+processos de trabalho.
+
+Com fork após o carregamento (padrão onde o sistema suporta fork), o processo
+principal carrega os modelos uma única vez e só então cria os processos de
+trabalho, que herdam os pesos por cópia na escrita (copy-on-write) em vez de
+carregá-los de novo. O OpenMP usado pelo PyTorch não sobrevive a um fork
+feito depois de criar suas threads, então nesse modo o processo principal
+roda com uma única thread e as threads configuradas valem para os processos
+de trabalho. O fork só é seguro em processos sem outras threads em execução
+(como a CLI); a interface web cria os processos por spawn.
+"""
+
+import itertools
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from src.config import obter_config_execucao
+
+# Recursos de cada pool no processo atual, indexados pelo identificador do pool
+_recursos = {}
+_identificadores = itertools.count()
+
+def threads_por_worker(workers):
+    """
+    Divide os núcleos disponíveis entre os processos de trabalho.
+    
+    Args:
+        workers (int): Número de processos de trabalho
+    
+    Returns:
+        int: Threads intra-op por processo (no mínimo 1)
+    """
+    nucleos = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+    return max(1, nucleos // max(1, workers))
+
+def configurar_threads(intra=None, inter=None):
+    """
+    Define as threads do PyTorch no processo atual.
+    
+    Sem efeito se o PyTorch não estiver instalado. As threads inter-op só podem
+    ser definidas uma vez por processo, antes de qualquer trabalho paralelo;
+    tentativas posteriores são ignoradas.
+    
+    Args:
+        intra (int, opcional): Threads usadas dentro de cada operação
+        inter (int, opcional): Threads usadas para executar operações em paralelo
+    """
+    try:
+        import torch
+    except ImportError:
+        return
+    if intra:
+        torch.set_num_threads(intra)
+    if inter:
+        try:
+            torch.set_num_interop_threads(inter)
+        except RuntimeError:
+            pass
+
+def configurar_processo_principal(config):
+    """
+    Define as threads do processo principal antes de carregar os modelos.
+    
+    Com mais de um processo de trabalho, o processo principal fica com uma
+    única thread: com fork, o OpenMP não pode ter threads antes da criação
+    dos processos; com spawn, a inferência pesada roda nos processos de
+    trabalho, e threads no processo principal só disputariam os núcleos.
+    
+    Args:
+        config (dict): Configuração retornada por obter_config_execucao
+    """
+    if config['workers'] > 1:
+        configurar_threads(1)
+    else:
+        configurar_threads(config['threads_intra'] or threads_por_worker(1), config['threads_inter'])
+
+def _usa_fork(fork_apos_carregar):
+    """Indica se os processos de trabalho podem ser criados por fork neste sistema."""
+    return fork_apos_carregar and "fork" in multiprocessing.get_all_start_methods()
+
+def _inicializar_processo(identificador, carregar, preparar, intra, inter):
+    """Configura as threads e prepara os recursos em um processo de trabalho."""
+    configurar_threads(intra, inter)
+    if carregar is not None:
+        _recursos[identificador] = carregar()
+    if preparar is not None:
+        _recursos[identificador] = preparar(_recursos[identificador])
+
+def _executar(identificador, funcao, argumento):
+    """Executa uma tarefa com os recursos do pool no processo de trabalho."""
+    return funcao(_recursos[identificador], argumento)
+
+def _aquecer():
+    """Tarefa vazia usada para criar os processos logo após o carregamento."""
+    return os.getpid()
+
+class PoolInferencia:
+    """
+    Processos de trabalho que executam tarefas com os modelos já carregados.
+    
+    Os recursos são obtidos em duas etapas: `carregar` devolve os recursos
+    pesados (modelos), carregados uma vez no processo principal quando há fork
+    ou em cada processo caso contrário; `preparar` recebe esses recursos e
+    devolve os recursos de cada processo (ex.: conexões com o cache, que não
+    podem ser herdadas por fork). Com um único worker, tudo roda no processo
+    atual, sem pool.
+    
+    Attributes:
+        workers (int): Número de processos de trabalho
+        fork (bool): Se os processos foram criados por fork após o carregamento
+        threads_intra (int): Threads intra-op do PyTorch em cada processo
+    """
+    
+    def __init__(self, carregar, preparar=None, workers=1, fork_apos_carregar=True,
+                 threads_intra=None, threads_inter=None):
+        """
+        Args:
+            carregar (callable): Função sem argumentos que carrega os recursos pesados
+                (deve ser serializável com pickle quando não há fork)
+            preparar (callable, opcional): Função que recebe os recursos carregados e
+                devolve os recursos usados pelas tarefas no processo
+            workers (int): Número de processos de trabalho
+            fork_apos_carregar (bool): Cria os processos por fork depois de carregar os modelos
+            threads_intra (int, opcional): Threads intra-op por processo (padrão: núcleos / workers)
+            threads_inter (int, opcional): Threads inter-op por processo
+        """
+        self.workers = max(1, workers)
+        self.fork = self.workers > 1 and _usa_fork(fork_apos_carregar)
+        self.identificador = next(_identificadores)
+        intra = self.threads_intra = threads_intra or threads_por_worker(self.workers)
+        self._executor = None
+        
+        if self.workers == 1:
+            configurar_threads(intra, threads_inter)
+            _inicializar_processo(self.identificador, carregar, preparar, None, None)
+            return
+        
+        if self.fork:
+            configurar_threads(1)
+            # O tokenizador rápido também usa threads próprias, que não sobrevivem ao fork
+            os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+            _recursos[self.identificador] = carregar()
+            contexto = multiprocessing.get_context("fork")
+            inicializacao = (self.identificador, None, preparar, intra, threads_inter)
+        else:
+            contexto = multiprocessing.get_context("spawn")
+            inicializacao = (self.identificador, carregar, preparar, intra, threads_inter)
+        
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=contexto,
+            initializer=_inicializar_processo,
+            initargs=inicializacao,
+        )
+        if self.fork:
+            # Cria os processos agora, enquanto o processo principal ainda não usou threads
+            self._executor.submit(_aquecer).result()
+    
+    @property
+    def recursos(self):
+        """Recursos carregados no processo atual (None se ficaram só nos processos de trabalho)."""
+        return _recursos.get(self.identificador)
+    
+    def mapear(self, funcao, argumentos, max_pendentes=None):
+        """
+        Executa funcao(recursos, argumento) para cada argumento, preservando a ordem.
+        
+        No máximo max_pendentes tarefas (padrão: 2 por processo) ficam pendentes
+        ao mesmo tempo, o que mantém o uso de memória limitado mesmo quando os
+        argumentos vêm de um gerador grande.
+        
+        Args:
+            funcao (callable): Função de nível de módulo (serializável com pickle)
+            argumentos (iterable): Argumentos das tarefas
+            max_pendentes (int, opcional): Tarefas aguardando resultado ao mesmo tempo
+        
+        Yields:
+            Resultado de cada tarefa, na ordem dos argumentos
+        """
+        if self._executor is None:
+            for argumento in argumentos:
+                yield funcao(self.recursos, argumento)
+            return
+        
+        max_pendentes = max_pendentes or 2 * self.workers
+        pendentes = deque()
+        for argumento in argumentos:
+            pendentes.append(self._executor.submit(_executar, self.identificador, funcao, argumento))
+            if len(pendentes) >= max_pendentes:
+                yield pendentes.popleft().result()
+        while pendentes:
+            yield pendentes.popleft().result()
+    
+    def encerrar(self):
+        """Encerra os processos de trabalho e libera os recursos do pool."""
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+        _recursos.pop(self.identificador, None)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *excecao):
+        self.encerrar()
+
+def criar_pool(carregar, preparar=None, config=None, **alteracoes):
+    """
+    Cria um PoolInferencia a partir da configuração de execução.
+    
+    Args:
+        carregar (callable): Função que carrega os recursos pesados
+        preparar (callable, opcional): Função que prepara os recursos de cada processo
+        config (dict, opcional): Configuração de obter_config_execucao (padrão: variáveis de ambiente)
+        **alteracoes: Valores que substituem os da configuração (ex.: workers=4)
+    
+    Returns:
+        PoolInferencia: Pool pronto para uso
+    """
+    if config is None:
+        config = obter_config_execucao()
+    config = dict(config, **{chave: valor for chave, valor in alteracoes.items() if valor is not None})
+    return PoolInferencia(
+        carregar,
+        preparar,
+        workers=config['workers'],
+        fork_apos_carregar=config['fork_apos_carregar'],
+        threads_intra=config['threads_intra'],
+        threads_inter=config['threads_inter'],
+    )
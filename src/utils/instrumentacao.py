@@ -0,0 +1,382 @@
+"""
+Módulo com a instrumentação das etapas do processamento.
+
+Cada etapa (carregar_arquivo, limpar_texto, lematizar, analisar_sentimento,
+identificar_topicos, criar_nuvem_palavras) registra o tempo de parede, a
+quantidade de itens, a vazão (itens/s) e a memória residente (RSS) durante
+a etapa: o pico e o aumento em relação ao início da etapa. As medições ficam em um registro global, exibido no painel
+"Desempenho" da interface web e exportado em JSON ou no formato texto do
+Prometheus pela CLI e pelo serviço HTTP.
+
+Uso:
+    with medir_etapa("lematizar") as etapa:
+        lemas = lematizar_textos(textos, nlp, stopwords_pt)
+        etapa.itens = len(textos)
+
+    @medir_etapa("identificar_topicos")
+    def identificar_topicos(textos, ...): ...
+"""
+
+import functools
+import inspect
+import json
+import sys
+import threading
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Etapas instrumentadas, na ordem em que aparecem no processamento
+ETAPAS = (
+    "carregar_arquivo", "limpar_texto", "lematizar",
+    "analisar_sentimento", "identificar_topicos", "criar_nuvem_palavras",
+)
+
+def pico_rss_bytes():
+    """
+    Retorna o pico de memória residente (RSS) do processo desde o início.
+    
+    É o mesmo valor para todas as etapas depois que os modelos são carregados;
+    a memória de cada etapa é medida por _JanelaMemoria. Como ela zera o pico
+    do sistema, o maior pico visto antes de cada zeramento também é considerado.
+    
+    Returns:
+        int: Pico de RSS em bytes, ou None se o sistema não informar
+    """
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss é informado em KB no Linux e em bytes no macOS
+    pico = pico if sys.platform == "darwin" else pico * 1024
+    return max(pico, _pico_antes_de_zerar)
+
+def _ler_memoria():
+    """Lê o RSS atual e o pico de RSS (VmHWM) do processo em /proc, em bytes."""
+    valores = {}
+    with open("/proc/self/status") as status:
+        for linha in status:
+            if linha.startswith(("VmRSS:", "VmHWM:")):
+                chave, valor = linha.split(":")
+                valores[chave] = int(valor.split()[0]) * 1024
+    return valores["VmRSS"], valores["VmHWM"]
+
+def _zerar_pico():
+    """Faz o pico de RSS (VmHWM) do processo voltar ao RSS atual (Linux)."""
+    with open("/proc/self/clear_refs", "w") as arquivo:
+        arquivo.write("5")
+
+def _suporta_memoria_por_etapa():
+    """Indica se o sistema permite zerar e ler o pico de RSS (Linux com /proc)."""
+    global _pico_antes_de_zerar
+    try:
+        _pico_antes_de_zerar = max(_pico_antes_de_zerar, _ler_memoria()[1])
+        _zerar_pico()
+    except (OSError, KeyError, ValueError):
+        return False
+    return True
+
+# Janelas de medição de memória abertas no processo (de qualquer thread)
+_trava_memoria = threading.Lock()
+_janelas_abertas = set()
+_memoria_por_etapa = None
+# Maior pico do processo observado antes de algum zeramento
+_pico_antes_de_zerar = 0
+
+class _JanelaMemoria:
+    """
+    Mede o pico de RSS do processo entre a abertura e o fechamento da janela.
+    
+    O pico do processo (VmHWM) é zerado na abertura. Como o pico é único para
+    o processo, antes de cada zeramento (e em cada fechamento) o valor atual é
+    repassado a todas as janelas abertas, então etapas aninhadas ou em outras
+    threads não apagam o pico umas das outras. A medição é do processo
+    inteiro: memória alocada por outras threads durante a etapa também conta.
+    Fora do Linux, pico e aumento ficam como None.
+    
+    Attributes:
+        pico (int): Maior RSS observado durante a janela, em bytes
+        aumento (int): Pico menos o RSS na abertura, em bytes
+    """
+    
+    def __init__(self):
+        global _memoria_por_etapa
+        self.inicio = self.pico = self.aumento = None
+        with _trava_memoria:
+            if _memoria_por_etapa is None:
+                _memoria_por_etapa = _suporta_memoria_por_etapa()
+            if not _memoria_por_etapa:
+                return
+            self._repassar_pico()
+            _zerar_pico()
+            self.inicio = self.pico = _ler_memoria()[0]
+            _janelas_abertas.add(self)
+    
+    @staticmethod
+    def _repassar_pico():
+        """Atualiza o pico das janelas abertas com o pico atual do processo (com a trava adquirida)."""
+        global _pico_antes_de_zerar
+        pico = _ler_memoria()[1]
+        _pico_antes_de_zerar = max(_pico_antes_de_zerar, pico)
+        for janela in _janelas_abertas:
+            janela.pico = max(janela.pico, pico)
+    
+    def fechar(self):
+        """Encerra a medição e calcula o aumento de RSS."""
+        with _trava_memoria:
+            if self not in _janelas_abertas:
+                return
+            self._repassar_pico()
+            _janelas_abertas.discard(self)
+        self.aumento = self.pico - self.inicio
+
+class RegistroMetricas:
+    """
+    Acumula as medições das etapas (seguro para várias threads).
+    
+    Para cada etapa são guardados o número de execuções, o tempo e os itens
+    acumulados, a última medição e o maior pico e o maior aumento de RSS
+    observados durante a etapa.
+    """
+    
+    def __init__(self):
+        self._trava = threading.Lock()
+        self._etapas = {}
+    
+    def registrar(self, etapa, duracao, itens=None, pico_rss=None, aumento_rss=None):
+        """
+        Registra uma execução de uma etapa.
+        
+        Args:
+            etapa (str): Nome da etapa
+            duracao (float): Tempo de parede em segundos
+            itens (int, opcional): Quantidade de itens processados
+            pico_rss (int, opcional): Pico de RSS do processo durante a etapa, em bytes
+            aumento_rss (int, opcional): Pico de RSS menos o RSS no início da etapa, em bytes
+        """
+        with self._trava:
+            dados = self._etapas.setdefault(etapa, {
+                'execucoes': 0, 'tempo_total_s': 0.0, 'itens_total': 0,
+                'ultimo_tempo_s': None, 'ultimos_itens': None,
+                'pico_rss_bytes': None, 'aumento_rss_bytes': None,
+            })
+            dados['execucoes'] += 1
+            dados['tempo_total_s'] += duracao
+            dados['itens_total'] += itens or 0
+            dados['ultimo_tempo_s'] = duracao
+            dados['ultimos_itens'] = itens
+            if pico_rss is not None:
+                dados['pico_rss_bytes'] = max(dados['pico_rss_bytes'] or 0, pico_rss)
+            if aumento_rss is not None:
+                dados['aumento_rss_bytes'] = max(dados['aumento_rss_bytes'] or 0, aumento_rss)
+    
+    def coletar(self):
+        """
+        Retorna as medições acumuladas e zera o registro.
+        
+        Usado pelos processos de trabalho para enviar suas medições ao
+        processo principal, que as soma com combinar.
+        
+        Returns:
+            dict: Medições brutas por etapa
+        """
+        with self._trava:
+            etapas, self._etapas = self._etapas, {}
+        return etapas
+    
+    def combinar(self, etapas):
+        """
+        Soma ao registro as medições coletadas em outro registro (ou processo).
+        
+        Args:
+            etapas (dict): Medições retornadas por coletar
+        """
+        with self._trava:
+            for etapa, novos in etapas.items():
+                dados = self._etapas.get(etapa)
+                if dados is None:
+                    self._etapas[etapa] = dict(novos)
+                    continue
+                dados['execucoes'] += novos['execucoes']
+                dados['tempo_total_s'] += novos['tempo_total_s']
+                dados['itens_total'] += novos['itens_total']
+                dados['ultimo_tempo_s'] = novos['ultimo_tempo_s']
+                dados['ultimos_itens'] = novos['ultimos_itens']
+                for chave in ('pico_rss_bytes', 'aumento_rss_bytes'):
+                    if novos[chave] is not None:
+                        dados[chave] = max(dados[chave] or 0, novos[chave])
+    
+    def _copiar(self):
+        """Copia as medições, com as etapas na ordem de ETAPAS (as desconhecidas no final)."""
+        with self._trava:
+            etapas = {etapa: dict(dados) for etapa, dados in self._etapas.items()}
+        posicao = lambda etapa: (ETAPAS.index(etapa) if etapa in ETAPAS else len(ETAPAS), etapa)
+        return {etapa: etapas[etapa] for etapa in sorted(etapas, key=posicao)}
+    
+    def limpar(self):
+        """Remove todas as medições."""
+        with self._trava:
+            self._etapas = {}
+    
+    def resumo(self):
+        """
+        Resume as medições de cada etapa.
+        
+        Returns:
+            dict: Para cada etapa (na ordem de ETAPAS), execuções, tempo total,
+                itens, itens por segundo, última medição e pico e aumento de RSS em MB
+        """
+        resultado = {}
+        for etapa, dados in self._copiar().items():
+            tempo = dados['tempo_total_s']
+            resultado[etapa] = {
+                'execucoes': dados['execucoes'],
+                'tempo_total_s': round(tempo, 4),
+                'itens': dados['itens_total'],
+                'itens_por_s': round(dados['itens_total'] / tempo, 1) if tempo > 0 and dados['itens_total'] else None,
+                'ultimo_tempo_s': round(dados['ultimo_tempo_s'], 4),
+                'ultimos_itens': dados['ultimos_itens'],
+                'pico_rss_mb': round(dados['pico_rss_bytes'] / 2**20, 1) if dados['pico_rss_bytes'] else None,
+                'aumento_rss_mb': round(dados['aumento_rss_bytes'] / 2**20, 1) if dados['aumento_rss_bytes'] is not None else None,
+            }
+        return resultado
+    
+    def como_json(self):
+        """
+        Retorna o resumo das medições em JSON.
+        
+        Returns:
+            str: Documento JSON com o resumo de cada etapa
+        """
+        return json.dumps(self.resumo(), ensure_ascii=False, indent=2)
+    
+    def como_prometheus(self, prefixo="sentimento", extras=None):
+        """
+        Retorna as medições no formato texto de exposição do Prometheus.
+        
+        Args:
+            prefixo (str): Prefixo dos nomes das métricas
+            extras (dict, opcional): Métricas adicionais {nome: (tipo, ajuda, valor)},
+                com nomes sem o prefixo (ex.: o tamanho da fila do serviço)
+        
+        Returns:
+            str: Texto no formato de exposição do Prometheus
+        """
+        etapas = self._copiar()
+        metricas = [
+            ("etapa_execucoes_total", "counter", "Execuções de cada etapa", 'execucoes'),
+            ("etapa_segundos_total", "counter", "Tempo de parede acumulado em cada etapa", 'tempo_total_s'),
+            ("etapa_itens_total", "counter", "Itens processados em cada etapa", 'itens_total'),
+            ("etapa_ultimo_segundos", "gauge", "Tempo de parede da última execução de cada etapa", 'ultimo_tempo_s'),
+            ("etapa_pico_rss_bytes", "gauge", "Maior memória residente do processo durante cada etapa", 'pico_rss_bytes'),
+            ("etapa_aumento_rss_bytes", "gauge", "Maior aumento da memória residente durante cada etapa", 'aumento_rss_bytes'),
+        ]
+        linhas = []
+        for nome, tipo, ajuda, chave in metricas:
+            linhas.append(f"# HELP {prefixo}_{nome} {ajuda}")
+            linhas.append(f"# TYPE {prefixo}_{nome} {tipo}")
+            for etapa, dados in etapas.items():
+                if dados[chave] is not None:
+                    linhas.append(f'{prefixo}_{nome}{{etapa="{etapa}"}} {dados[chave]}')
+        
+        pico = pico_rss_bytes()
+        metricas_extras = dict(extras or {})
+        if pico is not None:
+            metricas_extras.setdefault("processo_pico_rss_bytes", ("gauge", "Pico de memória residente do processo", pico))
+        for nome, (tipo, ajuda, valor) in metricas_extras.items():
+            linhas.append(f"# HELP {prefixo}_{nome} {ajuda}")
+            linhas.append(f"# TYPE {prefixo}_{nome} {tipo}")
+            linhas.append(f"{prefixo}_{nome} {valor}")
+        return "\n".join(linhas) + "\n"
+
+# Registro usado por padrão pelas etapas instrumentadas
+REGISTRO = RegistroMetricas()
+
+# Etapas em execução em cada thread, para não contar duas vezes chamadas aninhadas
+_ativas = threading.local()
+
+class medir_etapa:
+    """
+    Mede uma etapa, como gerenciador de contexto ou como decorador.
+    
+    Chamadas aninhadas da mesma etapa na mesma thread (ex.: recursão) são
+    medidas apenas uma vez, pela chamada mais externa. Como decorador de uma
+    função geradora, mede o tempo gasto produzindo os itens (e não o tempo
+    do código que os consome); a memória é medida do primeiro ao último item,
+    incluindo a do código que os consome.
+    
+    Attributes:
+        itens (int): Quantidade de itens processados (pode ser definida dentro do bloco with)
+    """
+    
+    def __init__(self, etapa, itens=None, registro=None):
+        """
+        Args:
+            etapa (str): Nome da etapa
+            itens (int ou callable, opcional): No gerenciador de contexto, a quantidade
+                de itens. No decorador, uma função que recebe o resultado (ou cada item
+                gerado) e retorna a quantidade; por padrão, o tamanho do primeiro argumento
+            registro (RegistroMetricas, opcional): Registro de destino (padrão: REGISTRO)
+        """
+        self.etapa = etapa
+        self.itens = itens
+        self.registro = registro or REGISTRO
+        self._inicio = None
+        self._memoria = None
+        self._aninhada = False
+    
+    def __enter__(self):
+        ativas = _ativas.__dict__.setdefault('etapas', set())
+        self._aninhada = self.etapa in ativas
+        ativas.add(self.etapa)
+        if not self._aninhada:
+            self._memoria = _JanelaMemoria()
+        self._inicio = time.perf_counter()
+        return self
+    
+    def __exit__(self, *excecao):
+        duracao = time.perf_counter() - self._inicio
+        if not self._aninhada:
+            _ativas.etapas.discard(self.etapa)
+            self._memoria.fechar()
+            self.registro.registrar(self.etapa, duracao, self.itens, self._memoria.pico, self._memoria.aumento)
+        return False
+    
+    def __call__(self, funcao):
+        contar = self.itens if callable(self.itens) else None
+        etapa, registro = self.etapa, self.registro
+        
+        if inspect.isgeneratorfunction(funcao):
+            @functools.wraps(funcao)
+            def gerador_medido(*args, **kwargs):
+                duracao, itens = 0.0, 0
+                memoria = _JanelaMemoria()
+                gerador = funcao(*args, **kwargs)
+                try:
+                    while True:
+                        inicio = time.perf_counter()
+                        try:
+                            item = next(gerador)
+                        except StopIteration:
+                            duracao += time.perf_counter() - inicio
+                            return
+                        duracao += time.perf_counter() - inicio
+                        itens += contar(item) if contar is not None else 1
+                        yield item
+                finally:
+                    memoria.fechar()
+                    registro.registrar(etapa, duracao, itens, memoria.pico, memoria.aumento)
+            return gerador_medido
+        
+        @functools.wraps(funcao)
+        def funcao_medida(*args, **kwargs):
+            with medir_etapa(etapa, registro=registro) as medicao:
+                resultado = funcao(*args, **kwargs)
+                if contar is not None:
+                    medicao.itens = contar(resultado)
+                elif args and hasattr(args[0], '__len__'):
+                    medicao.itens = len(args[0])
+            return resultado
+        return funcao_medida
@@ -3,24 +3,53 @@ Módulo para processamento de textos.
 Contém funções para limpeza, pré-processamento e análise de texto.
 """
 
+import json
+import os
 import re
-import spacy
-from nltk.corpus import stopwords
-import nltk
+import time
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+import numpy as np
 
-# Garantir recursos necessários
-try:
-    stopwords.words('portuguese')
-except LookupError:
-    nltk.download('stopwords')
+from src.utils.instrumentacao import medir_etapa
+
+# Negações mantidas na lematização, embora façam parte das stopwords do NLTK:
+# sem elas, "não gostei" viraria "gostar" e inverteria o sentimento
+NEGADORES = frozenset({"não", "nao", "nem", "nunca", "jamais"})
 
 def load_nlp_resources():
     """
     Carrega recursos de processamento de linguagem natural.
     
+    O spaCy e o NLTK só são importados aqui, para não atrasar a abertura da
+    aplicação (ex.: a página de login) com bibliotecas que ela ainda não usa.
+    Se o repositório local de modelos existir (ver scripts/setup.py), o modelo
+    spaCy e as stopwords são lidos dele, sem acessar a rede.
+    
     Returns:
         tuple: Modelo spaCy e conjunto de stopwords em português
     """
+    import spacy
+    from src.models.model_store import DIRETORIO_SPACY, ARQUIVO_STOPWORDS, localizar_modelos
+    
+    inicio = time.perf_counter()
+    diretorio_modelos = localizar_modelos()
+    if diretorio_modelos is not None:
+        nlp = spacy.load(os.path.join(diretorio_modelos, DIRETORIO_SPACY))
+        with open(os.path.join(diretorio_modelos, ARQUIVO_STOPWORDS), encoding='utf-8') as arquivo:
+            stopwords_pt = set(json.load(arquivo))
+        print(f"⏱️ Recursos de PLN carregados de {diretorio_modelos} em {time.perf_counter() - inicio:.2f} s")
+        return nlp, stopwords_pt
+    
+    import nltk
+    from nltk.corpus import stopwords
+    
+    # Garantir recursos necessários
+    try:
+        stopwords.words('portuguese')
+    except LookupError:
+        nltk.download('stopwords')
+    
     try:
         nlp = spacy.load("pt_core_news_sm")
     except OSError:
@@ -28,6 +57,7 @@ def load_nlp_resources():
         nlp = spacy.load("pt_core_news_sm")
         
     stopwords_pt = set(stopwords.words('portuguese'))
+    print(f"⏱️ Recursos de PLN carregados em {time.perf_counter() - inicio:.2f} s")
     return nlp, stopwords_pt
 
 def limpar_texto(texto):
@@ -47,6 +77,46 @@ def limpar_texto(texto):
     texto = texto.lower().strip()
     return texto
 
+# Padrões pré-compilados usados na limpeza de colunas inteiras. A remoção de
+# URLs precisa ocorrer antes das demais, pois uma URL pode conter trechos que
+# se parecem com menções; as outras substituições apagam caracteres
+# independentes entre si e podem ser feitas em uma única passada.
+_PADRAO_URL = re.compile(r"http\S+|www.\S+")
+_PADRAO_RESIDUOS = re.compile(r"@\w+|#\w+|[^\w\s]|\d+")
+
+def _limpar_serie(serie):
+    """Aplica a limpeza vetorizada a uma Series (usada também pelos processos)."""
+    return (
+        serie.astype(str)
+        .str.replace(_PADRAO_URL, "", regex=True)
+        .str.replace(_PADRAO_RESIDUOS, "", regex=True)
+        .str.lower()
+        .str.strip()
+    )
+
+@medir_etapa("limpar_texto")
+def limpar_textos(textos, n_processos=1):
+    """
+    Limpa uma coluna inteira de textos, com o mesmo resultado de limpar_texto.
+    
+    Usa o acessor .str do pandas com padrões pré-compilados, reduzindo as
+    quatro substituições de limpar_texto a duas passadas por texto.
+    
+    Args:
+        textos (Series ou list): Textos a serem limpos
+        n_processos (int): Número de processos para dividir o trabalho (1 = sem paralelismo)
+        
+    Returns:
+        Series: Textos limpos, com o mesmo índice da entrada
+    """
+    serie = textos if isinstance(textos, pd.Series) else pd.Series(list(textos), dtype=object)
+    if n_processos <= 1 or len(serie) < n_processos:
+        return _limpar_serie(serie)
+    
+    partes = [serie.iloc[indices] for indices in np.array_split(np.arange(len(serie)), n_processos)]
+    with ProcessPoolExecutor(max_workers=n_processos) as executor:
+        return pd.concat(list(executor.map(_limpar_serie, partes)))
+
 def lematizar(texto, nlp, stopwords_pt):
     """
     Realiza lematização e remove stopwords.
@@ -60,7 +130,26 @@ def lematizar(texto, nlp, stopwords_pt):
         str: Texto lematizado sem stopwords
     """
     doc = nlp(texto)
-    return " ".join([token.lemma_ for token in doc if token.text not in stopwords_pt and token.is_alpha])
+    return _lemas_do_doc(doc, stopwords_pt)
+
+def _lemas_do_doc(doc, stopwords_pt):
+    """
+    Extrai os lemas de um documento spaCy, sem stopwords e tokens não alfabéticos.
+    
+    As negações (NEGADORES) são mantidas, na forma original, mesmo sendo stopwords.
+    
+    Args:
+        doc: Documento spaCy já processado
+        stopwords_pt: Conjunto de stopwords
+        
+    Returns:
+        str: Texto lematizado sem stopwords
+    """
+    return " ".join([
+        token.text if token.text in NEGADORES else token.lemma_
+        for token in doc
+        if token.text in NEGADORES or (token.text not in stopwords_pt and token.is_alpha)
+    ])
 
 def preprocessar_texto(texto, nlp, stopwords_pt):
     """
@@ -74,4 +163,54 @@ def preprocessar_texto(texto, nlp, stopwords_pt):
     Returns:
         str: Texto pré-processado
     """
-    return lematizar(limpar_texto(texto), nlp, stopwords_pt) 
\ No newline at end of file
+    return lematizar(limpar_texto(texto), nlp, stopwords_pt)
+
+# Componentes do pipeline spaCy que não são usados pela lematização
+COMPONENTES_DESNECESSARIOS = ["parser", "ner", "senter"]
+
+@medir_etapa("lematizar")
+def lematizar_textos(textos, nlp, stopwords_pt, batch_size=1000, n_process=1):
+    """
+    Lematiza vários textos já limpos usando nlp.pipe.
+    
+    Os componentes do spaCy que a lematização não utiliza (parser, NER)
+    são desativados. Os resultados são gerados sob demanda, na mesma ordem
+    da entrada, sem materializar a coluna inteira em memória.
+    
+    Args:
+        textos (iterável): Textos já limpos (lista, Series ou gerador)
+        nlp: Modelo spaCy carregado
+        stopwords_pt: Conjunto de stopwords
+        batch_size (int): Quantidade de textos enviados ao spaCy por lote
+        n_process (int): Número de processos usados pelo spaCy
+        
+    Yields:
+        str: Texto lematizado sem stopwords
+    """
+    desativar = [nome for nome in COMPONENTES_DESNECESSARIOS if nome in nlp.pipe_names]
+    docs = nlp.pipe(textos, disable=desativar, batch_size=batch_size, n_process=n_process)
+    for doc in docs:
+        yield _lemas_do_doc(doc, stopwords_pt)
+
+def preprocessar_textos(textos, nlp, stopwords_pt, batch_size=1000, n_process=1):
+    """
+    Aplica o pipeline de pré-processamento a vários textos usando nlp.pipe.
+    
+    Listas e Series são limpas de uma vez com limpar_textos (e medidas como a
+    etapa limpar_texto); geradores são limpos texto a texto, sob demanda.
+    
+    Args:
+        textos (iterável): Textos originais (lista, Series ou gerador)
+        nlp: Modelo spaCy carregado
+        stopwords_pt: Conjunto de stopwords
+        batch_size (int): Quantidade de textos enviados ao spaCy por lote
+        n_process (int): Número de processos usados pelo spaCy
+        
+    Yields:
+        str: Texto pré-processado
+    """
+    if hasattr(textos, '__len__'):
+        textos_limpos = limpar_textos(textos)
+    else:
+        textos_limpos = (limpar_texto(texto) for texto in textos)
+    yield from lematizar_textos(textos_limpos, nlp, stopwords_pt, batch_size, n_process)
@@ -2,34 +2,112 @@
 Módulo para visualização de dados de análise de texto.
 """
 
-import matplotlib.pyplot as plt
-import seaborn as sns
-from wordcloud import WordCloud
-import plotly.express as px
 import base64
+import hashlib
 import io
+import threading
+from collections import Counter, OrderedDict
+import numpy as np
 
-def criar_nuvem_palavras(textos):
+from src.utils.instrumentacao import medir_etapa
+from src.utils.text_processing import NEGADORES
+
+# matplotlib, wordcloud e plotly são importados dentro das funções que os
+# usam, para que a aplicação abra sem carregar as bibliotecas de gráficos
+
+# Imagens de nuvens de palavras já renderizadas, indexadas pelo digest das frequências
+MAX_NUVENS_EM_CACHE = 16
+_nuvens = OrderedDict()
+_trava_nuvens = threading.Lock()
+
+def contar_frequencias(textos, contagem=None):
     """
-    Cria uma nuvem de palavras a partir de textos.
+    Conta a frequência das palavras de um conjunto de textos, texto a texto.
+    
+    Evita montar uma única string com todos os textos; pode ser chamada
+    várias vezes com a mesma `contagem` para acumular blocos. As negações,
+    mantidas no pré-processamento para a análise de sentimento, não são contadas.
     
     Args:
-        textos (list): Lista de textos para criar a nuvem de palavras
-        
+        textos (iterável): Textos (já pré-processados) separados por espaços
+        contagem (Counter, opcional): Contagem a ser atualizada
+    
+    Returns:
+        Counter: Frequência de cada palavra
+    """
+    if contagem is None:
+        contagem = Counter()
+    for texto in textos:
+        contagem.update(palavra for palavra in str(texto).split() if palavra not in NEGADORES)
+    return contagem
+
+def frequencias_da_matriz(matriz, termos):
+    """
+    Obtém a frequência dos termos a partir de uma matriz documento-termo.
+    
+    Permite reaproveitar a matriz de contagens do módulo de tópicos
+    (construir_matriz_termos) em vez de contar as palavras novamente.
+    
+    Args:
+        matriz: Matriz esparsa de contagens (documentos x termos)
+        termos (list): Termos correspondentes às colunas da matriz
+    
+    Returns:
+        dict: Frequência de cada termo
+    """
+    totais = np.asarray(matriz.sum(axis=0)).ravel()
+    return {termo: float(total) for termo, total in zip(termos, totais) if total > 0}
+
+def _digest_frequencias(frequencias):
+    """Calcula um identificador estável para um conjunto de frequências."""
+    h = hashlib.sha256()
+    for palavra, frequencia in sorted(frequencias.items()):
+        h.update(f"{palavra}\0{frequencia}\1".encode('utf-8'))
+    return h.hexdigest()
+
+@medir_etapa("criar_nuvem_palavras", itens=lambda _: 1)
+def criar_nuvem_palavras(textos=None, frequencias=None, max_palavras=200):
+    """
+    Cria uma nuvem de palavras a partir de textos ou de frequências já calculadas.
+    
+    A imagem renderizada fica em cache, indexada pelo digest das frequências
+    das palavras exibidas.
+    
+    Args:
+        textos (list, opcional): Lista de textos para criar a nuvem de palavras
+        frequencias (dict, opcional): Frequência de cada palavra (dispensa `textos`)
+        max_palavras (int): Quantidade máxima de palavras exibidas
+    
     Returns:
         objeto: Figura matplotlib com a nuvem de palavras
     """
-    texto_completo = " ".join(textos)
+    if frequencias is None:
+        frequencias = contar_frequencias(textos)
+    principais = dict(Counter(frequencias).most_common(max_palavras))
+    
+    import matplotlib.pyplot as plt
+    from wordcloud import WordCloud
+    
+    digest = _digest_frequencias(principais)
+    with _trava_nuvens:
+        imagem = _nuvens.get(digest)
+    
+    if imagem is None:
+        imagem = WordCloud(
+            width=800, 
+            height=400, 
+            background_color='white',
+            colormap='viridis',
+            max_words=max_palavras
+        ).generate_from_frequencies(principais).to_array()
+        with _trava_nuvens:
+            _nuvens[digest] = imagem
+            while len(_nuvens) > MAX_NUVENS_EM_CACHE:
+                _nuvens.popitem(last=False)
+    
     fig, ax = plt.subplots(figsize=(10, 5))
-    wordcloud = WordCloud(
-        width=800, 
-        height=400, 
-        background_color='white',
-        colormap='viridis'
-    ).generate(texto_completo)
-    
-    plt.imshow(wordcloud, interpolation='bilinear')
-    plt.axis('off')
+    ax.imshow(imagem, interpolation='bilinear')
+    ax.axis('off')
     return fig
 
 def grafico_distribuicao_sentimentos(df):
@@ -38,10 +116,12 @@ def grafico_distribuicao_sentimentos(df):
     
     Args:
         df (DataFrame): DataFrame pandas com coluna 'sentimento'
-        
+    
     Returns:
         objeto: Figura plotly com o gráfico de distribuição
     """
+    import plotly.express as px
+    
     fig = px.pie(
         df, 
         names='sentimento', 
@@ -63,7 +143,7 @@ def get_download_link(df, filename, text):
         df (DataFrame): DataFrame a ser salvo
         filename (str): Nome do arquivo para download
         text (str): Texto do link
-        
+    
     Returns:
         str: HTML com link para download
     """
@@ -2,24 +2,126 @@
 Módulo principal da aplicação web Streamlit.
 """
 
+import hashlib
+import io
+import time
+from contextlib import closing
+from functools import partial
 import streamlit as st
 import pandas as pd
 import numpy as np
 
 # Importa módulos do projeto
-from src.utils.text_processing import load_nlp_resources, preprocessar_texto
-from src.models.sentiment_analysis import load_sentiment_model, analisar_sentimento
+from src.utils.text_processing import load_nlp_resources, preprocessar_texto, limpar_textos, lematizar_textos
+from src.models.sentiment_analysis import carregar_modelo_sentimento, analisar_sentimento, analisar_sentimentos_em_lote, nome_do_modelo
+from src.models.sentiment_cache import CacheSentimento
+from src.models.lexicon_sentiment import CascataSentimento, LIMIAR_PADRAO
+from src.models.fast_sentiment import ClassificadorRapido, listar_modelos_rapidos
+from src.config import obter_limiar_cascata, obter_modo_textos_longos, obter_max_janelas, obter_config_execucao
+from src.utils.execucao import criar_pool, configurar_processo_principal
+from src.utils.instrumentacao import REGISTRO
+from src.web.tarefas import RegistroTarefas, CONCLUIDA, CANCELADA, EXECUTANDO, FALHOU
 from src.models.topic_analysis import identificar_topicos
-from src.utils.visualization import criar_nuvem_palavras, grafico_distribuicao_sentimentos, get_download_link
-from src.data.data_handler import carregar_arquivo, criar_estatisticas
+from src.utils.visualization import contar_frequencias, criar_nuvem_palavras, grafico_distribuicao_sentimentos
+from src.data.data_handler import (
+    carregar_arquivo, carregar_arquivo_em_blocos, ler_colunas, criar_estatisticas, aplicar_em_unicos,
+    agregar_sentimentos, combinar_agregados, estatisticas_de_agregado, exportar_resultados, FORMATOS_EXPORTACAO
+)
 from src.web.auth import pagina_login, verificar_autenticacao, obter_usuario_atual, logout
 
+# Métodos de tópicos oferecidos na interface; o NMF é o padrão por ser o mais
+# rápido e ter coerência equivalente no benchmark (scripts/benchmark_topicos.py)
+MOTORES_TOPICOS = {
+    "nmf": "NMF sobre TF-IDF (rápido)",
+    "lda_amostra": "LDA em amostra dos textos",
+    "lda": "LDA completo (mais lento)",
+}
+
+# Formatos oferecidos para baixar os resultados
+FORMATOS_DOWNLOAD = {
+    "parquet": "Parquet (menor, para análise em pandas/Spark)",
+    "csv.gz": "CSV compactado (gzip)",
+    "csv": "CSV",
+}
+
+# Opções do modo de textos longos (janelas deslizantes) oferecidas na barra lateral
+MODOS_TEXTOS_LONGOS = {
+    None: "Truncar em 512 tokens",
+    "media": "Janelas: média",
+    "ponderada": "Janelas: média ponderada pelo tamanho",
+    "pior_caso": "Janelas: pior caso (mais negativa)",
+}
+
+# Opção da barra lateral que usa o modelo BERT (as demais são versões do modelo rápido)
+MODELO_BERT = "BERT (mais preciso)"
+
+# Análise de arquivos em segundo plano: linhas por bloco (entre duas atualizações
+# do progresso e verificações de cancelamento) e intervalo de atualização da página
+TAMANHO_BLOCO_TAREFA = 2000
+INTERVALO_ATUALIZACAO = 1.0
+
+# Estados das tarefas exibidos ao retomar uma análise
+ESTADOS_TAREFA = {
+    EXECUTANDO: "em andamento",
+    CONCLUIDA: "concluída",
+    CANCELADA: "cancelada",
+    FALHOU: "falhou",
+}
+
 @st.cache_resource
 def carregar_recursos():
-    """Carrega os recursos necessários para a aplicação."""
-    nlp, stopwords_pt = load_nlp_resources()
-    modelo_sentimento = load_sentiment_model()
-    return nlp, stopwords_pt, modelo_sentimento
+    """Carrega os recursos de pré-processamento necessários para a aplicação."""
+    return load_nlp_resources()
+
+def _config_execucao_web():
+    """
+    Configuração de execução da interface web, sempre sem fork.
+    
+    O servidor do Streamlit já tem outras threads (sessões, tarefas em segundo
+    plano), e um fork copiaria as travas que elas estiverem segurando, podendo
+    travar os processos de trabalho. O fork após o carregamento fica restrito à CLI.
+    """
+    return dict(obter_config_execucao(), fork_apos_carregar=False)
+
+@st.cache_resource
+def carregar_classificador(versao_rapida=None):
+    """
+    Carrega o modelo de sentimento escolhido na barra lateral.
+    
+    Args:
+        versao_rapida (str, opcional): Versão do modelo rápido; None carrega o BERT
+    """
+    # Threads do PyTorch definidas antes do carregamento (ver obter_config_execucao):
+    # com processos de trabalho, a classificação dos arquivos roda neles e o
+    # processo do Streamlit fica com uma única thread
+    configurar_processo_principal(_config_execucao_web())
+    return carregar_modelo_sentimento(versao_rapida)
+
+@st.cache_resource
+def carregar_pool_inferencia(versao_rapida=None):
+    """
+    Cria os processos de trabalho que dividem a classificação dos arquivos.
+    
+    Os processos são criados por spawn (ver _config_execucao_web) e cada um
+    carrega o seu classificador.
+    
+    Returns:
+        PoolInferencia: Pool de processos, ou None com SENTIMENTO_WORKERS=1 (padrão)
+    """
+    config = _config_execucao_web()
+    if config['workers'] <= 1:
+        return None
+    return criar_pool(partial(carregar_modelo_sentimento, versao_rapida), config=config)
+
+@st.cache_resource
+def carregar_registro_tarefas():
+    """Cria o registro das análises em segundo plano, compartilhado entre as sessões."""
+    return RegistroTarefas()
+
+@st.cache_resource
+def carregar_cache_sentimento():
+    """Abre o cache persistente de resultados de sentimento."""
+    return CacheSentimento()
 
 def configurar_pagina():
     """Configura a página do Streamlit."""
@@ -29,9 +131,388 @@ def configurar_pagina():
         layout="wide"
     )
 
-def modo_arquivo(nlp, stopwords_pt, classificador):
+def _hash_do_arquivo(file):
+    """Calcula (uma vez por upload) o hash SHA-256 do conteúdo do arquivo enviado."""
+    hashes = st.session_state.setdefault('hashes_arquivos', {})
+    identificador = (getattr(file, 'file_id', None), file.name, file.size)
+    if identificador not in hashes:
+        hashes[identificador] = hashlib.sha256(file.getvalue()).hexdigest()
+    return hashes[identificador]
+
+def _preparar_exportacao(df, chave, formato):
+    """
+    Gera o arquivo de resultados e o registra na sessão.
+    
+    Substitui a exportação anterior da sessão, e o novo arquivo é
+    reaproveitado enquanto a análise e o formato não mudarem. O conteúdo
+    fica só na sessão (sem arquivos temporários em disco).
+    
+    Returns:
+        tuple: Chave da exportação e conteúdo do arquivo
+    """
+    st.session_state['exportacao'] = (chave, exportar_resultados(df, formato))
+    return st.session_state['exportacao']
+
+def _copiar_upload(file):
+    """Copia o conteúdo do arquivo enviado, para que a tarefa o leia sem disputar a posição com a página."""
+    copia = io.BytesIO(file.getvalue())
+    copia.name = file.name
+    return copia
+
+def _classificar_com_memoria(unicos, funcao, memoria):
+    """
+    Aplica funcao apenas aos valores ainda não vistos em blocos anteriores.
+    
+    Args:
+        unicos (list): Valores distintos do bloco
+        funcao (callable): Função em lote (lista de valores -> lista de resultados)
+        memoria (dict): Resultados já calculados, atualizado com os novos
+    
+    Returns:
+        list: Resultado de cada valor, na ordem de `unicos`
+    """
+    novos = [valor for valor in unicos if valor not in memoria]
+    if novos:
+        memoria.update(zip(novos, funcao(novos)))
+    return [memoria[valor] for valor in unicos]
+
+def processar_arquivo(tarefa, arquivo, col_texto, nlp, stopwords_pt, classificador, cache=None,
+                      limiar_cascata=None, textos_longos=None, max_janelas=None, pool=None,
+                      tamanho_bloco=TAMANHO_BLOCO_TAREFA):
+    """
+    Carrega, pré-processa e classifica a coluna de texto de um arquivo, em blocos.
+    
+    Executada em segundo plano por uma TarefaAnalise: a cada bloco concluído,
+    publica o progresso e as contagens parciais de sentimento e verifica se a
+    análise foi cancelada. Textos repetidos (no mesmo bloco ou em blocos
+    anteriores) são pré-processados e classificados uma única vez.
+    
+    Args:
+        tarefa (TarefaAnalise): Tarefa que executa a análise
+        arquivo: Cópia do arquivo enviado (ver _copiar_upload)
+        col_texto (str): Coluna com os textos
+        nlp: Modelo spaCy carregado
+        stopwords_pt: Conjunto de stopwords
+        classificador: Modelo de análise de sentimento
+        cache (CacheSentimento, opcional): Cache de sentimentos
+        limiar_cascata (float, opcional): Limiar da pré-classificação por léxico (None = desativada)
+        textos_longos (str, opcional): Regra de combinação das janelas (None = textos truncados)
+        max_janelas (int, opcional): Quantidade máxima de janelas por texto
+        pool (PoolInferencia, opcional): Processos entre os quais a classificação é dividida
+        tamanho_bloco (int): Linhas lidas e processadas entre duas atualizações do progresso
+    
+    Returns:
+        tuple: DataFrame com 'texto_limpo' e 'sentimento' e dicionário com informações da execução
+    """
+    # O total de linhas só é conhecido no fim da leitura: o progresso é
+    # estimado pela posição de leitura na cópia do arquivo
+    tamanho_arquivo = max(1, arquivo.seek(0, io.SEEK_END))
+    info = {'linhas_lidas': 0, 'exemplo': ""}
+    
+    stats_cache_antes = cache.estatisticas() if cache is not None else None
+    cascata = CascataSentimento(limiar_cascata) if limiar_cascata is not None else None
+    classificar = lambda unicos: analisar_sentimentos_em_lote(
+        unicos, classificador, cache=cache, cascata=cascata,
+        textos_longos=textos_longos, max_janelas=max_janelas or obter_max_janelas(), pool=pool
+    )
+    
+    limpos_por_mensagem, sentimentos_por_texto = {}, {}
+    partes = []
+    agregado = None
+    removidos = erros = nao_vazios = 0
+    # Carrega apenas a coluna selecionada, um bloco por vez
+    with closing(carregar_arquivo_em_blocos(arquivo, col_texto, tamanho_bloco=tamanho_bloco)) as blocos:
+        for bloco in blocos:
+            tarefa.verificar_cancelamento()
+            if info['linhas_lidas'] == 0 and len(bloco) > 0:
+                info['exemplo'] = str(bloco[col_texto].iloc[0])
+            info['linhas_lidas'] += len(bloco)
+            
+            # Pré-processamento (uma vez por mensagem distinta)
+            bloco['texto_limpo'], _ = aplicar_em_unicos(
+                bloco[col_texto].astype(str),
+                lambda unicos: _classificar_com_memoria(
+                    unicos, lambda novos: lematizar_textos(limpar_textos(novos), nlp, stopwords_pt), limpos_por_mensagem
+                )
+            )
+            
+            # Remove textos vazios
+            textos_antes = len(bloco)
+            bloco = bloco[bloco['texto_limpo'].str.strip() != ""]
+            removidos += textos_antes - len(bloco)
+            nao_vazios += len(bloco)
+            
+            # Análise de sentimento (uma vez por texto pré-processado distinto) e remoção dos erros
+            if len(bloco) > 0:
+                bloco['sentimento'], _ = aplicar_em_unicos(
+                    bloco['texto_limpo'],
+                    lambda unicos: _classificar_com_memoria(unicos, classificar, sentimentos_por_texto)
+                )
+                erros_antes = len(bloco)
+                bloco = bloco[bloco['sentimento'] != "erro"]
+                erros += erros_antes - len(bloco)
+                partes.append(bloco)
+                agregado = combinar_agregados([agregado, agregar_sentimentos(bloco)])
+            
+            parcial = estatisticas_de_agregado(combinar_agregados([agregado]))
+            parcial.update(linhas_processadas=info['linhas_lidas'])
+            tarefa.publicar(min(arquivo.tell() / tamanho_arquivo, 0.99), parcial)
+    
+    info['textos_removidos'] = removidos
+    info['erros_removidos'] = erros
+    info['duplicacao_mensagens'] = 1 - len(limpos_por_mensagem) / info['linhas_lidas'] if info['linhas_lidas'] > 0 else 0
+    info['duplicacao_limpos'] = 1 - len(sentimentos_por_texto) / nao_vazios if nao_vazios > 0 else 0
+    info['cascata'] = cascata.estatisticas() if cascata is not None else None
+    info['cache_acertos'] = info['cache_falhas'] = None
+    if cache is not None:
+        stats_cache = cache.estatisticas()
+        info['cache_acertos'] = stats_cache['acertos'] - stats_cache_antes['acertos']
+        info['cache_falhas'] = stats_cache['falhas'] - stats_cache_antes['falhas']
+    
+    if partes:
+        df = pd.concat(partes)
+    else:
+        df = pd.DataFrame(columns=[col_texto, 'texto_limpo', 'sentimento'])
+    return df, info
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def frequencias_das_palavras(hash_arquivo, col_texto, modelo, _textos):
+    """
+    Conta a frequência das palavras dos textos pré-processados de uma análise.
+    
+    Fica em cache pela mesma chave de processar_arquivo, para que a nuvem de
+    palavras não percorra todos os textos a cada rerun.
+    
+    Returns:
+        dict: Frequência de cada palavra
+    """
+    return dict(contar_frequencias(_textos))
+
+def acompanhar_tarefa(tarefa, reiniciar=None):
+    """
+    Mostra o andamento de uma tarefa de análise e retorna o resultado quando ela termina.
+    
+    Enquanto a tarefa está em execução, mostra a barra de progresso e as
+    contagens parciais, oferece o cancelamento e atualiza a página a cada
+    INTERVALO_ATUALIZACAO segundos.
+    
+    Args:
+        tarefa (TarefaAnalise): Tarefa acompanhada
+        reiniciar (callable, opcional): Função que inicia a análise de novo (após cancelamento ou falha)
+    
+    Returns:
+        tuple: DataFrame e informações da análise, ou None se a tarefa não foi concluída
+    """
+    if tarefa.em_execucao:
+        parcial = tarefa.parcial or {}
+        st.progress(
+            tarefa.progresso,
+            text=f"Processando os textos em segundo plano... "
+                 f"{parcial.get('linhas_processadas', 0)} linhas processadas"
+        )
+        if parcial.get('total'):
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Positivos até agora", parcial['positivos'])
+            with col2:
+                st.metric("Neutros até agora", parcial['neutros'])
+            with col3:
+                st.metric("Negativos até agora", parcial['negativos'])
+        st.caption("A análise continua mesmo se a página for fechada: ao enviar o mesmo arquivo de novo, o resultado é retomado.")
+        
+        if tarefa.cancelamento_solicitado:
+            st.info("Cancelando a análise ao fim do bloco atual...")
+        elif st.button("Cancelar análise"):
+            tarefa.cancelar()
+        
+        time.sleep(INTERVALO_ATUALIZACAO)
+        st.rerun()
+    
+    if tarefa.estado == CONCLUIDA:
+        return tarefa.resultado
+    
+    if tarefa.estado == CANCELADA:
+        st.warning("A análise foi cancelada.")
+    else:
+        st.error(f"Erro ao processar o arquivo: {tarefa.erro}")
+        if tarefa.detalhes:
+            # Mostrar traceback para depuração
+            st.code(tarefa.detalhes, language="python")
+    if reiniciar is not None and st.button("Reiniciar análise"):
+        reiniciar()
+        st.rerun()
+    return None
+
+def mostrar_resultados(df, info, col_texto, chave_tarefa, modelo, stopwords_pt):
+    """
+    Mostra os resultados de uma análise de arquivo concluída.
+    
+    Args:
+        df (DataFrame): Textos com 'texto_limpo' e 'sentimento'
+        info (dict): Informações da execução retornadas por processar_arquivo
+        col_texto (str): Coluna com os textos
+        chave_tarefa (tuple): Chave da tarefa (usuário, hash do arquivo, coluna, modelo e configurações)
+        modelo (str): Nome do modelo de sentimento
+        stopwords_pt: Conjunto de stopwords
+    """
+    st.write(f"{info['linhas_lidas']} linhas lidas da coluna '{col_texto}'.")
+    
+    # Mostrar exemplo do que está sendo processado
+    st.write("Exemplo de texto a ser analisado:")
+    st.code(info['exemplo'][:500] + "..." if len(info['exemplo']) > 500 else info['exemplo'])
+    
+    if info['textos_removidos'] > 0:
+        st.warning(f"{info['textos_removidos']} textos foram removidos por estarem vazios após o pré-processamento.")
+    
+    st.caption(
+        f"Textos duplicados: {info['duplicacao_mensagens']:.1%} das mensagens originais e "
+        f"{info['duplicacao_limpos']:.1%} dos textos pré-processados foram reaproveitados."
+    )
+    if info['cache_acertos'] is not None:
+        st.caption(
+            f"Cache de sentimentos: {info['cache_acertos']} textos reaproveitados, "
+            f"{info['cache_falhas']} enviados ao modelo."
+        )
+    if info['cascata'] is not None:
+        st.caption(
+            f"Pré-classificação por léxico: {info['cascata']['resolvidos']} textos distintos "
+            f"({info['cascata']['fracao_resolvida']:.1%}) resolvidos sem o modelo."
+        )
+    
+    if info['erros_removidos'] > 0:
+        st.warning(f"{info['erros_removidos']} textos foram removidos devido a erros na análise.")
+    
+    # Mostra resultados
+    st.success(f"Análise concluída para {len(df)} textos!")
+    
+    # Resultados
+    resultados, graficos = st.tabs(["Resultados", "Visualizações"])
+    
+    with resultados:
+        st.write("Dados com análise de sentimento:")
+        
+        # Adicionando filtro por sentimento
+        sentimento_filter = st.multiselect("Filtrar por sentimento:", 
+                                          ["positivo", "neutro", "negativo"], 
+                                          default=["positivo", "neutro", "negativo"])
+        
+        # Aplicando o filtro
+        df_filtered = df[df["sentimento"].isin(sentimento_filter)]
+        
+        # Mostrando os resultados filtrados
+        st.dataframe(df_filtered[[col_texto, 'texto_limpo', 'sentimento']])
+        
+        # Download dos resultados: o arquivo é gerado uma única vez por
+        # análise (com todas as configurações) e formato, e só quando pedido
+        formato = st.selectbox(
+            "Formato do download:",
+            list(FORMATOS_DOWNLOAD),
+            format_func=FORMATOS_DOWNLOAD.get
+        )
+        chave_exportacao = (chave_tarefa, formato)
+        exportacao = st.session_state.get('exportacao')
+        if exportacao is None or exportacao[0] != chave_exportacao:
+            exportacao = None
+            if st.button("Preparar arquivo para download"):
+                with st.spinner("Gerando o arquivo..."):
+                    exportacao = _preparar_exportacao(df, chave_exportacao, formato)
+        
+        if exportacao is not None:
+            extensao, tipo_mime = FORMATOS_EXPORTACAO[formato]
+            st.download_button(
+                "📥 Baixar resultados completos",
+                exportacao[1],
+                file_name=f"analise_sentimento{extensao}",
+                mime=tipo_mime
+            )
+        
+        # Estatísticas
+        st.subheader("📋 Relatório")
+        
+        stats = criar_estatisticas(df)
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Positivos", f"{stats['positivos']} ({stats['positivos_pct']:.1f}%)")
+        with col2:
+            st.metric("Neutros", f"{stats['neutros']} ({stats['neutros_pct']:.1f}%)")
+        with col3:
+            st.metric("Negativos", f"{stats['negativos']} ({stats['negativos_pct']:.1f}%)")
+        
+        # Recomendações
+        st.subheader("💡 Insights")
+        if stats['negativos'] > stats['positivos']:
+            st.warning("⚠️ Há mais menções negativas que positivas. Recomenda-se investigar as causas e ajustar a comunicação.")
+        else:
+            st.success("✅ Boa percepção geral. Recomenda-se manter a estratégia atual e expandir ações positivas.")
+    
+    with graficos:
+        st.subheader("📊 Visualizações")
+        
+        # Distribuição de sentimentos
+        fig = grafico_distribuicao_sentimentos(df)
+        st.plotly_chart(fig)
+        
+        # Nuvem de palavras
+        st.subheader("🔤 Nuvem de Palavras")
+        frequencias = frequencias_das_palavras(
+            chave_tarefa[1], col_texto, modelo, df['texto_limpo']
+        )
+        fig_nuvem = criar_nuvem_palavras(frequencias=frequencias)
+        st.pyplot(fig_nuvem)
+        
+        # Tópicos LDA
+        st.subheader("🧵 Tópicos Identificados")
+        n_topicos = st.slider("Número de tópicos", 2, 10, 3)
+        engine = st.selectbox(
+            "Método de identificação de tópicos:",
+            list(MOTORES_TOPICOS),
+            format_func=MOTORES_TOPICOS.get
+        )
+        topicos, tempo_topicos = identificar_topicos(
+            df['texto_limpo'], stopwords_pt, n_topicos, engine=engine, retornar_tempo=True
+        )
+        st.caption(f"Tópicos calculados em {tempo_topicos:.2f} s.")
+        
+        for i, termos in enumerate(topicos):
+            st.write(f"**Tópico {i+1}:** {' | '.join(termos)}")
+
+def retomar_analise(registro, stopwords_pt):
+    """
+    Oferece as análises em segundo plano do usuário quando nenhum arquivo foi enviado.
+    
+    Permite acompanhar ou ver o resultado de uma análise iniciada em outra
+    sessão (ex.: antes de a aba ser fechada) sem enviar o arquivo de novo.
+    
+    Args:
+        registro (RegistroTarefas): Registro de tarefas da aplicação
+        stopwords_pt: Conjunto de stopwords
+    """
+    usuario = obter_usuario_atual()
+    tarefas = {tarefa.numero: tarefa for tarefa in registro.listar(lambda chave: chave[0] == usuario)}
+    if not tarefas:
+        return
+    
+    numero = st.selectbox(
+        "Ou retome uma análise em segundo plano:",
+        [None] + list(tarefas),
+        format_func=lambda numero: "-" if numero is None else tarefas[numero].descricao
+    )
+    if numero is None:
+        return
+    
+    tarefa = tarefas[numero]
+    st.caption(f"Análise {ESTADOS_TAREFA[tarefa.estado]} ({tarefa.duracao:.0f} s).")
+    _, _, col_texto, modelo, *_ = tarefa.chave
+    resultado = acompanhar_tarefa(tarefa)
+    if resultado is not None:
+        mostrar_resultados(*resultado, col_texto, tarefa.chave, modelo, stopwords_pt)
+
+def modo_arquivo(nlp, stopwords_pt, classificador, cache=None, limiar_cascata=None, textos_longos=None, max_janelas=None,
+                 pool=None):
     """Interface para análise de sentimento a partir de arquivo."""
     st.subheader("Carregue um arquivo CSV ou Excel")
+    registro = carregar_registro_tarefas()
     
     # Opção para processar automaticamente
     auto_process = st.checkbox("Processar automaticamente usando a coluna 'Message' quando disponível", value=True)
@@ -40,25 +521,26 @@ def modo_arquivo(nlp, stopwords_pt, classificador):
     
     if file is not None:
         try:
-            df = carregar_arquivo(file)
+            # Lê apenas o cabeçalho e algumas linhas; o arquivo completo é lido em blocos na análise
+            colunas = ler_colunas(file)
             
             # Adicionando um indicador de sucesso ao carregar o arquivo
-            st.success(f"Arquivo carregado com sucesso! ({len(df)} linhas)")
+            st.success(f"Arquivo carregado com sucesso! ({len(colunas)} colunas)")
             
             st.write("Visualização dos dados:")
-            st.dataframe(df.head())
+            st.dataframe(carregar_arquivo(file, nrows=5))
             
             # Verifica se existe a coluna 'Message' - buscando exatamente com esse nome
             message_col = None
             default_col_index = 0
             
             # Primeiro, procurar por "Message" (exatamente)
-            if "Message" in df.columns:
+            if "Message" in colunas:
                 message_col = "Message"
-                default_col_index = list(df.columns).index("Message")
+                default_col_index = colunas.index("Message")
             # Caso não encontre, procurar por qualquer coluna que contenha "message" em minúsculo
             else:
-                for i, col in enumerate(df.columns):
+                for i, col in enumerate(colunas):
                     if "message" in col.lower():
                         default_col_index = i
                         message_col = col
@@ -67,7 +549,7 @@ def modo_arquivo(nlp, stopwords_pt, classificador):
             # Seleciona a coluna para análise com a coluna 'Message' como padrão, se existir
             col_texto = st.selectbox(
                 "Selecione a coluna que contém o texto para análise:",
-                df.columns,
+                colunas,
                 index=default_col_index
             )
             
@@ -81,103 +563,30 @@ def modo_arquivo(nlp, stopwords_pt, classificador):
             else:
                 process_button = st.button("Iniciar Análise de Sentimento")
             
-            if process_button:
+            # A análise roda em segundo plano e fica registrada na sessão, para que as
+            # interações com os widgets (filtros, número de tópicos) não exijam clicar
+            # de novo no botão. Uma tarefa do mesmo usuário com o mesmo arquivo, coluna
+            # e modelo (ex.: iniciada antes de a aba ser fechada) é retomada.
+            chave_analise = (_hash_do_arquivo(file), col_texto)
+            modelo = nome_do_modelo(classificador)
+            chave_tarefa = (obter_usuario_atual(), chave_analise[0], col_texto, modelo,
+                            limiar_cascata, textos_longos, max_janelas)
+            if process_button or registro.obter(chave_tarefa) is not None:
+                st.session_state['analise_arquivo'] = chave_analise
+            
+            if st.session_state.get('analise_arquivo') == chave_analise:
                 if col_texto:
-                    with st.spinner("Processando os textos..."):
-                        # Mostrar exemplo do que está sendo processado
-                        st.write("Exemplo de texto a ser analisado:")
-                        st.code(df[col_texto].iloc[0][:500] + "..." if len(str(df[col_texto].iloc[0])) > 500 else df[col_texto].iloc[0])
-                        
-                        # Pré-processamento
-                        df['texto_limpo'] = df[col_texto].astype(str).apply(
-                            lambda texto: preprocessar_texto(texto, nlp, stopwords_pt)
-                        )
-                        
-                        # Remove textos vazios
-                        textos_antes = len(df)
-                        df = df[df['texto_limpo'].str.strip() != ""]
-                        textos_removidos = textos_antes - len(df)
-                        if textos_removidos > 0:
-                            st.warning(f"{textos_removidos} textos foram removidos por estarem vazios após o pré-processamento.")
-                        
-                        # Análise de sentimento
-                        st.info(f"Analisando sentimentos de {len(df)} textos...")
-                        df["sentimento"] = df["texto_limpo"].apply(
-                            lambda x: analisar_sentimento(x, classificador)
+                    def iniciar():
+                        return registro.iniciar(
+                            chave_tarefa, f"{file.name} ({col_texto})", processar_arquivo,
+                            _copiar_upload(file), col_texto, nlp, stopwords_pt, classificador, cache,
+                            limiar_cascata, textos_longos, max_janelas, pool
                         )
-                        
-                        # Remove erros
-                        erros_antes = len(df)
-                        df = df[df["sentimento"] != "erro"]
-                        erros_removidos = erros_antes - len(df)
-                        if erros_removidos > 0:
-                            st.warning(f"{erros_removidos} textos foram removidos devido a erros na análise.")
-                        
-                        # Mostra resultados
-                        st.success(f"Análise concluída para {len(df)} textos!")
-                        
-                        # Resultados
-                        resultados, graficos = st.tabs(["Resultados", "Visualizações"])
-                        
-                        with resultados:
-                            st.write("Dados com análise de sentimento:")
-                            
-                            # Adicionando filtro por sentimento
-                            sentimento_filter = st.multiselect("Filtrar por sentimento:", 
-                                                              ["positivo", "neutro", "negativo"], 
-                                                              default=["positivo", "neutro", "negativo"])
-                            
-                            # Aplicando o filtro
-                            df_filtered = df[df["sentimento"].isin(sentimento_filter)]
-                            
-                            # Mostrando os resultados filtrados
-                            st.dataframe(df_filtered[[col_texto, 'texto_limpo', 'sentimento']])
-                            
-                            # Download dos resultados
-                            st.markdown(
-                                get_download_link(df, "analise_sentimento.csv", "📥 Baixar resultados completos (CSV)"), 
-                                unsafe_allow_html=True
-                            )
-                            
-                            # Estatísticas
-                            st.subheader("📋 Relatório")
-                            
-                            stats = criar_estatisticas(df)
-                            
-                            col1, col2, col3 = st.columns(3)
-                            with col1:
-                                st.metric("Positivos", f"{stats['positivos']} ({stats['positivos_pct']:.1f}%)")
-                            with col2:
-                                st.metric("Neutros", f"{stats['neutros']} ({stats['neutros_pct']:.1f}%)")
-                            with col3:
-                                st.metric("Negativos", f"{stats['negativos']} ({stats['negativos_pct']:.1f}%)")
-                            
-                            # Recomendações
-                            st.subheader("💡 Insights")
-                            if stats['negativos'] > stats['positivos']:
-                                st.warning("⚠️ Há mais menções negativas que positivas. Recomenda-se investigar as causas e ajustar a comunicação.")
-                            else:
-                                st.success("✅ Boa percepção geral. Recomenda-se manter a estratégia atual e expandir ações positivas.")
-                        
-                        with graficos:
-                            st.subheader("📊 Visualizações")
-                            
-                            # Distribuição de sentimentos
-                            fig = grafico_distribuicao_sentimentos(df)
-                            st.plotly_chart(fig)
-                            
-                            # Nuvem de palavras
-                            st.subheader("🔤 Nuvem de Palavras")
-                            fig_nuvem = criar_nuvem_palavras(df['texto_limpo'])
-                            st.pyplot(fig_nuvem)
-                            
-                            # Tópicos LDA
-                            st.subheader("🧵 Tópicos Identificados (LDA)")
-                            n_topicos = st.slider("Número de tópicos", 2, 10, 3)
-                            topicos = identificar_topicos(df['texto_limpo'], stopwords_pt, n_topicos)
-                            
-                            for i, termos in enumerate(topicos):
-                                st.write(f"**Tópico {i+1}:** {' | '.join(termos)}")
+                    
+                    tarefa = registro.obter(chave_tarefa) or iniciar()
+                    resultado = acompanhar_tarefa(tarefa, iniciar)
+                    if resultado is not None:
+                        mostrar_resultados(*resultado, col_texto, chave_tarefa, modelo, stopwords_pt)
                 
                 else:
                     st.error("Por favor, selecione uma coluna para análise.")
@@ -187,8 +596,10 @@ def modo_arquivo(nlp, stopwords_pt, classificador):
             # Mostrar traceback para depuração
             import traceback
             st.code(traceback.format_exc(), language="python")
+    else:
+        retomar_analise(registro, stopwords_pt)
 
-def modo_texto_livre(nlp, stopwords_pt, classificador):
+def modo_texto_livre(nlp, stopwords_pt, classificador, cache=None, textos_longos=None, max_janelas=None):
     """Interface para análise de sentimento de texto livre."""
     st.subheader("Digite ou cole o texto para análise")
     
@@ -202,8 +613,13 @@ def modo_texto_livre(nlp, stopwords_pt, classificador):
             if texto_limpo.strip() == "":
                 st.warning("O texto ficou vazio após o pré-processamento. Tente um texto mais longo.")
             else:
-                # Análise de sentimento
-                sentimento = analisar_sentimento(texto_usuario, classificador)
+                # Análise de sentimento. O modelo rápido foi treinado com textos
+                # pré-processados, então recebe o texto limpo, como na análise de arquivos
+                texto_modelo = texto_limpo if isinstance(classificador, ClassificadorRapido) else texto_usuario
+                sentimento = analisar_sentimento(
+                    texto_modelo, classificador, cache=cache,
+                    textos_longos=textos_longos, max_janelas=max_janelas or obter_max_janelas()
+                )
                 
                 # Resultado
                 col1, col2 = st.columns([1, 2])
@@ -224,6 +640,36 @@ def modo_texto_livre(nlp, stopwords_pt, classificador):
         else:
             st.warning("Por favor, digite um texto para análise.")
 
+def painel_desempenho():
+    """
+    Mostra na barra lateral o tempo, a vazão e o pico de memória de cada etapa.
+    
+    As medições são do processo do Streamlit (acumuladas entre as sessões) e
+    não incluem as etapas cujo resultado veio do cache da aplicação.
+    """
+    with st.sidebar.expander("Desempenho"):
+        resumo = REGISTRO.resumo()
+        if not resumo:
+            st.caption("Nenhuma etapa medida ainda.")
+            return
+        
+        tabela = pd.DataFrame([
+            {
+                'Etapa': etapa,
+                'Execuções': dados['execucoes'],
+                'Tempo (s)': dados['tempo_total_s'],
+                'Itens': dados['itens'],
+                'Itens/s': dados['itens_por_s'],
+                'Pico RSS (MB)': dados['pico_rss_mb'],
+                'Aumento RSS (MB)': dados['aumento_rss_mb'],
+            }
+            for etapa, dados in resumo.items()
+        ])
+        st.dataframe(tabela, hide_index=True, use_container_width=True)
+        if st.button("Zerar métricas"):
+            REGISTRO.limpar()
+            st.rerun()
+
 def main():
     """Função principal da aplicação."""
     configurar_pagina()
@@ -248,22 +694,69 @@ def main():
         
         if st.sidebar.button("Sair"):
             logout()
-            st.experimental_rerun()
+            st.rerun()
         
         # Opções de modo
         st.sidebar.divider()
         modo = st.sidebar.radio("Escolha o modo:", ["Arquivo CSV/Excel", "Texto Livre"])
+        
+        # Modelo de sentimento: o BERT ou uma versão do modelo rápido treinado com os rótulos dele
+        versoes_rapidas = listar_modelos_rapidos()
+        opcoes_modelo = [MODELO_BERT] + [f"Rápido ({versao})" for versao in versoes_rapidas]
+        escolha_modelo = st.sidebar.selectbox(
+            "Modelo de sentimento",
+            range(len(opcoes_modelo)),
+            format_func=lambda i: opcoes_modelo[i],
+            help="O modo rápido classifica milhares de textos por segundo, com concordância "
+                 "um pouco menor com o BERT. Treine-o com scripts/treinar_modelo_rapido.py."
+        )
+        versao_rapida = versoes_rapidas[escolha_modelo - 1] if escolha_modelo > 0 else None
+        
+        # Textos longos: por padrão o BERT só vê os primeiros 512 tokens de cada texto
+        textos_longos = max_janelas = None
+        if versao_rapida is None:
+            modos = list(MODOS_TEXTOS_LONGOS)
+            modo_padrao = obter_modo_textos_longos()
+            textos_longos = st.sidebar.selectbox(
+                "Textos longos",
+                modos,
+                index=modos.index(modo_padrao),
+                format_func=MODOS_TEXTOS_LONGOS.get,
+                help="Textos com mais de 512 tokens podem ser divididos em janelas sobrepostas, "
+                     "classificadas juntas e combinadas pela regra escolhida."
+            )
+            if textos_longos is not None:
+                max_janelas = st.sidebar.slider("Máximo de janelas por texto", 1, 32, min(max(obter_max_janelas(), 1), 32))
+        
+        # Pré-classificação por léxico: textos com sentimento evidente não passam pelo modelo
+        limiar_padrao = obter_limiar_cascata()
+        usar_cascata = st.sidebar.checkbox(
+            "Pré-classificar por léxico (mais rápido)",
+            value=limiar_padrao is not None,
+            help="Textos com palavras de sentimento evidente são classificados sem o modelo BERT."
+        )
+        limiar_cascata = None
+        if usar_cascata:
+            limiar_cascata = st.sidebar.slider(
+                "Confiança mínima do léxico", 0.3, 1.0, float(limiar_padrao or LIMIAR_PADRAO), 0.05
+            )
     
     # Carregar recursos
     with st.spinner("Carregando recursos necessários..."):
-        nlp, stopwords_pt, classificador = carregar_recursos()
+        nlp, stopwords_pt = carregar_recursos()
+        classificador = carregar_classificador(versao_rapida)
+        pool = carregar_pool_inferencia(versao_rapida)
+        cache = carregar_cache_sentimento()
         st.sidebar.success("✅ Modelos carregados!")
     
+    # Medições das etapas (antes do modo, para seguir o andamento das análises em segundo plano)
+    painel_desempenho()
+    
     # Interface principal conforme o modo selecionado
     if modo == "Arquivo CSV/Excel":
-        modo_arquivo(nlp, stopwords_pt, classificador)
+        modo_arquivo(nlp, stopwords_pt, classificador, cache, limiar_cascata, textos_longos, max_janelas, pool)
     else:
-        modo_texto_livre(nlp, stopwords_pt, classificador)
+        modo_texto_livre(nlp, stopwords_pt, classificador, cache, textos_longos, max_janelas)
     
     # Footer
     st.markdown("---")
@@ -67,7 +67,7 @@ def pagina_login():
         
         if st.button("Sair"):
             logout()
-            st.experimental_rerun()
+            st.rerun()
             
         return True
     
@@ -88,7 +88,7 @@ def pagina_login():
             if autenticar_usuario(usuario, senha):
                 st.success("Login realizado com sucesso!")
                 # Recarregar a página imediatamente após o login bem-sucedido
-                st.experimental_rerun()
+                st.rerun()
                 return True
             else:
                 st.error("Usuário ou senha incorretos!")
@@ -0,0 +1,233 @@
+"""
+Módulo com as tarefas de análise executadas em segundo plano.
+
+A análise de um arquivo roda em uma thread própria, fora da execução do
+script do Streamlit: a página acompanha o progresso e as contagens parciais
+a cada rerun, o usuário pode cancelá-la e, se a aba for fechada, a tarefa
+continua. O registro de tarefas é compartilhado pelas sessões (via
+st.cache_resource), indexado por usuário, arquivo, coluna e modelo; uma nova
+sessão do mesmo usuário com o mesmo arquivo encontra a tarefa em andamento
+ou o resultado pronto em vez de recomeçar.
+
+Este módulo não importa o Streamlit.
+"""
+
+import itertools
+import threading
+import time
+import traceback
+from collections import OrderedDict
+
+# Estados de uma tarefa
+EXECUTANDO = "executando"
+CONCLUIDA = "concluida"
+CANCELADA = "cancelada"
+FALHOU = "falhou"
+
+class TarefaCancelada(Exception):
+    """Interrompe a função de uma tarefa cujo cancelamento foi solicitado."""
+
+class TarefaAnalise:
+    """
+    Executa uma função em uma thread e publica o progresso dela.
+    
+    A função recebe a própria tarefa como primeiro argumento e, entre um
+    bloco e outro, chama publicar (progresso e resultados parciais) e
+    verificar_cancelamento (que lança TarefaCancelada se o usuário cancelou).
+    
+    Attributes:
+        chave (tuple): Chave da tarefa no registro
+        descricao (str): Texto exibido ao listar as tarefas (ex.: nome do arquivo e coluna)
+        estado (str): EXECUTANDO, CONCLUIDA, CANCELADA ou FALHOU
+        progresso (float): Fração concluída, de 0 a 1
+        parcial: Último resultado parcial publicado pela função
+        resultado: Valor retornado pela função (quando CONCLUIDA)
+        erro (str): Mensagem do erro (quando FALHOU)
+        detalhes (str): Traceback do erro (quando FALHOU)
+    """
+    
+    _sequencia = itertools.count(1)
+    
+    def __init__(self, chave, descricao, funcao, *args, **kwargs):
+        """
+        Args:
+            chave (tuple): Chave da tarefa no registro
+            descricao (str): Texto exibido ao listar as tarefas
+            funcao (callable): Função executada como funcao(tarefa, *args, **kwargs)
+        """
+        self.chave = chave
+        self.descricao = descricao
+        self.numero = next(self._sequencia)
+        self.estado = EXECUTANDO
+        self.progresso = 0.0
+        self.parcial = None
+        self.resultado = None
+        self.erro = None
+        self.detalhes = None
+        self.iniciada_em = time.time()
+        self.concluida_em = None
+        self._cancelamento = threading.Event()
+        self._thread = threading.Thread(
+            target=self._executar, args=(funcao, args, kwargs),
+            name=f"tarefa-analise-{self.numero}", daemon=True
+        )
+        self._thread.start()
+    
+    def _executar(self, funcao, args, kwargs):
+        """Executa a função e registra o estado final da tarefa."""
+        try:
+            self.resultado = funcao(self, *args, **kwargs)
+            self.progresso = 1.0
+            self.estado = CONCLUIDA
+        except TarefaCancelada:
+            self.estado = CANCELADA
+        except Exception as e:
+            self.detalhes = traceback.format_exc()
+            print(f"Erro na tarefa de análise '{self.descricao}': {e}\n{self.detalhes}")
+            self.erro = str(e)
+            self.estado = FALHOU
+        finally:
+            self.concluida_em = time.time()
+    
+    @property
+    def em_execucao(self):
+        """Indica se a tarefa ainda não terminou."""
+        return self.estado == EXECUTANDO
+    
+    @property
+    def duracao(self):
+        """Tempo de execução em segundos (até agora, se ainda estiver em execução)."""
+        return (self.concluida_em or time.time()) - self.iniciada_em
+    
+    def publicar(self, progresso, parcial=None):
+        """
+        Publica o progresso e o resultado parcial (chamado pela função da tarefa).
+        
+        Args:
+            progresso (float): Fração concluída, de 0 a 1
+            parcial (opcional): Resultado parcial (ex.: contagens de sentimento até agora)
+        """
+        self.progresso = min(max(progresso, 0.0), 1.0)
+        if parcial is not None:
+            self.parcial = parcial
+    
+    def cancelar(self):
+        """Solicita o cancelamento; a função para no próximo verificar_cancelamento."""
+        self._cancelamento.set()
+    
+    @property
+    def cancelamento_solicitado(self):
+        """Indica se o cancelamento foi solicitado."""
+        return self._cancelamento.is_set()
+    
+    def verificar_cancelamento(self):
+        """
+        Interrompe a função da tarefa se o cancelamento foi solicitado.
+        
+        Raises:
+            TarefaCancelada: Se cancelar foi chamado
+        """
+        if self._cancelamento.is_set():
+            raise TarefaCancelada()
+    
+    def aguardar(self, tempo_limite=None):
+        """
+        Aguarda o fim da tarefa.
+        
+        Args:
+            tempo_limite (float, opcional): Tempo máximo de espera em segundos
+        
+        Returns:
+            bool: True se a tarefa terminou
+        """
+        self._thread.join(tempo_limite)
+        return not self._thread.is_alive()
+
+class RegistroTarefas:
+    """
+    Registro das tarefas de análise, compartilhado entre as sessões.
+    
+    Mantém todas as tarefas em execução e as últimas `max_terminadas`
+    tarefas terminadas (as mais antigas são descartadas, como no cache
+    de resultados da aplicação).
+    """
+    
+    def __init__(self, max_terminadas=8):
+        """
+        Args:
+            max_terminadas (int): Quantidade de tarefas terminadas mantidas com seus resultados
+        """
+        self.max_terminadas = max_terminadas
+        self._tarefas = OrderedDict()
+        self._trava = threading.Lock()
+    
+    def obter(self, chave):
+        """
+        Retorna a tarefa registrada com a chave, se houver.
+        
+        Args:
+            chave (tuple): Chave da tarefa
+        
+        Returns:
+            TarefaAnalise: Tarefa encontrada, ou None
+        """
+        with self._trava:
+            return self._tarefas.get(chave)
+    
+    def iniciar(self, chave, descricao, funcao, *args, **kwargs):
+        """
+        Inicia uma tarefa, a menos que já exista uma em execução ou concluída com a mesma chave.
+        
+        Tarefas canceladas ou que falharam são substituídas por uma nova.
+        
+        Args:
+            chave (tuple): Chave da tarefa (ex.: usuário, hash do arquivo, coluna e modelo)
+            descricao (str): Texto exibido ao listar as tarefas
+            funcao (callable): Função executada como funcao(tarefa, *args, **kwargs)
+        
+        Returns:
+            TarefaAnalise: Tarefa existente ou a nova tarefa
+        """
+        with self._trava:
+            tarefa = self._tarefas.get(chave)
+            if tarefa is not None and tarefa.estado in (EXECUTANDO, CONCLUIDA):
+                self._tarefas.move_to_end(chave)
+                return tarefa
+            
+            tarefa = TarefaAnalise(chave, descricao, funcao, *args, **kwargs)
+            self._tarefas[chave] = tarefa
+            self._tarefas.move_to_end(chave)
+            self._descartar_antigas()
+            return tarefa
+    
+    def _descartar_antigas(self):
+        """Remove as tarefas terminadas mais antigas além do limite (com a trava adquirida)."""
+        terminadas = [chave for chave, tarefa in self._tarefas.items() if not tarefa.em_execucao]
+        for chave in terminadas[:max(0, len(terminadas) - self.max_terminadas)]:
+            del self._tarefas[chave]
+    
+    def listar(self, filtro=None):
+        """
+        Lista as tarefas registradas, da mais recente para a mais antiga.
+        
+        Args:
+            filtro (callable, opcional): Função que recebe a chave e indica se a tarefa entra na lista
+        
+        Returns:
+            list: Tarefas registradas
+        """
+        with self._trava:
+            tarefas = list(self._tarefas.values())
+        return [tarefa for tarefa in reversed(tarefas) if filtro is None or filtro(tarefa.chave)]
+    
+    def remover(self, chave):
+        """
+        Cancela (se ainda estiver em execução) e remove uma tarefa do registro.
+        
+        Args:
+            chave (tuple): Chave da tarefa
+        """
+        with self._trava:
+            tarefa = self._tarefas.pop(chave, None)
+        if tarefa is not None:
+            tarefa.cancelar()
@@ -0,0 +1,40 @@
+"""
+Testes da pré-classificação de sentimento por léxico (cascata).
+"""
+
+import spacy
+
+from src.models.lexicon_sentiment import CascataSentimento
+from src.utils.text_processing import lematizar
+
+def test_frase_negada_segue_para_o_modelo():
+    cascata = CascataSentimento()
+    
+    # "não gostei do atendimento, péssimo" lematizado com as negações mantidas
+    assert cascata.pontuar("não gostar atendimento") == (None, 0.0)
+    assert cascata.classificar(["não gostar atendimento", "nunca recomendar loja"]) == [None, None]
+
+def test_negacao_distante_nao_afeta_o_lema():
+    cascata = CascataSentimento()
+    
+    sentimento, confianca = cascata.pontuar("não chegar ontem produto loja excelente ótimo")
+    assert sentimento == "positivo"
+    assert confianca >= cascata.limiar
+
+def test_um_unico_lema_nao_resolve_o_texto():
+    cascata = CascataSentimento()
+    
+    assert cascata.pontuar("gostar") == (None, 0.0)
+    assert cascata.classificar(["gostar", "péssimo"]) == [None, None]
+
+def test_dois_lemas_com_a_mesma_polaridade_resolvem_o_texto():
+    cascata = CascataSentimento()
+    
+    assert cascata.classificar(["ótimo atendimento adorar"]) == ["positivo"]
+    assert cascata.classificar(["péssimo serviço lixo"]) == ["negativo"]
+
+def test_lematizacao_mantem_as_negacoes():
+    nlp = spacy.blank("pt")
+    
+    lemas = lematizar("não nem nunca gostei", nlp, {"não", "nem", "nunca", "gostei"})
+    assert lemas.split() == ["não", "nem", "nunca"]
@@ -0,0 +1,48 @@
+"""
+Testes da limpeza vetorizada de textos (limpar_textos), que deve produzir
+exatamente o mesmo resultado da limpeza texto a texto (limpar_texto).
+"""
+
+import random
+
+import pandas as pd
+import pytest
+
+from src.utils.text_processing import limpar_texto, limpar_textos
+
+CASOS_FIXOS = [
+    "Olá @fulano, veja http://exemplo.com #promo 2024!!!",
+    "Entrega atrasada 😡😡 www.loja.com.br/pedido?id=1 @suporte",
+    "https://t.co/abc😀 ótimo",
+    "@abchttp://x.com", "ht@atp://x", "#tag@men", "www.site.com.br/pagina", "@_", "#_1",
+    "Não GOSTEI   do\tatendimento\n", "ÉÇÃ ٣²",
+    "", "   ", "123", None, float("nan"), 42, 3.14,
+]
+
+# Fragmentos escolhidos para exercitar as interações entre as regras de limpeza
+FRAGMENTOS = [
+    "http", "https://", "www.", "www", "@", "#", "@@", "##", ".", ",", "!", "?", "_",
+    "://", "exemplo.com/caminho?x=1", "usuário", "Ação", "123", "٣", "²",
+    " ", "  ", "\t", "\n", "😀", "👍🏽", "ok", "Não", "-", "'", '"',
+]
+
+@pytest.fixture
+def textos():
+    aleatorio = random.Random(0)
+    aleatorios = [
+        "".join(aleatorio.choice(FRAGMENTOS) for _ in range(aleatorio.randint(0, 15)))
+        for _ in range(2000)
+    ]
+    return pd.Series(CASOS_FIXOS + aleatorios, index=range(10, 10 + len(CASOS_FIXOS) + len(aleatorios)), dtype=object)
+
+@pytest.mark.parametrize("n_processos", [1, 2])
+def test_limpeza_vetorizada_igual_a_limpeza_texto_a_texto(textos, n_processos):
+    obtido = limpar_textos(textos, n_processos=n_processos)
+    
+    assert list(obtido.index) == list(textos.index)
+    assert obtido.tolist() == [limpar_texto(texto) for texto in textos]
+
+def test_limpeza_de_lista_sem_pool():
+    obtido = limpar_textos(["Veja http://x.com 😀", float("nan"), ""])
+    
+    assert obtido.tolist() == ["veja", "nan", ""]
@@ -0,0 +1,72 @@
+"""
+Testes do tempo de importação da aplicação.
+
+Cada módulo é importado em um processo novo com `python -X importtime`: a
+importação precisa caber no orçamento e não pode carregar bibliotecas pesadas
+(transformers, torch, spaCy...), que só devem ser importadas quando a
+funcionalidade for usada.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Tempo máximo de importação de cada módulo, em ms
+ORCAMENTO_MS = 2500
+
+# Bibliotecas que só devem ser importadas quando a funcionalidade for usada
+MODULOS_PESADOS = {
+    "torch", "transformers", "optimum", "spacy", "nltk",
+    "sklearn", "matplotlib", "wordcloud", "seaborn",
+}
+
+def importar_em_processo_novo(modulo):
+    """
+    Importa um módulo em um processo novo.
+    
+    Args:
+        modulo (str): Nome do módulo a importar
+    
+    Returns:
+        tuple: Tempo acumulado da importação em ms, bibliotecas de primeiro nível
+            carregadas e os módulos mais lentos (tempo acumulado em ms, nome)
+    """
+    codigo = f"import json, sys, {modulo}; print(json.dumps(sorted({{nome.split('.')[0] for nome in sys.modules}})))"
+    processo = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", codigo],
+        cwd=RAIZ,
+        capture_output=True,
+        text=True,
+    )
+    assert processo.returncode == 0, f"Falha ao importar {modulo}:\n{processo.stderr[-2000:]}"
+    
+    medicoes = []
+    for linha in processo.stderr.splitlines():
+        if not linha.startswith("import time:") or "self [us]" in linha:
+            continue
+        _, acumulado, nome = linha[len("import time:"):].split("|")
+        medicoes.append((int(acumulado) / 1000, nome.strip()))
+    total_ms = next(acumulado for acumulado, nome in medicoes if nome == modulo)
+    carregados = set(json.loads(processo.stdout.splitlines()[-1]))
+    return total_ms, carregados, sorted(medicoes, reverse=True)[:10]
+
+@pytest.mark.parametrize("modulo, permitidos", [
+    # O Streamlit é necessário para a interface, mas não para a CLI e o serviço HTTP
+    ("src.web.app", {"streamlit"}),
+    ("src.cli", set()),
+    ("src.api.server", set()),
+])
+def test_importacao_leve_e_dentro_do_orcamento(modulo, permitidos):
+    total_ms, carregados, mais_lentos = importar_em_processo_novo(modulo)
+    
+    pesados = carregados & ((MODULOS_PESADOS | {"streamlit"}) - permitidos)
+    assert not pesados, f"Bibliotecas pesadas carregadas ao importar {modulo}: {sorted(pesados)}"
+    assert total_ms <= ORCAMENTO_MS, (
+        f"Importação de {modulo} levou {total_ms:.0f} ms (orçamento: {ORCAMENTO_MS} ms). Mais lentos: "
+        + ", ".join(f"{nome} ({acumulado:.0f} ms)" for acumulado, nome in mais_lentos)
+    )